@@ -1,13 +1,28 @@
+import argparse
 import random
 import base64
 import os
-import time
+import re
 import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-from utils import get_acces_for_entities, get_entities
+from utils import Attribute, EntitiesSyntaxError, Entity, load_entities
+from migrations import copy_migrations, create_migration
+from incremental import generated_content, remove_project, sync_project
 
+# En dessous de ce nombre d'entités, le démarrage des processus coûte plus que la génération elle-même
+PARALLEL_MIN_ENTITIES = 200
 
-def create_env_config(project_path="generated"):
+
+def warn(message: str) -> None:
+    """Avertissement du générateur (entities.txt accepté, mais une partie est ignorée) : sur stderr"""
+    print(f"⚠️ {message}", file=sys.stderr)
+
+
+def create_env_config(project_path="generated", secret_key=None):
     # region utils/core/config.py
     file_content = """from pydantic_settings import BaseSettings
 
@@ -22,11 +37,78 @@ class Settings(BaseSettings):
     DB_USERNAME: str
     DB_PASSWORD: str
     DB_DATABASE: str
+    # URL complète (ex. sqlite:///dev.db), prioritaire sur DB_HOST/DB_PORT/... si renseignée
+    DATABASE_URL: str = ""
+
+    # Réplicas en lecture (URLs séparées par des virgules) utilisés par les routes GET générées
+    DB_READ_REPLICA_URLS: str = ""
+    DB_REPLICA_RETRY_SECONDS: float = 30.0
+    # Lectures sur la base principale pendant N secondes après une écriture du même client (0 = désactivé)
+    DB_READ_YOUR_WRITES_SECONDS: float = 0.0
+
+    # Pool de connexions
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
+    # PgBouncer devant PostgreSQL en mode transaction (voir README)
+    DB_PGBOUNCER: bool = False
 
     # Configuration de sécurité
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    # Hachage Argon2 (un changement entraîne un re-hachage transparent à la connexion)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Cache des utilisateurs authentifiés (par user_id et jti du token)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: float = 30.0
+    # Nom du rôle actif embarqué dans le JWT : require_role sans accès à la base
+    JWT_EMBED_ROLE: bool = False
+
+    # Journalisation et métriques (/metrics)
+    LOG_LEVEL: str = "INFO"
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+    METRICS_ENABLED: bool = True
+
+    # Cache des lectures des entités déclarées avec .cache(ttl) : "memory" (LRU par worker) ou "redis" (partagé)
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = ""
+    CACHE_KEY_PREFIX: str = "app:"
+    CACHE_MAX_ENTRIES: int = 10000
+
+    # Sérialisation : réponses JSON par orjson et lectures des routes GET en Core, sans entités ORM
+    FAST_SERIALIZATION: bool = True
+    # Compression des réponses (br si le paquet brotli est installé, sinon gzip) au-delà de N octets (0 = désactivée)
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+
+    # Démarrage : routers importés à leur première requête, rapport des durées d'import par module
+    LAZY_ROUTERS: bool = False
+    STARTUP_REPORT: bool = False
+
+    # Pagination
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+
+    # Comptage des lignes (en-tête X-Total-Count) : exact, cached ou estimate
+    COUNT_MODE: str = "cached"
+    COUNT_CACHE_TTL: float = 5.0
+    COUNT_ESTIMATE_THRESHOLD: int = 100000
+
+    # Routes groupées (/bulk)
+    BULK_BATCH_SIZE: int = 500
+    BULK_MAX_ITEMS: int = 10000
+
+    # Export en flux (/export) : lignes lues par lot depuis le curseur serveur
+    EXPORT_BATCH_SIZE: int = 1000
 """
 
     # ajouter les lignes de add_to_env.txt
@@ -51,9 +133,10 @@ settings = Settings()
     # endregion
 
     # region .env
-    secret_key_bytes = random.SystemRandom().getrandbits(256).to_bytes(32, 'big')
-    secret_key = base64.urlsafe_b64encode(secret_key_bytes).decode('utf-8').rstrip('=')
-    secret_key = ''.join(filter(str.isalnum, secret_key))
+    if not secret_key:
+        secret_key_bytes = random.SystemRandom().getrandbits(256).to_bytes(32, 'big')
+        secret_key = base64.urlsafe_b64encode(secret_key_bytes).decode('utf-8').rstrip('=')
+        secret_key = ''.join(filter(str.isalnum, secret_key))
     file_content = """# Variables d'environnement - remplir selon besoin
 DEBUG=True
 
@@ -89,52 +172,80 @@ ACCESS_TOKEN_EXPIRE_MINUTES=30
     # endregion
 
 
-def create_custom_entities(base_path="."):
-    entities = get_entities()
-    for entity in entities:
-        filename = entity.lower() + ".py"
-        sqlmodels_path = os.path.join(base_path, "app", "entities", filename)
-        routers_path = os.path.join(base_path, "app", "routers", filename)
-        repositories_path = os.path.join(
-            base_path, "app", "repositories", entity.lower() + "_repository.py"
-        )
-        
+def create_custom_entities(base_path=".", async_mode=False, entities: dict = None, jobs: int = 1):
+    """
+    Écrit le modèle, le router et le repository de chaque entité. Avec `jobs` > 1 et au moins
+    PARALLEL_MIN_ENTITIES entités, les modules sont générés en parallèle dans des processus séparés.
+    """
+    entities = entities if entities is not None else load_entities()
+    if jobs > 1 and len(entities) >= PARALLEL_MIN_ENTITIES:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = max(1, len(entities) // (jobs * 4))
+            rendered = list(executor.map(render_entity, entities.values(), repeat(async_mode), chunksize=chunksize))
+    else:
+        rendered = [render_entity(entity, async_mode) for entity in entities.values()]
+
+    for files in rendered:
+        for relative_path, content in files:
+            with open(os.path.join(base_path, relative_path), "w", encoding="utf-8") as f:
+                f.write(content)
+        print(f"📄 Fichiers générés : {', '.join(relative_path for relative_path, _ in files)}")
 
-        with open(sqlmodels_path, "w", encoding="utf-8") as f:
-            f.write(generate_sql_model(entity, entities[entity]))
-            print(f"📄 Fichier généré : {sqlmodels_path}")
 
-        with open(routers_path, "w", encoding="utf-8") as f:
-            f.write(generate_default_routes(entity))
-            print(f"📄 Fichier généré : {routers_path}")
+def render_entity(entity: Entity, async_mode: bool = False) -> list:
+    """Modules d'une entité (chemin relatif au projet, contenu) : modèle, router et repository"""
+    filename = entity.name.lower() + ".py"
+    return [
+        (os.path.join("app", "entities", filename), generate_sql_model(entity)),
+        (os.path.join("app", "routers", filename), generate_default_routes(entity, async_mode)),
+        (os.path.join("app", "repositories", entity.name.lower() + "_repository.py"), generate_repository(entity, async_mode)),
+    ]
 
-        with open(repositories_path, "w", encoding="utf-8") as f:
-            f.write(generate_repository(entity))
-            print(f"📄 Fichier généré : {repositories_path}")
 
+def generate_repository(entity: Entity, async_mode: bool = False):
+    entity_name = entity.name
+    cache_argument = f", cache_ttl={entity.cache_ttl:g}" if entity.cache_ttl else ""
+    async_import = ""
+    if async_mode:
+        async_import = "from app.repositories.async_base_repository import AsyncBaseRepository\n"
 
-def generate_repository(entity_name: str):
-    return f"""from sqlalchemy.orm import Session
-from app.repositories.base_repository import BaseRepository
-from app.entities.{entity_name.lower()} import {entity_name}
+    content = f"""from app.repositories.base_repository import BaseRepository
+{async_import}from app.entities.{entity_name.lower()} import {entity_name}, {entity_name}Update
 
 class {entity_name}Repository(BaseRepository[{entity_name}]):
     def __init__(self):
-        super().__init__({entity_name})
+        super().__init__({entity_name}{cache_argument}, update_schema={entity_name}Update)
 """
 
+    if async_mode:
+        content += f"""
+
+class {entity_name}AsyncRepository(AsyncBaseRepository[{entity_name}]):
+    def __init__(self):
+        super().__init__({entity_name}Repository())
+"""
+    return content
+
+
+def generate_sql_model(entity: Entity):
+    entity_name = entity.name
+    table_indexes = _parse_entity_indexes(entity)
 
-def generate_sql_model(entity_name: str, attributes: list):
     sql_content = "from sqlmodel import SQLModel, Field\n"
+    if table_indexes:
+        sql_content = "from sqlmodel import SQLModel, Field, Index\n"
+    if any(index["where"] for index in table_indexes):
+        sql_content += "from sqlalchemy import text\n"
+    if _not_null_attributes(entity):
+        sql_content += "from pydantic import field_validator\n"
     sql_content += "from datetime import datetime, date\n"
     sql_content += "from typing import Optional\n\n"
 
-    # Add imports for custom types
-    custom_types = set()
-    for attr in attributes:
-        attr_parts = attr.split()
-        if len(attr_parts) > 1 and _is_custom_type(attr_parts[1]):
-            custom_types.add(attr_parts[1])
+    # Add imports for custom types (les clés étrangères sont des colonnes int, sans import)
+    custom_types = []
+    for attribute in entity.attributes:
+        if not attribute.foreign_key and _is_custom_type(attribute.type) and attribute.type not in custom_types:
+            custom_types.append(attribute.type)
 
     for custom_type in custom_types:
         sql_content += f"from app.entities.{custom_type.lower()} import {custom_type}\n"
@@ -142,132 +253,247 @@ def generate_sql_model(entity_name: str, attributes: list):
     sql_content += f"\nclass {entity_name}(SQLModel, table=True):\n"
     sql_content += "    id: int = Field(default=None, primary_key=True)\n"
 
-    for attr in attributes:
-        attr_parts = attr.split()
-        var_name = attr_parts[0]
-        var_type = attr_parts[1] if len(attr_parts) > 1 else "str"
-
-        # Parse modifiers
-        modifiers = _parse_attribute_modifiers(attr)
-
-        # Convert Python types to SQLModel types
-        field_type = _convert_type_to_sqlmodel(var_type)
+    for attribute in entity.attributes:
+        field_type = attribute.py_type
 
         # Make field optional if not required (not .nn and no default)
-        if not modifiers['not_null'] and modifiers['default'] is None:
+        if attribute.nullable:
             field_type = f"Optional[{field_type}]"
 
         # Build Field parameters
-        field_params = _build_field_parameters(modifiers, var_type)
+        field_params = _build_field_parameters(attribute)
 
         field_def = f"Field({', '.join(field_params)})" if field_params else "Field()"
-        sql_content += f"    {var_name}: {field_type} = {field_def}\n"
-
+        sql_content += f"    {attribute.name}: {field_type} = {field_def}\n"
+
+    if table_indexes:
+        sql_content += "\n"
+    for index in table_indexes:
+        columns = []
+        for column in index["columns"]:
+            name, _, order = column.partition(" ")
+            expression = f"{entity_name}.__table__.c.{name}"
+            columns.append(f"{expression}.desc()" if order == "desc" else expression)
+        params = [f'"{index["name"]}"'] + columns
+        if index["where"]:
+            predicate = index["where"].replace("\\", "\\\\").replace('"', '\\"')
+            params += [f'postgresql_where=text("{predicate}")', f'sqlite_where=text("{predicate}")']
+        sql_content += f"Index({', '.join(params)})\n"
+
+    sql_content += generate_write_schemas(entity)
     return sql_content
 
 
-def _parse_attribute_modifiers(attr: str) -> dict:
-    modifiers = {
-        'not_null': '.nn' in attr,
-        'unique': '.unique' in attr,
-        'foreign_key': '.fk' in attr,
-        'default': None,
-        'max_length': None,
-        'range_min': None,
-        'range_max': None
-    }
-    
-    # Parse default value
-    if '.default(' in attr:
-        try:
-            start = attr.find('.default(') + len('.default(')
-            end = attr.find(')', start)
-            if end != -1:
-                modifiers['default'] = attr[start:end].strip()
-        except:  # noqa: E722
-            pass
-    
-    # Parse max length - look for .len( followed by digits
-    if '.len(' in attr:
-        try:
-            start = attr.find('.len(') + len('.len(')
-            end = attr.find(')', start)
-            if end != -1:
-                modifiers['max_length'] = attr[start:end].strip()
-        except:  # noqa: E722
-            pass
-    
-    # Parse range - look for .range(min, max) or .range(min,) or .range(,max)
-    if '.range(' in attr:
-        try:
-            start = attr.find('.range(') + len('.range(')
-            end = attr.find(')', start)
-            if end != -1:
-                range_content = attr[start:end].strip()
-                if ',' in range_content:
-                    range_parts = [part.strip() for part in range_content.split(',')]
-                    # Handle min value (first part)
-                    if len(range_parts) >= 1 and range_parts[0]:
-                        modifiers['range_min'] = range_parts[0]
-                    # Handle max value (second part)
-                    if len(range_parts) >= 2 and range_parts[1]:
-                        modifiers['range_max'] = range_parts[1]
-                else:
-                    # Single value case - treat as both min and max
-                    if range_content:
-                        modifiers['range_min'] = range_content
-                        modifiers['range_max'] = range_content
-        except:  # noqa: E722
-            pass
-    
-    return modifiers
-
-
-def _convert_type_to_sqlmodel(var_type: str) -> str:
-    type_mapping = {
-        'int': 'int',
-        'integer': 'int',
-        'str': 'str', 
-        'string': 'str',
-        'float': 'float',
-        'decimal': 'float',
-        'bool': 'bool',
-        'boolean': 'bool',
-        'date': 'date',
-        'datetime': 'datetime'
-    }
-    
-    return type_mapping.get(var_type.lower(), var_type)
-
-
-def _build_field_parameters(modifiers: dict, var_type: str) -> list:
+def generate_write_schemas(entity: Entity) -> str:
+    """
+    Schémas d'écriture de l'entité, modèles sans table donc validés à la réception :
+    <Entity>Create (POST, PUT), <Entity>Update (PATCH, tous les champs optionnels) et, par clé naturelle,
+    <Entity>UpsertBy<Clé> (PUT /by-<clé>/{valeur} : <Entity>Create dont la clé, prise dans l'URL, est facultative).
+    Sans id ni updated_at, renseignés par la base et le repository. Dans <Entity>Update, un champ `.nn` peut être
+    omis mais pas mis à null explicitement (422).
+    """
+    # Contraintes propres à la table, sans effet sur la validation
+    table_only = ("unique=", "index=", "foreign_key=")
+    create_fields, update_fields = [], {}
+    for attribute in entity.attributes:
+        if attribute.name == "updated_at":
+            continue
+
+        field_type = attribute.py_type
+        params = [p for p in _build_field_parameters(attribute) if not p.startswith(table_only)]
+        create_type = field_type if not attribute.nullable else f"Optional[{field_type}]"
+        create_fields.append(f"    {attribute.name}: {create_type} = Field({', '.join(params)})\n")
+        update_params = ["default=None"] + [p for p in params if not p.startswith("default=")]
+        update_fields[attribute.name] = f"    {attribute.name}: Optional[{field_type}] = Field({', '.join(update_params)})\n"
+
+    content = f"\n\nclass {entity.name}Create(SQLModel):\n"
+    content += "".join(create_fields) or "    pass\n"
+    content += f"\n\nclass {entity.name}Update(SQLModel):\n"
+    content += "".join(update_fields.values()) or "    pass\n"
+    not_null = _not_null_attributes(entity)
+    if not_null:
+        # Le validateur ne s'exécute que sur les valeurs reçues : un champ omis garde sa valeur en base
+        content += f"""
+    @field_validator({", ".join(f'"{name}"' for name in not_null)})
+    @classmethod
+    def reject_null(cls, value):
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+"""
+    for key, _ in _upsert_columns(entity)[0]:
+        content += f"\n\nclass {_upsert_schema(entity, key)}({entity.name}Create):\n"
+        content += update_fields[key]
+    return content
+
+
+def _upsert_schema(entity: Entity, key: str) -> str:
+    """Nom du schéma de PUT /by-<clé>/{valeur} : <Entity>UpsertBy<Clé>"""
+    return f"{entity.name}UpsertBy" + "".join(part.capitalize() for part in key.split("_"))
+
+
+def _not_null_attributes(entity: Entity) -> list:
+    """Attributs écrits par les clients et non nullables (`.nn`)"""
+    return [attribute.name for attribute in entity.attributes if not attribute.nullable and attribute.name != "updated_at"]
+
+
+def _parse_entity_indexes(entity: Entity) -> list:
+    """
+    Nomme les index `.index(col_a, col_b desc, where=prédicat)` d'une entité.
+
+    Returns:
+        list: Les index valides {"name", "columns" (ex: "epoch desc"), "where"} ; les autres sont signalés et ignorés.
+    """
+    known_columns = {"id"} | {attribute.name for attribute in entity.attributes}
+    table = entity.name.lower()
+    parsed = []
+    # Noms déjà pris par les index de colonne (.index, .fk) : ix_<table>_<colonne>
+    used_names = set()
+    for attribute in entity.attributes:
+        if not attribute.unique and (attribute.index or attribute.foreign_key):
+            used_names.add(f"ix_{table}_{attribute.name}")
+
+    for index in entity.indexes:
+        unknown = [column.split()[0] for column in index.columns if column.split()[0] not in known_columns]
+        if unknown:
+            warn(f"Index ignoré pour {entity.name} (ligne {index.line}) : colonnes inconnues {unknown}")
+            continue
+
+        name = f"ix_{table}_" + "_".join(column.split()[0] for column in index.columns)
+        if index.where:
+            name += "_partial"
+        base_name, suffix = name, 2
+        while name in used_names:
+            name, suffix = f"{base_name}_{suffix}", suffix + 1
+        used_names.add(name)
+
+        parsed.append({
+            "name": name,
+            "columns": index.columns,
+            "where": index.where,
+        })
+
+    return parsed
+
+
+def _build_field_parameters(attribute: Attribute) -> list:
     field_params = []
     
-    if modifiers['default'] is not None:
-        field_params.append(f"default={modifiers['default']}")
-    elif not modifiers['not_null']:
+    if attribute.default is not None:
+        field_params.append(f"default={attribute.default}")
+    elif not attribute.not_null:
         field_params.append("default=None")
     
-    if modifiers['unique']:
+    if attribute.unique:
         field_params.append("unique=True")
+    elif attribute.index or attribute.foreign_key:
+        # Les clés étrangères sont toujours indexées (jointures, suppressions en cascade)
+        field_params.append("index=True")
     
-    if modifiers['foreign_key']:
-        fk_table = var_type.lower()
-        field_params.append(f'foreign_key="{fk_table}.id"')
+    if attribute.foreign_key:
+        field_params.append(f'foreign_key="{attribute.foreign_key.lower()}.id"')
     
-    if modifiers['max_length'] and var_type.lower() in ['str', 'string']:
-        field_params.append(f"max_length={modifiers['max_length']}")
+    if attribute.max_length and attribute.py_type == "str":
+        field_params.append(f"max_length={attribute.max_length}")
     
     # Add range constraints for numeric types
-    if var_type.lower() in ['int', 'integer', 'float', 'decimal']:
-        if modifiers['range_min'] is not None:
-            field_params.append(f"ge={modifiers['range_min']}")
-        if modifiers['range_max'] is not None:
-            field_params.append(f"le={modifiers['range_max']}")
+    if attribute.py_type in ("int", "float"):
+        if attribute.range_min is not None:
+            field_params.append(f"ge={attribute.range_min}")
+        if attribute.range_max is not None:
+            field_params.append(f"le={attribute.range_max}")
     
     return field_params
 
 
+def _indexed_attributes(entity: Entity) -> list:
+    """Retourne les noms des attributs indexés en base (utilisables pour la pagination par curseur)"""
+    indexed = [attribute.name for attribute in entity.attributes if attribute.unique or attribute.index or attribute.foreign_key]
+    # Première colonne d'un index composite : utilisable seule pour trier
+    for index in entity.indexes:
+        first = index.columns[0].split()[0]
+        if first not in indexed and first != "id" and entity.attribute(first):
+            indexed.append(first)
+    return indexed
+
+
+def _upsert_columns(entity: Entity) -> tuple:
+    """
+    Colonnes des routes d'upsert : clés naturelles (.unique) avec leur type, et colonnes utilisables
+    comme garde « plus récent » (nombres et dates, hors updated_at toujours renseigné par le repository).
+    """
+    keys, guards = [], []
+    for attribute in entity.attributes:
+        if attribute.unique:
+            keys.append((attribute.name, attribute.py_type))
+        elif attribute.py_type in ("int", "float", "date", "datetime") and attribute.name != "updated_at":
+            guards.append(attribute.name)
+    return keys, guards
+
+
+def build_schema_snapshot(entities: dict) -> dict:
+    """Décrit les tables des entités (colonnes, types, contraintes, index) : base des migrations versionnées"""
+    schema = {}
+    for entity in entities.values():
+        table = entity.name.lower()
+        table_indexes = {}
+        columns = {
+            "id": {"type": "int", "nullable": False, "primary_key": True, "unique": False,
+                   "max_length": None, "foreign_key": None},
+        }
+        for attribute in entity.attributes:
+            columns[attribute.name] = {
+                "type": attribute.py_type.lower(),
+                "nullable": attribute.nullable,
+                "primary_key": False,
+                "unique": attribute.unique,
+                "max_length": attribute.max_length if attribute.py_type == "str" else None,
+                "foreign_key": f"{attribute.foreign_key.lower()}.id" if attribute.foreign_key else None,
+            }
+            if not attribute.unique and (attribute.index or attribute.foreign_key):
+                table_indexes[f"ix_{table}_{attribute.name}"] = {"columns": [attribute.name], "where": None}
+        for index in _parse_entity_indexes(entity):
+            table_indexes[index["name"]] = {"columns": index["columns"], "where": index["where"]}
+        schema[table] = {"columns": columns, "indexes": table_indexes}
+    return schema
+
+
+def _filter_parameters(entity: Entity) -> list:
+    """
+    Paramètres de filtre de la route de liste, pour les colonnes indexées uniquement :
+    égalité et `__in` pour tous les types, `__gte` / `__lte` pour les nombres et dates, `__prefix` pour les chaînes.
+
+    Returns:
+        list: Les couples (nom du paramètre, annotation de type).
+    """
+    indexed = _indexed_attributes(entity)
+    parameters = []
+    not_indexed = []
+    for attribute in [Attribute("id", "int", entity.line)] + entity.attributes:
+        name = attribute.name
+        if name != "id" and name not in indexed:
+            not_indexed.append(name)
+            continue
+
+        py_type = attribute.py_type
+        if py_type not in ("int", "float", "str", "bool", "date", "datetime"):
+            continue
+
+        parameters.append((name, f"Optional[{py_type}]"))
+        if py_type != "bool":
+            parameters.append((f"{name}__in", f"Optional[list[{py_type}]]"))
+        if py_type in ("int", "float", "date", "datetime"):
+            parameters.append((f"{name}__gte", f"Optional[{py_type}]"))
+            parameters.append((f"{name}__lte", f"Optional[{py_type}]"))
+        if py_type == "str":
+            parameters.append((f"{name}__prefix", "Optional[str]"))
+
+    if not_indexed:
+        warn(f"{entity.name} (ligne {entity.line}) : pas de filtre sur les colonnes non indexées ({', '.join(not_indexed)}). "
+             "Ajoutez .index pour les rendre filtrables.")
+    return parameters
+
+
 def _is_custom_type(py_type: str) -> bool:
     built_in_types = {'int', 'str', 'float', 'date', 'datetime', 'bool', 'list', 'dict', 'integer', 'string', 'decimal', 'boolean'}
     return py_type.lower() not in built_in_types
@@ -287,12 +513,12 @@ def parse_py_types_to_sql_type(py_type: str) -> str:
     elif py_type.lower() in ["bool", "boolean"]:
         return "Boolean"
     else:
-        print("⚠️ Type non reconnu : " + py_type)
-        print("Le type sera ajouté tel quel")
+        warn(f"Type non reconnu : {py_type}, ajouté tel quel")
         return py_type
 
 
-def generate_default_routes(entity_name: str) -> str:
+def generate_default_routes(entity: Entity, async_mode: bool = False) -> str:
+    entity_name = entity.name
     lname = entity_name.lower()
     plural = lname
     if lname.endswith("s"):
@@ -301,61 +527,273 @@ def generate_default_routes(entity_name: str) -> str:
         plural = lname + "s"
 
 
-    roles = get_acces_for_entities(entity_name)
-    read_roles = roles[0]
-    write_roles = roles[1]
-    delete_roles = roles[2]
-
+    read_roles = entity.read_roles
+    write_roles = entity.write_roles
+    delete_roles = entity.delete_roles
+
+    sort_pattern = "^-?(" + "|".join(["id"] + _indexed_attributes(entity)) + ")$"
+    filters = _filter_parameters(entity)
+    filter_signature = "".join(f"    {name}: {annotation} = Query(None),\n" for name, annotation in filters)
+    filter_dict = "".join(f'        "{name}": {name},\n' for name, _ in filters)
+    datetime_import = ""
+    if any("date" in annotation for _, annotation in filters):
+        datetime_import = "from datetime import date, datetime\n"
+
+
+    if async_mode:
+        fn, aw = "async def", "await "
+        session_import = "from sqlmodel.ext.asyncio.session import AsyncSession"
+        db_import = "from app.utils.core.async_database import get_async_db, get_async_read_db"
+        db_dependency = "AsyncSession = Depends(get_async_db)"
+        read_db_dependency = "AsyncSession = Depends(get_async_read_db)"
+        repository_class = f"{entity_name}AsyncRepository"
+        sync_repo = "repo.sync"
+        roles_module = "app.utils.auth.async_roles"
+    else:
+        fn, aw = "def", ""
+        session_import = "from sqlalchemy.orm import Session"
+        db_import = "from app.utils.core.database import get_db\nfrom app.utils.core.replicas import get_read_db"
+        db_dependency = "Session = Depends(get_db)"
+        read_db_dependency = "Session = Depends(get_read_db)"
+        repository_class = f"{entity_name}Repository"
+        sync_repo = "repo"
+        roles_module = "app.utils.auth.roles"
+    repository_import = f"from app.repositories.{lname}_repository import {repository_class}"
+
+    upsert_keys, guard_columns = _upsert_columns(entity)
+    entity_imports = ", ".join(
+        [entity_name, f"{entity_name}Create", f"{entity_name}Update"] + [_upsert_schema(entity, key) for key, _ in upsert_keys]
+    )
+    if any(annotation in ("date", "datetime") for _, annotation in upsert_keys):
+        datetime_import = "from datetime import date, datetime\n"
+    guard_query = "None"
+    if guard_columns:
+        guard_pattern = "^(" + "|".join(guard_columns) + ")$"
+        guard_query = f'Query(None, pattern="{guard_pattern}", description="N\'écrase une ligne existante que si la nouvelle valeur de cette colonne est plus récente")'
+    upsert_routes = ""
+    for key, annotation in upsert_keys:
+        upsert_routes += f'''@router.put("/by-{key}", description="Création ou remplacement groupé par {key} (INSERT ... ON CONFLICT), un résultat par élément. Route disponible pour les rôles: {write_roles}")
+{fn} bulk_upsert_{plural}_by_{key}(items: list[dict] = Body(...), guard: Optional[str] = {guard_query}, batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=settings.BULK_MAX_ITEMS), db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    check_bulk_size(items)
+    return bulk_summary({aw}repo.bulk_upsert(db, items, key="{key}", guard=guard, batch_size=batch_size))
+
+@router.put("/by-{key}/{{value}}", response_model={entity_name}, description="Création ou remplacement par {key} en une requête (INSERT ... ON CONFLICT). {key} facultatif dans le corps, pris dans l'URL (422 s'il diffère). En-tête X-Upsert : written ou skipped (garde). Route disponible pour les rôles: {write_roles}")
+{fn} upsert_{lname}_by_{key}(value: {annotation}, payload: {_upsert_schema(entity, key)}, response: Response, guard: Optional[str] = {guard_query}, db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    data = payload.model_dump()
+    if data["{key}"] is not None and data["{key}"] != value:
+        raise HTTPException(status_code=422, detail="{key} in body does not match the URL")
+    obj, written = {aw}repo.upsert(db, "{key}", {{**data, "{key}": value}}, guard=guard)
+    response.headers["X-Upsert"] = "written" if written else "skipped"
+    set_validators(response, item_validators({sync_repo}.version_of(obj)))
+    return obj
 
-    toret = f'''from fastapi import Body, APIRouter, HTTPException, Depends
-from app.entities.{lname} import {entity_name}
-from sqlalchemy.orm import Session
-from app.repositories.{lname}_repository import {entity_name}Repository
-from app.utils.core.database import get_db
-from app.utils.auth.roles import require_role
+'''
 
+    # Validateurs HTTP de la liste : sonde max(updated_at)/count avant la requête si la colonne existe (mêmes ETag et
+    # Last-Modified sur la réponse 200 et sur la revalidation), empreinte de la page sinon
+    if entity.attribute("updated_at"):
+        collection_probe = f"""    validators = collection_validators(request, {aw}repo.collection_version(db, filters=filters))
+    cached = not_modified(request, validators)
+    if cached:
+        return cached
+"""
+        page_probe = ""
+    else:
+        collection_probe = ""
+        page_probe = """    validators = collection_validators(request, page_version(page.items))
+    cached = not_modified(request, validators)
+    if cached:
+        return cached
+"""
 
-router = APIRouter(prefix="/{plural}", tags=["{entity_name}"])
-repo = {entity_name}Repository()
+    toret = f'''{datetime_import}from typing import Optional
+from fastapi import Body, APIRouter, HTTPException, Depends, Query, Request, Response
+from app.entities.{lname} import {entity_imports}
+{session_import}
+{repository_import}
+from app.utils.core.config import settings
+{db_import}
+from app.utils.core.pagination import set_pagination_headers
+from app.utils.core.bulk import bulk_summary, check_bulk_size
+from app.utils.core.export import export_response
+from app.utils.core.fields import fields_response, parse_fields
+from app.utils.core.conditional import (
+    check_if_match, collection_validators, is_conditional, item_validators, not_modified, page_version, set_validators,
+)
+from {roles_module} import require_role
 
-@router.get("/", response_model=list[{entity_name}], description="Route disponible pour les rôles: {read_roles}")
-def get_all_{plural}(db: Session = Depends(get_db), current_user=Depends(require_role({read_roles}))):
-    return repo.list(db)
 
-@router.get("/{{id}}", response_model={entity_name}, description="Route disponible pour les rôles: {read_roles}")
-def get_{lname}_by_id(id: int, db: Session = Depends(get_db), current_user=Depends(require_role({read_roles}))):
-    obj = repo.get_by_id(db, id)
+router = APIRouter(prefix="/{plural}", tags=["{entity_name}"])
+repo = {repository_class}()
+
+@router.get("/", response_model=list[{entity_name}], description="Route disponible pour les rôles: {read_roles}. Filtres sur les colonnes indexées (colonne, colonne__in, __gte, __lte, __prefix). Pagination par curseur : suivre l'en-tête Link / X-Next-Cursor.")
+{fn} get_all_{plural}(
+    request: Request,
+    response: Response,
+    after: Optional[str] = Query(None, description="Curseur opaque de la page précédente"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    sort: str = Query("id", pattern="{sort_pattern}", description="Clé primaire ou colonne indexée, préfixe - pour un tri décroissant"),
+    total: bool = Query(False, description="Ajoute le nombre total de lignes dans l'en-tête X-Total-Count"),
+    fields: Optional[str] = Query(None, description="Colonnes à renvoyer, séparées par des virgules (ex: id,nom,epoch)"),
+{filter_signature}    db: {read_db_dependency},
+    current_user=Depends(require_role({read_roles})),
+):
+    filters = {{
+{filter_dict}    }}
+    selected = parse_fields(fields, {entity_name})
+{collection_probe}    try:
+        page = {aw}repo.paginate(db, after=after, limit=limit, sort=sort, filters=filters, fields=selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+{page_probe}    set_validators(response, validators)
+    set_pagination_headers(request, response, page.next_cursor)
+    if total:
+        response.headers["X-Total-Count"] = str({aw}repo.count(db, mode=settings.COUNT_MODE, filters=filters))
+    if selected:
+        # Réponse construite à la main : les en-têtes posés sur `response` sont à recopier
+        return fields_response({entity_name}, selected, page.items, headers=response.headers)
+    return page.items
+
+@router.get("/export", description="Export complet en flux : NDJSON par défaut, CSV avec Accept: text/csv. Route disponible pour les rôles: {read_roles}")
+def export_{plural}(request: Request, current_user=Depends(require_role({read_roles}))):
+    return export_response(request, {sync_repo}.stream, {sync_repo}.columns(), filename="{plural}")
+
+@router.post("/bulk", description="Création groupée, un résultat par élément. Route disponible pour les rôles: {write_roles}")
+{fn} bulk_create_{plural}(items: list[dict] = Body(...), batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=settings.BULK_MAX_ITEMS), db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    check_bulk_size(items)
+    return bulk_summary({aw}repo.bulk_save(db, items, batch_size, operation="create"))
+
+@router.put("/bulk", description="Mise à jour groupée partielle (id obligatoire, seuls les champs envoyés sont écrits), un résultat par élément. Route disponible pour les rôles: {write_roles}")
+{fn} bulk_update_{plural}(items: list[dict] = Body(...), batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=settings.BULK_MAX_ITEMS), db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    check_bulk_size(items)
+    return bulk_summary({aw}repo.bulk_save(db, items, batch_size, operation="update"))
+
+@router.delete("/bulk", description="Suppression groupée par id, un résultat par élément. Route disponible pour les rôles: {delete_roles}")
+{fn} bulk_delete_{plural}(ids: list[int] = Body(...), batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=settings.BULK_MAX_ITEMS), db: {db_dependency}, current_user=Depends(require_role({delete_roles}))):
+    check_bulk_size(ids)
+    return bulk_summary({aw}repo.bulk_delete(db, ids, batch_size))
+
+{upsert_routes}@router.get("/{{id}}", response_model={entity_name}, description="Route disponible pour les rôles: {read_roles}")
+{fn} get_{lname}_by_id(
+    id: int,
+    request: Request,
+    response: Response,
+    db: {read_db_dependency},
+    fields: Optional[str] = Query(None, description="Colonnes à renvoyer, séparées par des virgules"),
+    current_user=Depends(require_role({read_roles})),
+):
+    selected = parse_fields(fields, {entity_name})
+    # Sonde de version seulement sur une revalidation : une lecture simple ne fait qu'une requête
+    if is_conditional(request):
+        version = {aw}repo.row_version(db, id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="{entity_name} not found")
+        cached = not_modified(request, item_validators(version, fields))
+        if cached:
+            return cached
+
+    if selected:
+        # Colonnes de la version (id, updated_at) lues avec la projection, non renvoyées si non demandées
+        obj = {aw}repo.get_fields(db, id, tuple(dict.fromkeys(selected + {sync_repo}.version_fields())))
+    else:
+        obj = {aw}repo.get_by_id(db, id)
     if not obj:
         raise HTTPException(status_code=404, detail="{entity_name} not found")
+    set_validators(response, item_validators({sync_repo}.version_of(obj), fields))
+    if selected:
+        return fields_response({entity_name}, selected, obj, many=False, headers=response.headers)
     return obj
 
 @router.post("/", response_model={entity_name}, status_code=201, description="Route disponible pour les rôles: {write_roles}")
-def create_{lname}(payload: dict = Body(...), db: Session = Depends(get_db), current_user=Depends(require_role({write_roles}))):
-    return repo.save(db, payload)
+{fn} create_{lname}(payload: {entity_name}Create, response: Response, db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    obj = {aw}repo.create(db, payload.model_dump())
+    set_validators(response, item_validators({sync_repo}.version_of(obj)))
+    return obj
 
-@router.put("/{{id}}", response_model={entity_name}, description="Route disponible pour les rôles: {write_roles}")
-def update_{lname}(id: int, payload: dict = Body(...), db: Session = Depends(get_db), current_user=Depends(require_role({write_roles}))):
-    obj = repo.save(db, id, payload)
+@router.put("/{{id}}", response_model={entity_name}, description="Remplacement complet (champs absents remis à leur valeur par défaut). Route disponible pour les rôles: {write_roles}")
+{fn} update_{lname}(id: int, payload: {entity_name}Create, request: Request, response: Response, db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    if "if-match" in request.headers:
+        check_if_match(request, {aw}repo.row_version(db, id, lock=True))
+    obj = {aw}repo.update(db, id, payload.model_dump())
     if not obj:
         raise HTTPException(status_code=404, detail="{entity_name} not found")
+    set_validators(response, item_validators({sync_repo}.version_of(obj)))
+    return obj
+
+@router.patch("/{{id}}", response_model={entity_name}, description="Mise à jour partielle (seuls les champs envoyés sont écrits). Route disponible pour les rôles: {write_roles}")
+{fn} patch_{lname}(id: int, payload: {entity_name}Update, request: Request, response: Response, db: {db_dependency}, current_user=Depends(require_role({write_roles}))):
+    if "if-match" in request.headers:
+        check_if_match(request, {aw}repo.row_version(db, id, lock=True))
+    obj = {aw}repo.update(db, id, payload.model_dump(exclude_unset=True))
+    if not obj:
+        raise HTTPException(status_code=404, detail="{entity_name} not found")
+    set_validators(response, item_validators({sync_repo}.version_of(obj)))
     return obj
 
 @router.delete("/{{id}}", status_code=204, description="Route disponible pour les rôles: {delete_roles}")
-def delete_{lname}(id: int, db: Session = Depends(get_db), current_user=Depends(require_role({delete_roles}))):
-    ok = repo.delete(db, id)
+{fn} delete_{lname}(id: int, request: Request, db: {db_dependency}, current_user=Depends(require_role({delete_roles}))):
+    if "if-match" in request.headers:
+        check_if_match(request, {aw}repo.row_version(db, id, lock=True))
+    ok = {aw}repo.delete(db, id)
     if not ok:
         raise HTTPException(status_code=404, detail="{entity_name} not found")
 '''
 
     return toret
 
+def _module_names(package_path: str, package: str) -> list:
+    """Noms des modules Python d'un dossier du projet (sous-dossiers compris), triés"""
+    modules = []
+    for root, dirs, files in os.walk(package_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("_"))
+        relative = os.path.relpath(root, package_path)
+        prefix = package if relative == "." else package + "." + relative.replace(os.sep, ".")
+        modules += [f"{prefix}.{f[:-3]}" for f in sorted(files) if f.endswith(".py") and not f.startswith("_")]
+    return modules
+
+
+def _router_prefix(module_path: str) -> str:
+    with open(module_path, "r", encoding="utf-8") as f:
+        match = re.search(r'APIRouter\(\s*prefix\s*=\s*"([^"]*)"', f.read())
+    return match.group(1) if match else ""
+
+
+def create_registry(project_path, async_mode=False):
+    """
+    Écrit app/registry.py : liste figée des modules d'entités et de routers, dans un ordre déterministe.
+    main.py importe ces modules directement au lieu de parcourir les dossiers au démarrage.
+    ASYNC_MODE indique une génération avec --async (connexion et pool asynchrones, voir main.py et routers/auth.py).
+    """
+    app_path = os.path.join(project_path, "app")
+    entity_modules = _module_names(os.path.join(app_path, "entities"), "app.entities")
+    router_modules = [
+        (module, _router_prefix(os.path.join(project_path, *module.split(".")) + ".py"))
+        for module in _module_names(os.path.join(app_path, "routers"), "app.routers")
+    ]
+
+    content = "# Fichier généré par InitFastAPIProject.py : relancer la génération plutôt que de le modifier\n\n"
+    content += "ENTITY_MODULES = (\n"
+    content += "".join(f'    "{module}",\n' for module in entity_modules)
+    content += ")\n\n"
+    content += "# (module, préfixe des routes) : le préfixe sert au chargement paresseux (LAZY_ROUTERS)\n"
+    content += "ROUTER_MODULES = (\n"
+    content += "".join(f'    ("{module}", "{prefix}"),\n' for module, prefix in router_modules)
+    content += ")\n\n"
+    content += f"ASYNC_MODE = {bool(async_mode)}\n"
+
+    registry_path = os.path.join(app_path, "registry.py")
+    with open(registry_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    print(f"📄 Fichier généré : {os.path.relpath(registry_path, project_path)}")
+
+
 def copy_base_template(project_path):
     local_base_path = os.path.abspath(
         os.path.join(os.path.dirname(__file__), "template")
     )
     dist_base_path = os.path.join(project_path)
 
-    shutil.copytree(local_base_path, dist_base_path)
+    shutil.copytree(local_base_path, dist_base_path, ignore=shutil.ignore_patterns("__pycache__"))
 
 
 
@@ -401,26 +839,70 @@ def seed_roles(db: Session):
     with open(project_path + "/app/utils/seeds/seed_roles.py", "w", encoding="utf-8") as f:
         f.write(seed_role_py)
 
-def init_fastapi_project():
+def _previous_secret_key(project_path):
+    """SECRET_KEY de la génération précédente : conservée pour que .env et envs/ ne changent pas à chaque génération"""
+    content = generated_content(project_path, ".env")
+    if content is None and os.path.isfile(os.path.join(project_path, ".env")):
+        with open(os.path.join(project_path, ".env"), "rb") as f:
+            content = f.read()
+    match = re.search(rb"^SECRET_KEY=(\w+)\s*$", content or b"", re.MULTILINE)
+    return match.group(1).decode("ascii") if match else None
+
+
+def init_fastapi_project(async_mode=False, clean=False, jobs=None):
+    """
+    Génère le projet dans `generated/`. Le projet complet est d'abord généré dans un dossier temporaire, puis
+    seuls les fichiers dont le contenu a changé sont réécrits (voir incremental.sync_project) : les modifications
+    faites à la main sont conservées et les conflits signalés. `clean` supprime d'abord le dossier généré.
+    """
     project_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "generated"))
+    jobs = jobs or os.cpu_count() or 1
 
     print("Initialisation du projet FastAPI dans :", project_path)
 
-    # Suppression robuste du dossier existant
-    while os.path.exists(project_path):
-        try:
-            os.rmdir(project_path)
-        except Exception:
-            print("Erreur lors de la suppression du dossier :", project_path)
-            time.sleep(0.25)
-
-    copy_base_template(project_path)
-    create_env_config(project_path)
-    create_custom_entities(project_path)
-    create_roles(project_path)
-
+    # Lecture unique de config/entities.txt, avant toute modification du dossier généré
+    try:
+        entities = load_entities()
+    except EntitiesSyntaxError as e:
+        print(f"❌ {len(e.errors)} erreur(s) dans {e.path} :\n{e}")
+        raise SystemExit(1)
+
+    if clean and os.path.exists(project_path):
+        remove_project(project_path)
+
+    with tempfile.TemporaryDirectory(prefix=".generated-", dir=os.path.dirname(project_path)) as staging:
+        staging_path = os.path.join(staging, "generated")
+        copy_base_template(staging_path)
+        create_env_config(staging_path, _previous_secret_key(project_path))
+        create_custom_entities(staging_path, async_mode, entities, jobs)
+        create_registry(staging_path, async_mode)
+        create_migration(build_schema_snapshot(entities))
+        copy_migrations(staging_path)
+        create_roles(staging_path)
+        report = sync_project(staging_path, project_path, jobs)
+
+    report.show()
     print("✅ Projet FastAPI initialisé avec succès !")
 
 
 if __name__ == "__main__":
-    init_fastapi_project()
+    parser = argparse.ArgumentParser(description="Génère un projet FastAPI à partir de config/entities.txt")
+    parser.add_argument(
+        "--async",
+        dest="async_mode",
+        action="store_true",
+        help="Génère des repositories et des routes asynchrones (AsyncSession, asyncpg)",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Supprime generated/ avant la génération (modifications faites à la main comprises)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Entités et fichiers traités en parallèle (défaut : nombre de processeurs)",
+    )
+    args = parser.parse_args()
+    init_fastapi_project(async_mode=args.async_mode, clean=args.clean, jobs=args.jobs)
@@ -0,0 +1,85 @@
+"""
+Mesure le temps de génération en fonction du nombre d'entités de entities.txt.
+
+Construit des schémas synthétiques de `--sizes` entités (une vingtaine d'attributs, contraintes, clé étrangère vers
+l'entité précédente, index composite), puis chronomètre l'analyse du fichier et la génération en mémoire de chaque
+module (modèle, router, repository) et du schéma des migrations. Le temps par entité doit rester constant :
+le fichier est lu une seule fois, quel que soit le nombre d'entités.
+
+    python benchmarks/bench_generator.py --sizes 250 500 1000 2000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from InitFastAPIProject import (  # noqa: E402
+    build_schema_snapshot,
+    generate_default_routes,
+    generate_repository,
+    generate_sql_model,
+)
+from utils import parse_entities  # noqa: E402
+
+
+def synthetic_schema(count: int) -> str:
+    """entities.txt de `count` entités, chacune liée à la précédente par une clé étrangère"""
+    blocks = []
+    for number in range(count):
+        lines = [f"Entity{number} .r any .w Operator,Admin .cache(60)"]
+        lines.append("- code str .len(24) .unique .nn")
+        lines.append("- epoch datetime .index")
+        lines.append("- value int .range(0..99999)")
+        lines.append("- ratio float .range(0, 1)")
+        lines.append("- active bool .default(True)")
+        for column in range(15):
+            lines.append(f"- attribut_{column} {('str', 'int', 'float')[column % 3]}")
+        if number:
+            lines.append(f"- parent_id int .fk Entity{number - 1}")
+        lines.append("- updated_at datetime")
+        lines.append(".index(code, epoch desc)")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate(text: str) -> tuple[float, float, int]:
+    """Durées (s) de l'analyse et de la génération, taille totale du code généré"""
+    start = time.perf_counter()
+    entities = parse_entities(text)
+    parsed = time.perf_counter()
+    size = 0
+    # Le générateur signale les colonnes non filtrables : sorties ignorées pendant la mesure
+    with contextlib.redirect_stdout(io.StringIO()):
+        for entity in entities.values():
+            size += len(generate_sql_model(entity))
+            size += len(generate_default_routes(entity))
+            size += len(generate_repository(entity))
+        build_schema_snapshot(entities)
+    return parsed - start, time.perf_counter() - parsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000], help="Nombres d'entités")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes par taille, la meilleure est retenue")
+    args = parser.parse_args()
+
+    print(f"{'entités':>8} {'lignes':>8} {'analyse':>10} {'génération':>11} {'par entité':>11} {'code généré':>12}")
+    reference = None
+    for count in args.sizes:
+        text = synthetic_schema(count)
+        parse_s, generate_s, size = min(generate(text) for _ in range(args.repeat))
+        per_entity = (parse_s + generate_s) / count * 1000
+        reference = reference or per_entity
+        print(
+            f"{count:>8} {text.count(chr(10)):>8} {parse_s * 1000:>8.0f} ms {generate_s * 1000:>8.0f} ms"
+            f" {per_entity:>8.2f} ms {size / 1024 / 1024:>9.1f} Mo  (x{per_entity / reference:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+
+# Dossier propre au générateur dans le projet généré : manifeste et dernière version générée de chaque fichier
+STATE_DIR = ".generator"
+MANIFEST_FILE = "manifest.json"
+BASE_DIR = "base"
+# Nouvelle version d'un fichier modifié à la main, écrite à côté de lui en cas de conflit
+CONFLICT_SUFFIX = ".generated"
+
+
+@dataclass
+class SyncReport:
+    """Résultat d'une synchronisation : chemins relatifs au projet, par issue"""
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    # Modifiés à la main, sortie du générateur inchangée : conservés tels quels
+    kept: list[str] = field(default_factory=list)
+    # Modifiés à la main et par le générateur : conservés, nouvelle version dans <fichier>.generated
+    conflicts: list[str] = field(default_factory=list)
+    # Fichiers déjà présents, absents du manifeste et différents de la version générée : conservés aussi
+    untracked: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def show(self) -> None:
+        for path in self.created:
+            print(f"📄 Créé : {path}")
+        for path in self.updated:
+            print(f"✏️ Mis à jour : {path}")
+        for path in self.removed:
+            print(f"🗑️ Supprimé : {path}")
+        for path in self.kept:
+            print(f"✋ Modifié à la main, conservé : {path}")
+        for path in self.conflicts:
+            base = "/".join((STATE_DIR, BASE_DIR, path))
+            print(f"⚠️ Conflit : {path} modifié à la main et par le générateur, nouvelle version dans {path}{CONFLICT_SUFFIX}")
+            print(f"   Fusion à 3 voies : git merge-file {path} {base} {path}{CONFLICT_SUFFIX}")
+        for path in self.untracked:
+            print(f"⚠️ Fichier existant différent de la version générée, conservé : {path} (nouvelle version dans {path}{CONFLICT_SUFFIX})")
+        print(
+            f"Synchronisation : {len(self.created)} créé(s), {len(self.updated)} mis à jour, {len(self.removed)} supprimé(s), "
+            f"{len(self.unchanged)} inchangé(s), {len(self.kept)} conservé(s), {len(self.conflicts) + len(self.untracked)} conflit(s)"
+        )
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(project_path: str) -> dict[str, str]:
+    """
+    Lit le manifeste du projet généré.
+
+    Returns:
+        dict: Chemin relatif (séparateur '/') -> empreinte SHA-256 de la dernière version générée ; {} sans manifeste.
+    """
+    path = os.path.join(project_path, STATE_DIR, MANIFEST_FILE)
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["files"]
+
+
+def save_manifest(project_path: str, files: dict[str, str]) -> None:
+    os.makedirs(os.path.join(project_path, STATE_DIR), exist_ok=True)
+    with open(os.path.join(project_path, STATE_DIR, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "files": dict(sorted(files.items()))}, f, indent=2)
+
+
+def generated_content(project_path: str, relative: str) -> bytes | None:
+    """Dernière version générée d'un fichier (base de la fusion à 3 voies), None si inconnue"""
+    path = os.path.join(project_path, STATE_DIR, BASE_DIR, *relative.split("/"))
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def remove_project(project_path: str, attempts: int = 20) -> None:
+    """
+    Supprime le dossier généré, fichiers en lecture seule compris. Sous Windows un fichier ouvert par un autre
+    processus (éditeur, serveur, conteneur) bloque la suppression : nouvelles tentatives puis abandon.
+    """
+    def make_writable(function, path, _):
+        os.chmod(path, stat.S_IWRITE)
+        function(path)
+
+    for attempt in range(attempts):
+        try:
+            shutil.rmtree(project_path, onerror=make_writable)
+            return
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            if attempt == attempts - 1:
+                raise SystemExit(f"❌ Impossible de supprimer {project_path} : {e}")
+            print("Erreur lors de la suppression du dossier :", project_path)
+            time.sleep(0.25)
+
+
+def sync_project(staging_path: str, project_path: str, jobs: int = 1) -> SyncReport:
+    """
+    Reporte dans `project_path` le projet entièrement généré dans `staging_path`, sans réécrire les fichiers dont
+    le contenu n'a pas changé.
+
+    Pour chaque fichier, le manifeste donne l'empreinte de la version générée la dernière fois :
+    - fichier non modifié à la main : remplacé si la nouvelle version diffère ;
+    - modifié à la main, sortie du générateur inchangée : conservé ;
+    - modifié à la main et par le générateur : conservé, la nouvelle version est écrite dans `<fichier>.generated`.
+    Les fichiers qui ne sont plus générés sont supprimés, sauf s'ils ont été modifiés à la main. Les fichiers
+    absents du manifeste et de la génération (.venv, bases locales, ajouts manuels) ne sont jamais touchés.
+
+    Args:
+        staging_path (str): Le projet généré complet (dossier temporaire).
+        project_path (str): Le dossier du projet à mettre à jour, créé si besoin.
+        jobs (int): Nombre de fichiers traités en parallèle.
+    Returns:
+        SyncReport: Les fichiers créés, mis à jour, inchangés, conservés, en conflit et supprimés.
+    """
+    manifest = load_manifest(project_path)
+    generated = []
+    for root, dirs, files in os.walk(staging_path):
+        dirs.sort()
+        relative_root = os.path.relpath(root, staging_path)
+        for filename in sorted(files):
+            relative = filename if relative_root == "." else os.path.join(relative_root, filename)
+            generated.append(relative.replace(os.sep, "/"))
+
+    report = SyncReport()
+    files = {}
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        results = executor.map(
+            lambda relative: _sync_file(staging_path, project_path, relative, manifest.get(relative)), generated
+        )
+        for relative, (status, base_hash) in zip(generated, results):
+            getattr(report, status).append(relative)
+            if base_hash is not None:
+                files[relative] = base_hash
+
+    for relative in sorted(manifest.keys() - files.keys()):
+        if _remove_file(project_path, relative, manifest[relative]):
+            report.removed.append(relative)
+        else:
+            report.kept.append(relative)
+            files[relative] = manifest[relative]
+
+    save_manifest(project_path, files)
+    return report
+
+
+def _sync_file(staging_path: str, project_path: str, relative: str, base_hash: str | None) -> tuple[str, str | None]:
+    """Synchronise un fichier : (issue, empreinte de la base à retenir dans le manifeste, None pour ne pas le suivre)"""
+    parts = relative.split("/")
+    source = os.path.join(staging_path, *parts)
+    target = os.path.join(project_path, *parts)
+    with open(source, "rb") as f:
+        new = f.read()
+    new_hash = content_hash(new)
+
+    current_hash = None
+    if os.path.isfile(target):
+        with open(target, "rb") as f:
+            current_hash = content_hash(f.read())
+
+    if current_hash == new_hash:
+        status = "unchanged"
+    elif current_hash is None:
+        status = "created"
+    elif base_hash is not None and current_hash == base_hash:
+        status = "updated"
+    elif new_hash == base_hash:
+        # Modifié à la main, le générateur produit toujours la même version : rien à reporter
+        _discard_conflict(target)
+        return "kept", base_hash
+    else:
+        # Modifié à la main et nouvelle version différente : la base reste l'ancienne version jusqu'à résolution
+        _write(target + CONFLICT_SUFFIX, new, source)
+        return ("conflicts", base_hash) if base_hash is not None else ("untracked", None)
+
+    if status != "unchanged":
+        _write(target, new, source)
+    if status != "unchanged" or base_hash != new_hash:
+        _write_base(project_path, parts, new, source)
+    _discard_conflict(target)
+    return status, new_hash
+
+
+def _remove_file(project_path: str, relative: str, base_hash: str) -> bool:
+    """Supprime un fichier qui n'est plus généré, sauf s'il a été modifié à la main"""
+    parts = relative.split("/")
+    target = os.path.join(project_path, *parts)
+    if os.path.isfile(target):
+        with open(target, "rb") as f:
+            if content_hash(f.read()) != base_hash:
+                return False
+        os.remove(target)
+    base = os.path.join(project_path, STATE_DIR, BASE_DIR, *parts)
+    if os.path.isfile(base):
+        os.remove(base)
+    _discard_conflict(target)
+    return True
+
+
+def _write(path: str, data: bytes, source: str) -> None:
+    """Écriture atomique (fichier temporaire puis renommage) : un rechargement à chaud ne lit jamais un fichier partiel"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    shutil.copymode(source, temporary)
+    os.replace(temporary, path)
+
+
+def _write_base(project_path: str, parts: list[str], data: bytes, source: str) -> None:
+    _write(os.path.join(project_path, STATE_DIR, BASE_DIR, *parts), data, source)
+
+
+def _discard_conflict(target: str) -> None:
+    """Retire la version `.generated` d'un conflit résolu"""
+    if os.path.isfile(target + CONFLICT_SUFFIX):
+        os.remove(target + CONFLICT_SUFFIX)
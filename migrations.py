@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+
+MIGRATIONS_DIR = "migrations"
+
+
+def schema_fingerprint(schema: dict) -> str:
+    """
+    Calcule l'empreinte d'un schéma : hash SHA-256 de sa forme JSON canonique.
+
+    Args:
+        schema (dict): Le schéma {table: {"columns": {colonne: définition}, "indexes": {nom: définition}}}.
+    Returns:
+        str: L'empreinte hexadécimale du schéma.
+    """
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def load_history(migrations_dir: str = MIGRATIONS_DIR) -> list[dict]:
+    """
+    Lit les migrations déjà générées, triées par numéro de version.
+
+    Returns:
+        list[dict]: Les migrations {"version", "fingerprint", "schema", "operations", ...}.
+    """
+    if not os.path.isdir(migrations_dir):
+        return []
+
+    history = []
+    for filename in sorted(os.listdir(migrations_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(migrations_dir, filename), "r", encoding="utf-8") as f:
+                history.append(json.load(f))
+    return sorted(history, key=lambda migration: migration["version"])
+
+
+def diff_schemas(previous: dict, current: dict) -> list[dict]:
+    """
+    Liste les opérations qui font passer la base du schéma `previous` au schéma `current`.
+
+    Args:
+        previous (dict): Le schéma de la dernière migration ({} pour une base vide).
+        current (dict): Le schéma issu de config/entities.txt.
+    Returns:
+        list[dict]: Les opérations (create_table, drop_table, add_column, drop_column, alter_column,
+        create_index, drop_index).
+    """
+    operations = []
+
+    for table in sorted(current.keys() - previous.keys()):
+        operations.append({"op": "create_table", "table": table})
+
+    for table in sorted(previous.keys() & current.keys()):
+        old_columns = previous[table]["columns"]
+        new_columns = current[table]["columns"]
+        old_indexes = previous[table].get("indexes", {})
+        new_indexes = current[table].get("indexes", {})
+        changed_indexes = {name for name in old_indexes.keys() & new_indexes.keys() if old_indexes[name] != new_indexes[name]}
+
+        # Index supprimés avant les colonnes qu'ils couvrent, créés après les colonnes ajoutées
+        for index in sorted((old_indexes.keys() - new_indexes.keys()) | changed_indexes):
+            operations.append({"op": "drop_index", "table": table, "index": index})
+        for column in sorted(new_columns.keys() - old_columns.keys()):
+            operations.append({"op": "add_column", "table": table, "column": column})
+        for column in sorted(old_columns.keys() - new_columns.keys()):
+            operations.append({"op": "drop_column", "table": table, "column": column})
+        for column in sorted(old_columns.keys() & new_columns.keys()):
+            if old_columns[column] != new_columns[column]:
+                operations.append({
+                    "op": "alter_column",
+                    "table": table,
+                    "column": column,
+                    "from": old_columns[column],
+                    "to": new_columns[column],
+                })
+        for index in sorted((new_indexes.keys() - old_indexes.keys()) | changed_indexes):
+            operations.append({"op": "create_index", "table": table, "index": index})
+
+    for table in sorted(previous.keys() - current.keys()):
+        operations.append({"op": "drop_table", "table": table})
+
+    return operations
+
+
+def create_migration(schema: dict, migrations_dir: str = MIGRATIONS_DIR) -> dict | None:
+    """
+    Enregistre une nouvelle migration si le schéma a changé depuis la dernière génération.
+
+    Args:
+        schema (dict): Le schéma issu de config/entities.txt.
+        migrations_dir (str): Le dossier de l'historique des migrations (à versionner avec le projet).
+    Returns:
+        dict | None: La migration créée, ou None si le schéma est inchangé.
+    """
+    history = load_history(migrations_dir)
+    fingerprint = schema_fingerprint(schema)
+    if history and history[-1]["fingerprint"] == fingerprint:
+        return None
+
+    previous = history[-1]["schema"] if history else {}
+    version = history[-1]["version"] + 1 if history else 1
+    migration = {
+        "version": version,
+        "fingerprint": fingerprint,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "operations": diff_schemas(previous, schema),
+        "schema": schema,
+    }
+
+    os.makedirs(migrations_dir, exist_ok=True)
+    name = "initial" if version == 1 else "auto"
+    path = os.path.join(migrations_dir, f"{version:04d}_{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(migration, f, indent=2, ensure_ascii=False)
+    print(f"🧱 Migration générée : {path} ({len(migration['operations'])} opération(s))")
+    return migration
+
+
+def copy_migrations(project_path: str, migrations_dir: str = MIGRATIONS_DIR) -> None:
+    """Copie l'historique des migrations dans le projet généré (app/migrations)"""
+    target = os.path.join(project_path, "app", "migrations")
+    os.makedirs(target, exist_ok=True)
+    for filename in sorted(os.listdir(migrations_dir)):
+        if filename.endswith(".json"):
+            shutil.copyfile(os.path.join(migrations_dir, filename), os.path.join(target, filename))
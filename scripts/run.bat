@@ -3,8 +3,9 @@
 cd /d "%~dp0/.."
 
 
-@REM Supprimer le dossier /generated s'il existe déjà avec droits admin et récursivité forcée
-if exist "generated" (
+@REM Avec --clean : supprimer le dossier /generated s'il existe déjà avec droits admin et récursivité forcée
+@REM Sans argument, la génération est incrémentale et conserve les modifications faites à la main
+if /i "%~1"=="--clean" if exist "generated" (
     echo Suppression du dossier generated existant...
 
     @REM Tentative 1: Suppression standard
@@ -64,7 +65,7 @@ if exist "generated" (
     echo Dossier generated supprime avec succes.
 )
 echo Lancement de l'initialisation du projet FastAPI...
-python InitFastAPIProject.py
+python InitFastAPIProject.py %*
 
 @REM Demander à l'utilisateur s'il veut exécuter le script de déploiement Docker
 echo.
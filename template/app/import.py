@@ -0,0 +1,172 @@
+"""
+Import en masse d'un fichier dans la table d'une entité.
+
+    uv run python -m app.import TLE catalogue.tle
+    uv run python -m app.import TLE tles.csv --upsert norad --guard epoch
+    uv run python -m app.import TLE tles.ndjson --batch-size 5000 --rejects rejets.ndjson
+
+Formats : CSV (ligne d'en-tête), NDJSON, et pour les entités au format TLE (colonnes ligne1 / ligne2) les fichiers
+d'éléments en deux ou trois lignes. Le fichier est lu en flux et écrit par lots : COPY sous PostgreSQL,
+INSERT multi-lignes ailleurs, ou INSERT ... ON CONFLICT avec --upsert. Chaque ligne est validée par le modèle
+de l'entité ; les lignes refusées (lecture, validation ou contrainte) vont dans le fichier de rejets, en NDJSON.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from sqlmodel import Session, SQLModel
+
+from app.registry import ENTITY_MODULES
+from app.repositories.base_repository import BaseRepository
+from app.utils.core.database import engine
+from app.utils.core.importer import FORMATS, TLE_COLUMNS, ParseError, detect_format, read_records
+from app.utils.core.log import setup_logging
+from app.utils.core.migrations import run_migrations
+from app.utils.core.startup import import_entities
+
+
+def resolve_model(name: str):
+    """Classe de l'entité par son nom de classe ou de table, sans tenir compte de la casse"""
+    import_entities(ENTITY_MODULES)
+    models = {}
+    pending = list(SQLModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending += model.__subclasses__()
+        if hasattr(model, "__table__"):
+            models[model.__name__.lower()] = model
+            models[model.__tablename__.lower()] = model
+    if name.lower() not in models:
+        raise SystemExit(f"Unknown entity '{name}', expected one of {sorted({m.__name__ for m in models.values()})}")
+    return models[name.lower()]
+
+
+class Rejects:
+    """Fichier NDJSON des lignes refusées, créé à la première ligne refusée"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+        self.count = 0
+
+    def write(self, line: int, error: str, data: Optional[dict] = None) -> None:
+        if self.file is None:
+            self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write(json.dumps({"line": line, "error": error, "row": data}, default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+class Progress:
+    """Compteurs de l'import et débit, affichés sur stderr après chaque lot"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.read = 0
+        self.written = 0
+        self.skipped = 0
+
+    def rate(self) -> float:
+        return self.read / max(time.perf_counter() - self.start, 1e-9)
+
+    def show(self, rejected: int, end: str = "\r") -> None:
+        print(
+            f"{self.read} lues, {self.written} écrites, {self.skipped} inchangées, {rejected} rejetées"
+            f" - {self.rate():.0f} lignes/s",
+            end=end,
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def write_batch(db: Session, repo: BaseRepository, batch: List[tuple], args, use_copy: bool) -> List[dict]:
+    items = [data for _, data in batch]
+    if args.upsert:
+        return repo.bulk_upsert(db, items, key=args.upsert, guard=args.guard, batch_size=len(items))
+    if use_copy:
+        return repo.bulk_copy(db, items)
+    return repo.bulk_save(db, items, batch_size=len(items), operation="create")
+
+
+def record_results(batch: List[tuple], results: List[dict], progress: Progress, rejects: Rejects) -> None:
+    for (line, data), result in zip(batch, results):
+        if result["status"] == "error":
+            rejects.write(line, result["error"], data)
+        elif result["status"] == "skipped":
+            progress.skipped += 1
+        else:
+            progress.written += 1
+    progress.show(rejects.count)
+
+
+def run(args) -> int:
+    setup_logging()
+    model = resolve_model(args.entity)
+    run_migrations(engine)
+    repo = BaseRepository(model)
+
+    file_format = args.format or detect_format(args.file)
+    columns = set(repo.columns())
+    if file_format == "tle" and not TLE_COLUMNS <= columns:
+        raise SystemExit(f"{model.__name__} has no {sorted(TLE_COLUMNS)} columns, cannot import TLE files")
+    use_copy = engine.dialect.name == "postgresql" and not args.no_copy
+
+    progress = Progress()
+    rejects = Rejects(args.rejects or args.file + ".rejects.ndjson")
+    try:
+        with open(args.file, "r", encoding="utf-8", newline="") as stream, Session(engine) as db:
+            batch = []
+            for line, data in read_records(stream, file_format):
+                progress.read += 1
+                if isinstance(data, ParseError):
+                    rejects.write(line, str(data))
+                    continue
+                if file_format == "tle":
+                    data = {key: value for key, value in data.items() if key in columns}
+                batch.append((line, data))
+                if len(batch) >= args.batch_size:
+                    record_results(batch, write_batch(db, repo, batch, args, use_copy), progress, rejects)
+                    batch = []
+            if batch:
+                record_results(batch, write_batch(db, repo, batch, args, use_copy), progress, rejects)
+    finally:
+        rejects.close()
+
+    progress.show(rejects.count, end="\n")
+    elapsed = time.perf_counter() - progress.start
+    print(f"{model.__name__} : {progress.written} lignes écrites en {elapsed:.1f} s ({progress.rate():.0f} lignes/s)")
+    if rejects.count:
+        print(f"{rejects.count} lignes rejetées, détail dans {rejects.path}")
+    return 1 if rejects.count and args.strict else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.import", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("entity", help="Nom de l'entité (classe ou table), ex: TLE")
+    parser.add_argument("file", help="Fichier à importer")
+    parser.add_argument("--format", choices=FORMATS, help="Format du fichier (par défaut d'après l'extension)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Lignes écrites par transaction")
+    parser.add_argument("--upsert", metavar="COLUMN", help="Colonne unique : met à jour les lignes existantes")
+    parser.add_argument("--guard", metavar="COLUMN", help="Avec --upsert, n'écrase que si cette colonne est plus récente")
+    parser.add_argument("--rejects", help="Fichier des lignes rejetées (défaut : <fichier>.rejects.ndjson)")
+    parser.add_argument("--no-copy", action="store_true", help="INSERT multi-lignes même sous PostgreSQL")
+    parser.add_argument("--strict", action="store_true", help="Code de sortie 1 si des lignes sont rejetées")
+    args = parser.parse_args()
+    if args.guard and not args.upsert:
+        parser.error("--guard requires --upsert")
+    try:
+        sys.exit(run(args))
+    except ValueError as e:
+        # Format introuvable, colonne d'upsert ou de garde invalide
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,94 +1,107 @@
-from fastapi import FastAPI
-from sqlmodel import SQLModel
+import logging
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.utils.core.config import settings
-from app.utils.core.database import engine
+from app.utils.core.log import setup_logging
+from app.utils.core.metrics import MetricsMiddleware, metrics
+from app.utils.core.compression import CompressionMiddleware
+from app.utils.core.serialization import default_response_class
+from app.utils.core.replicas import ReadYourWritesMiddleware, replica_urls
+from app.utils.core.database import engine, pool_stats, pools
+from app.utils.core.migrations import run_migrations
+from app.utils.core.startup import LazyRouterMiddleware, import_entities, include_router_module, startup_report
+from app.registry import ASYNC_MODE, ENTITY_MODULES, ROUTER_MODULES
+from app.repositories.base_repository import ConstraintError, UnsupportedDialectError
 from app.utils.seeds.seed_users import seed_users
 from app.utils.seeds.seed_roles import seed_roles
+from app.utils.auth.role_names import load_role_names
 from sqlmodel import Session
 
-import pkgutil
-import importlib
-import pathlib
+setup_logging()
+logger = logging.getLogger("app.main")
 
-# Importer automatiquement les entités pour s'assurer qu'elles sont enregistrées
+if ASYNC_MODE:
+    # Moteur asynchrone des routes générées créé au démarrage : son pool figure dès maintenant sur /health/pool et /metrics
+    from app.utils.core import async_database  # noqa: F401
 
-entities_dir = pathlib.Path(__file__).parent / "entities"
+# Entités enregistrées dans SQLModel.metadata avant les migrations (liste figée générée dans app/registry.py)
+import_entities(ENTITY_MODULES)
 
-
-
-for module_info in pkgutil.iter_modules([str(entities_dir)]):
-    name = module_info.name
-    if name.startswith("_"):
-        continue
-
-    try:
-        importlib.import_module(f"app.entities.{name}")
-    except ImportError as e:
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-        print(f"❌ Warning: Could not import entity {name}: {e}")
-
-# Create database tables (drop and recreate to ensure schema is up to date)
-SQLModel.metadata.drop_all(engine)
-SQLModel.metadata.create_all(engine)
+# Mise à jour du schéma (migrations versionnées, une seule requête si la base est déjà à jour)
+with startup_report.measure("database", "run_migrations"):
+    run_migrations(engine)
 
 # Seed initial data
-with Session(engine) as session:
+with startup_report.measure("database", "seed"), Session(engine) as session:
     seed_roles(session)
     seed_users(session)
+    load_role_names(session)
 
 # Create FastAPI app
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    description="FastAPI application with role-based authentication",
-)
+with startup_report.measure("app", "FastAPI"):
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.VERSION,
+        description="FastAPI application with role-based authentication",
+        default_response_class=default_response_class(),
+    )
 
-# Note: Authentication middleware removed to preserve Swagger documentation
-# Routes are protected individually using Depends(get_current_user)
+if settings.DB_READ_YOUR_WRITES_SECONDS > 0 and replica_urls():
+    app.add_middleware(ReadYourWritesMiddleware)
 
-# Auto-discover all routers
-routers_dir = pathlib.Path(__file__).parent / "routers"
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
+# Ajouté en dernier : middleware le plus externe, les métriques portent sur la réponse non compressée
+if settings.COMPRESSION_MIN_SIZE > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE, level=settings.COMPRESSION_LEVEL)
 
+# Note: Authentication middleware removed to preserve Swagger documentation
+# Routes are protected individually using Depends(get_current_user)
 
-for module_info in pkgutil.iter_modules([str(routers_dir)]):
-    name = module_info.name
-    if name.startswith("_"):
-        continue
+# Routers du registre : inclus tout de suite, ou à leur première requête en mode LAZY_ROUTERS
+if settings.LAZY_ROUTERS:
+    app.add_middleware(LazyRouterMiddleware, fastapi_app=app, routers=ROUTER_MODULES)
+else:
+    for module, _prefix in ROUTER_MODULES:
+        include_router_module(app, module)
 
-    try:
-        module = importlib.import_module(f"app.routers.{name}")
-        router = getattr(module, "router", None)
-        if router:
-            app.include_router(router)
-    except ImportError as e:
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
-        print(f"❌ Warning: Could not import router {name}: {e}")
 
+@app.exception_handler(ConstraintError)
+async def constraint_error_handler(request: Request, exc: ConstraintError):
+    """Contrainte de la base violée par une écriture : 409 (clé unique) ou 422 (clé étrangère, NOT NULL, CHECK)"""
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
 
 
+@app.exception_handler(UnsupportedDialectError)
+async def unsupported_dialect_handler(request: Request, exc: UnsupportedDialectError):
+    """Upsert demandé sur une base sans INSERT ... ON CONFLICT : 501 plutôt qu'une erreur 500"""
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
+
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/health/pool")
+def pool_health():
+    """
+    Statistiques du pool de connexions synchrone (migrations, seed, routes synchrones) ; en mode --async, celles
+    du pool asynchrone des routes générées sous la clé "async"
+    """
+    stats = pool_stats()
+    for name in sorted(pools):
+        if name != "sync":
+            stats[name] = pool_stats(name)
+    return stats
+
+
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+def get_metrics():
+    """Métriques au format texte Prometheus"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+if settings.STARTUP_REPORT:
+    startup_report.log()
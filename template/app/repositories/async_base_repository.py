@@ -0,0 +1,32 @@
+from functools import wraps
+from typing import Generic, TypeVar
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.repositories.base_repository import BaseRepository
+
+T = TypeVar("T")
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Version asynchrone d'un repository : chaque méthode de `BaseRepository` (et de ses sous-classes)
+    devient une coroutine exécutée via `AsyncSession.run_sync`. Les requêtes SQL passent par le driver
+    asynchrone, la boucle d'événements n'est jamais bloquée et les requêtes restent écrites une seule fois.
+
+        repo = AsyncBaseRepository(TLERepository())
+        page = await repo.paginate(db, limit=50)
+    """
+
+    def __init__(self, repository: BaseRepository[T]):
+        self.sync = repository
+        self.model = repository.model
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.sync, name)
+        if not callable(attribute):
+            return attribute
+
+        @wraps(attribute)
+        async def run(db: AsyncSession, *args, **kwargs):
+            return await db.run_sync(attribute, *args, **kwargs)
+
+        return run
@@ -1,6 +1,7 @@
 from sqlmodel import Session, select
 from app.entities.auth.user import User
 from app.repositories.base_repository import BaseRepository
+from app.utils.auth.principal_cache import principal_cache
 from typing import List
 
 
@@ -8,6 +9,15 @@ class UserRepository(BaseRepository[User]):
     def __init__(self):
         super().__init__(User)
 
+    def save(self, db: Session, obj: User) -> User:
+        saved = super().save(db, obj)
+        principal_cache.invalidate_user(saved.id)
+        return saved
+
+    def delete(self, db: Session, id: int) -> bool:
+        principal_cache.invalidate_user(id)
+        return super().delete(db, id)
+
     def get_by_email(self, db: Session, email: str) -> User | None:
         statement = select(User).where(User.email == email)
         return db.exec(statement).first()
@@ -1,22 +1,374 @@
+import io
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pydantic import ValidationError
 from sqlmodel import Session, select
-from typing import Generic, TypeVar, Type
+from sqlalchemy import Date, DateTime, and_, delete, func, insert, or_, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from typing import Any, Generic, Iterator, List, Mapping, Optional, Tuple, TypeVar, Type
+from app.utils.core.config import settings
+from app.utils.core.cache import RepositoryCache
+from app.utils.core.conditional import Version, content_hash
+from app.utils.core.pagination import Page, decode_cursor, encode_cursor
 
 T = TypeVar("T")
 
+COUNT_MODES = ("exact", "cached", "estimate")
+
+# Opérateurs de filtre : "colonne" (égalité) ou "colonne__<opérateur>"
+FILTER_OPERATORS = ("in", "gte", "lte", "prefix")
+
+# Colonne de date de modification, tenue à jour par save / bulk_save et utilisée pour les ETag
+VERSION_COLUMN = "updated_at"
+
+# Cache des comptages par table : {nom_table: (expire_a, valeur)}
+_count_cache: dict[str, tuple[float, int]] = {}
+
+# Codes SQLSTATE PostgreSQL des violations de contrainte, et messages SQLite équivalents
+CONSTRAINT_KINDS = {"23505": "unique", "23503": "foreign_key", "23502": "not_null", "23514": "check"}
+SQLITE_CONSTRAINT_KINDS = {"UNIQUE": "unique", "FOREIGN KEY": "foreign_key", "NOT NULL": "not_null", "CHECK": "check"}
+
+
+class ConstraintError(ValueError):
+    """
+    Écriture refusée par une contrainte de la base. `status_code` : 409 pour une clé unique déjà prise, 422 pour
+    une clé étrangère, un NOT NULL ou un CHECK (réponse posée par le gestionnaire d'exceptions de main.py)
+    """
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+        self.status_code = 409 if kind == "unique" else 422
+
+    @classmethod
+    def from_integrity_error(cls, error: IntegrityError) -> "ConstraintError":
+        original = getattr(error, "orig", None) or error
+        code = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+        message = str(original).strip().splitlines()[0]
+        kind = CONSTRAINT_KINDS.get(code)
+        if kind is None:
+            kind = next((kind for prefix, kind in SQLITE_CONSTRAINT_KINDS.items() if message.startswith(prefix)), "constraint")
+        return cls(kind, f"{kind.replace('_', ' ').capitalize()} constraint violated: {message}")
+
+
+class UnsupportedDialectError(ValueError):
+    """Opération sans équivalent SQL sur la base configurée (upsert hors PostgreSQL et SQLite) : réponse 501"""
+
+    status_code = 501
+
+
+def _cursor_value(column, value: Any) -> Any:
+    """
+    Valeur "v" d'un curseur convertie au type Python de la colonne de tri (les dates voyagent en ISO).
+    ValueError si elle ne s'y prête pas : un curseur forgé donne un 400, pas une erreur SQL.
+    """
+    if value is None:
+        return None
+    if isinstance(column.type, (DateTime, Date)):
+        parse = datetime.fromisoformat if isinstance(column.type, DateTime) else date.fromisoformat
+        if isinstance(value, str):
+            try:
+                return parse(value)
+            except ValueError:
+                pass
+        raise ValueError("Invalid pagination cursor")
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:  # AutoString de SQLModel
+        python_type = str
+    if python_type is float and type(value) is int:
+        return float(value)
+    # bool est un int pour isinstance : comparaison stricte des types
+    if python_type in (int, float, bool, str) and type(value) is python_type:
+        return value
+    raise ValueError("Invalid pagination cursor")
+
+
+@contextmanager
+def _constraints(db: Session):
+    """Violation de contrainte pendant une écriture : transaction annulée, ConstraintError"""
+    try:
+        yield
+    except IntegrityError as e:
+        db.rollback()
+        raise ConstraintError.from_integrity_error(e) from e
+
 
 class BaseRepository(Generic[T]):
-    def __init__(self, model: Type[T]):
+    def __init__(self, model: Type[T], cache_ttl: float = 0, update_schema: Optional[type] = None):
         self.model = model
+        # Schéma des mises à jour partielles (<Entité>Update) : bulk_save(operation="update") n'écrit que les champs
+        # envoyés. Sans schéma, chaque élément est validé comme une ligne complète
+        self.update_schema = update_schema
+        self.keyset_columns = self._indexed_columns()
+        self.version_column = self.model.__table__.c.get(VERSION_COLUMN)
+        # Cache des lectures (get_by_id, get_fields, paginate, versions), activé par `.cache(ttl)` dans entities.txt
+        self.cache = RepositoryCache(self.model.__tablename__, cache_ttl) if cache_ttl > 0 else None
+
+    def _cached(self, key: tuple, loader):
+        """Résultat de `loader()`, servi depuis le cache de l'entité s'il est activé"""
+        if self.cache is None:
+            return loader()
+        return self.cache.get_or_load(key, loader)
+
+    def _indexed_columns(self) -> dict:
+        """Colonnes utilisables comme clé de pagination : clé primaire, colonnes uniques ou indexées"""
+        table = self.model.__table__
+        indexed = {c.name for c in table.columns if c.primary_key or c.unique or c.index}
+        indexed.update(next(iter(index.columns)).name for index in table.indexes if index.columns)
+        return {name: table.c[name] for name in indexed}
 
     def get(self, db: Session, id: int) -> T | None:
         return db.get(self.model, id)
     
     def get_by_id(self, db: Session, id: int) -> T | None:
-        return db.get(self.model, id)
+        """Lecture par id, via le cache si l'entité en a un (l'objet renvoyé n'est alors pas lié à la session)"""
+        if self.cache is None:
+            return db.get(self.model, id)
+        data = self.cache.get_or_load(("get", id), lambda: _dump(db.get(self.model, id)))
+        return self.model(**data) if data is not None else None
+
+    def get_fields(self, db: Session, id: int, fields: Tuple[str, ...]) -> Optional[dict]:
+        """Lecture par id limitée aux colonnes `fields` (SELECT de colonnes, sans hydratation ORM)"""
+        def load():
+            table = self.model.__table__
+            statement = select(*[table.c[name] for name in fields]).where(table.c.id == id)
+            row = db.execute(statement).mappings().first()
+            return dict(row) if row is not None else None
+
+        return self._cached(("fields", id, fields), load)
 
     def list(self, db: Session, offset: int = 0, limit: int = 100) -> list[T]:
+        limit = min(limit, settings.PAGE_SIZE_MAX)
         return db.exec(select(self.model).offset(offset).limit(limit)).all()
 
+    def paginate(
+        self,
+        db: Session,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        sort: str = "id",
+        filters: Optional[dict[str, Any]] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Page[T]:
+        """
+        Pagination par curseur (keyset) : la page N coûte autant que la page 1.
+        `sort` est la clé primaire ou une colonne indexée, préfixée par "-" pour un ordre décroissant,
+        `after` le curseur de la page précédente, `filters` des conditions au format de `filter_clauses`.
+        Avec `fields`, seules ces colonnes (plus id et la colonne de tri, pour le curseur) sont lues,
+        et la page contient des dictionnaires au lieu d'entités.
+        """
+        if self.cache is None:
+            return self._paginate(db, after, limit, sort, filters, fields)
+
+        def load():
+            page = self._paginate(db, after, limit, sort, filters, fields)
+            return [row if fields else _dump(row) for row in page.items], page.next_cursor
+
+        key = ("paginate", after, limit, sort, _freeze(filters), fields)
+        rows, next_cursor = self.cache.get_or_load(key, load)
+        return Page(rows if fields else [self.model(**row) for row in rows], next_cursor)
+
+    def _paginate(self, db: Session, after, limit, sort, filters, fields) -> Page[T]:
+        descending = sort.startswith("-")
+        column = self.keyset_columns.get(sort.lstrip("-"))
+        if column is None:
+            raise ValueError(f"Cannot sort on '{sort}': allowed columns are {sorted(self.keyset_columns)}")
+        id_column = self.model.__table__.c.id
+        limit = max(1, min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX))
+
+        if fields:
+            table = self.model.__table__
+            statement = select(*[table.c[name] for name in dict.fromkeys(("id", column.name, *fields))])
+        else:
+            statement = select(self.model)
+        statement = statement.where(*self.filter_clauses(filters))
+        if after:
+            cursor = decode_cursor(after, self.keyset_columns)
+            if cursor["c"] != sort:
+                raise ValueError(f"Cursor was issued for sort='{cursor['c']}', not '{sort}'")
+            value = _cursor_value(column, cursor["v"])
+            statement = statement.where(self._after_clause(column, id_column, value, cursor["id"], descending))
+
+        id_order = id_column.desc() if descending else id_column
+        if column is id_column:
+            statement = statement.order_by(id_order)
+        else:
+            column_order = column.desc() if descending else column.asc()
+            statement = statement.order_by(column_order.nulls_last(), id_order)
+
+        # Une ligne de plus que demandé pour savoir s'il existe une page suivante
+        if fields:
+            rows = [dict(row) for row in db.execute(statement.limit(limit + 1)).mappings()]
+        else:
+            rows = list(db.exec(statement.limit(limit + 1)).all())
+        if len(rows) <= limit:
+            return Page(rows, None)
+
+        rows = rows[:limit]
+        last = rows[-1]
+        if fields:
+            return Page(rows, encode_cursor(sort, last[column.name], last["id"]))
+        return Page(rows, encode_cursor(sort, getattr(last, column.name), last.id))
+
+    def filter_clauses(self, filters: Optional[dict[str, Any]]) -> List[Any]:
+        """
+        Conditions SQL (paramétrées) d'un dictionnaire de filtres ; les valeurs None sont ignorées.
+        Clés : "colonne" (égalité), "colonne__in" (liste), "colonne__gte" / "colonne__lte" (bornes incluses),
+        "colonne__prefix" (début de chaîne).
+        """
+        clauses = []
+        table = self.model.__table__
+        for key, value in (filters or {}).items():
+            if value is None:
+                continue
+            name, operator = (key, "") if key in table.c else key.rpartition("__")[::2]
+            if name not in table.c or (operator and operator not in FILTER_OPERATORS):
+                raise ValueError(f"Unknown filter '{key}'")
+
+            column = table.c[name]
+            if operator == "":
+                clauses.append(column == value)
+            elif operator == "in":
+                clauses.append(column.in_(list(value)))
+            elif operator == "gte":
+                clauses.append(column >= value)
+            elif operator == "lte":
+                clauses.append(column <= value)
+            else:
+                clauses.append(column.startswith(value, autoescape=True))
+        return clauses
+
+    def collection_version(self, db: Session, filters: Optional[dict[str, Any]] = None) -> Optional[Version]:
+        """
+        Version des lignes sélectionnées par `filters` : une seule requête max(updated_at), count(*).
+        None si l'entité n'a pas de colonne updated_at (l'appelant se rabat sur une empreinte du contenu).
+        """
+        if self.version_column is None:
+            return None
+
+        def load():
+            statement = select(func.max(self.version_column), func.count()).select_from(self.model)
+            last_modified, total = db.execute(statement.where(*self.filter_clauses(filters))).one()
+            return Version(f"{last_modified.isoformat() if last_modified else ''}:{total}", last_modified)
+
+        return self._cached(("collection_version", _freeze(filters)), load)
+
+    def row_version(self, db: Session, id: int, lock: bool = False) -> Optional[Version]:
+        """
+        Version d'une ligne : son updated_at, ou à défaut une empreinte de son contenu. None si absente.
+        `lock` verrouille la ligne (SELECT ... FOR UPDATE) jusqu'à la fin de la transaction d'écriture,
+        et lit toujours la base.
+        """
+        if lock:
+            return self._row_version(db, id, lock)
+        return self._cached(("row_version", id), lambda: self._row_version(db, id, lock))
+
+    def _row_version(self, db: Session, id: int, lock: bool) -> Optional[Version]:
+        table = self.model.__table__
+        columns = [self.version_column] if self.version_column is not None else list(table.columns)
+        statement = select(*columns).where(table.c.id == id)
+        if lock:
+            statement = statement.with_for_update()
+        row = db.execute(statement).mappings().first()
+        if row is None:
+            return None
+        if self.version_column is not None and row[VERSION_COLUMN] is None:
+            row = db.execute(select(table).where(table.c.id == id)).mappings().first()
+        return self._version(id, row)
+
+    def version_of(self, obj: T | Mapping[str, Any]) -> Version:
+        """
+        Version d'une entité déjà lue (par exemple renvoyée par create / update), ou d'une ligne projetée contenant
+        les colonnes de `version_fields`, sans requête
+        """
+        data = dict(obj) if isinstance(obj, Mapping) else _dump(obj)
+        return self._version(data["id"], data)
+
+    def version_fields(self) -> Tuple[str, ...]:
+        """Colonnes nécessaires à version_of : id et updated_at, ou toutes sans colonne updated_at"""
+        if self.version_column is not None:
+            return ("id", VERSION_COLUMN)
+        return tuple(self.model.__table__.c.keys())
+
+    def _version(self, id: int, row) -> Version:
+        updated_at = row.get(VERSION_COLUMN) if self.version_column is not None else None
+        if updated_at is not None:
+            return Version(f"{id}:{updated_at.isoformat()}", updated_at)
+        return Version(content_hash(dict(row)), None)
+
+    def _touch(self, data: dict) -> dict:
+        """Renseigne updated_at (si la colonne existe) dans les valeurs à écrire"""
+        if self.version_column is not None:
+            data[VERSION_COLUMN] = datetime.utcnow()
+        return data
+
+    def stream(self, db: Session, batch_size: Optional[int] = None) -> Iterator[dict]:
+        """
+        Parcourt toute la table via un curseur côté serveur (stream_results / yield_per),
+        sans hydratation ORM : seules `batch_size` lignes sont en mémoire à la fois.
+        """
+        table = self.model.__table__
+        statement = (
+            select(table)
+            .order_by(table.c.id)
+            .execution_options(stream_results=True, yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+        )
+        for partition in db.execute(statement).mappings().partitions():
+            yield from partition
+
+    def columns(self) -> List[str]:
+        return [column.name for column in self.model.__table__.columns]
+
+    @staticmethod
+    def _after_clause(column, id_column, value: Any, last_id: int, descending: bool = False):
+        """
+        Condition « strictement après (value, last_id) » dans l'ordre (column NULLS LAST, id),
+        ou (column DESC NULLS LAST, id DESC) si `descending`
+        """
+        def beyond(col, bound):
+            return col < bound if descending else col > bound
+
+        if column is id_column:
+            return beyond(id_column, last_id)
+        if value is None:
+            return and_(column.is_(None), beyond(id_column, last_id))
+        return or_(beyond(column, value), and_(column == value, beyond(id_column, last_id)), column.is_(None))
+
+    def create(self, db: Session, data: dict) -> T:
+        """
+        Création en une requête : INSERT ... RETURNING (id et valeurs calculées par la base compris).
+        ConstraintError si la base refuse la ligne (clé unique déjà prise, clé étrangère inconnue).
+        """
+        table = self.model.__table__
+        values = self._touch({key: value for key, value in data.items() if key != "id"})
+        with _constraints(db):
+            row = db.execute(insert(table).values(**values).returning(*table.c)).mappings().one()
+            db.commit()
+        self._invalidate_caches()
+        return self.model(**row)
+
+    def update(self, db: Session, id: int, data: dict) -> Optional[T]:
+        """
+        Mise à jour en une requête : UPDATE ... WHERE id = :id RETURNING *, sans lecture préalable.
+        Seules les clés de `data` sont écrites (mise à jour partielle) ; None si la ligne n'existe pas.
+        ConstraintError si la base refuse les nouvelles valeurs.
+        """
+        table = self.model.__table__
+        values = self._touch({key: value for key, value in data.items() if key != "id"})
+        if not values:
+            # Rien à écrire (PATCH vide sans colonne updated_at) : simple lecture
+            row = db.execute(select(table).where(table.c.id == id)).mappings().first()
+        else:
+            statement = update(table).where(table.c.id == id).values(**values).returning(*table.c)
+            with _constraints(db):
+                row = db.execute(statement).mappings().first()
+                db.commit()
+            self._invalidate_caches()
+        return self.model(**row) if row is not None else None
+
     def save(self, db: Session, obj: T) -> T:
         """Create new object or update existing one based on presence of id"""
         # Check if object has an ID and if it exists in database
@@ -37,11 +389,12 @@ class BaseRepository(Generic[T]):
                     # For regular objects
                     obj_data = {k: v for k, v in obj.__dict__.items() if k != 'id'}
 
-                for field, value in obj_data.items():
+                for field, value in self._touch(obj_data).items():
                     if hasattr(existing_obj, field):
                         setattr(existing_obj, field, value)
 
                 db.commit()
+                self._invalidate_caches()
                 db.refresh(existing_obj)
                 return existing_obj
 
@@ -59,19 +412,370 @@ class BaseRepository(Generic[T]):
         # Remove id if it exists for new objects
         obj_data.pop('id', None)
 
-        new_obj = self.model(**obj_data)
+        new_obj = self.model(**self._touch(obj_data))
         db.add(new_obj)
         db.commit()
+        self._invalidate_caches()
         db.refresh(new_obj)
         return new_obj
 
     def delete(self, db: Session, id: int) -> bool:
-        obj = self.get_by_id(db, id)
+        obj = self.get(db, id)
         if not obj:
             return False
         db.delete(obj)
         db.commit()
+        self._invalidate_caches()
         return True
-    
-    def count(self, db: Session) -> int:
-        return len(db.exec(select(self.model)).all())
+
+    def bulk_save(
+        self, db: Session, items: List[dict], batch_size: Optional[int] = None, operation: str = "save"
+    ) -> List[dict]:
+        """
+        Écrit une liste d'éléments par lots de `batch_size`, une transaction par lot :
+        INSERT multi-lignes ... RETURNING id pour les créations, UPDATE executemany pour les mises à jour.
+        `operation` : "create" (id ignoré), "update" (id obligatoire, seuls les champs envoyés sont écrits si le
+        repository a un `update_schema`) ou "save" (mise à jour si id fourni).
+        Retourne un résultat par élément, dans l'ordre : {"index", "status", "id"} ou {"index", "status", "error"}.
+        """
+        batch_size = batch_size or settings.BULK_BATCH_SIZE
+        results: List[Optional[dict]] = [None] * len(items)
+
+        rows = []
+        for index, item in enumerate(items):
+            if operation == "create":
+                item = {key: value for key, value in item.items() if key != "id"}
+            elif operation == "update" and not item.get("id"):
+                results[index] = _bulk_error(index, "id: Field required")
+                continue
+            partial = operation == "update" and self.update_schema is not None
+            try:
+                if partial:
+                    obj = self.update_schema.model_validate({key: value for key, value in item.items() if key != "id"})
+                else:
+                    obj = self.model.model_validate(item)
+            except ValidationError as e:
+                results[index] = _bulk_error(index, _format_validation_error(e))
+                continue
+            data = obj.model_dump(exclude_unset=True)
+            if partial:
+                data["id"] = item["id"]
+            rows.append((index, self._touch(data)))
+
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                for result in self._write_batch(db, batch):
+                    results[result["index"]] = result
+                db.commit()
+            except SQLAlchemyError:
+                # Le lot a échoué en bloc : on rejoue élément par élément pour isoler les erreurs
+                db.rollback()
+                for result in self._write_rows_one_by_one(db, batch):
+                    results[result["index"]] = result
+
+        self._invalidate_caches()
+        return results
+
+    def bulk_copy(self, db: Session, items: List[dict]) -> List[dict]:
+        """
+        Création en masse par COPY ... FROM STDIN (PostgreSQL avec psycopg2), le chemin d'écriture le plus rapide.
+        Les éléments sont validés comme dans bulk_save. Si COPY échoue (contrainte violée), le lot est rejoué
+        par bulk_save pour isoler les erreurs. Les id créés par COPY ne sont pas renvoyés.
+        """
+        results: List[Optional[dict]] = [None] * len(items)
+        rows = []
+        for index, item in enumerate(items):
+            try:
+                obj = self.model.model_validate({key: value for key, value in item.items() if key != "id"})
+            except ValidationError as e:
+                results[index] = _bulk_error(index, _format_validation_error(e))
+                continue
+            rows.append((index, self._touch(obj.model_dump(exclude={"id"}))))
+        if not rows:
+            return results
+
+        columns = list(rows[0][1])
+        buffer = io.StringIO()
+        for _, data in rows:
+            buffer.write(",".join(_copy_value(data[column]) for column in columns) + "\n")
+        buffer.seek(0)
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        sql = f'COPY "{self.model.__tablename__}" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+        try:
+            db.connection().connection.cursor().copy_expert(sql, buffer)
+            db.commit()
+            for index, _ in rows:
+                results[index] = {"index": index, "status": "created", "id": None}
+        except db.get_bind().dialect.dbapi.Error:
+            db.rollback()
+            replayed = self.bulk_save(db, [items[index] for index, _ in rows], operation="create")
+            for (index, _), result in zip(rows, replayed):
+                results[index] = {**result, "index": index}
+
+        self._invalidate_caches()
+        return results
+
+    def bulk_delete(self, db: Session, ids: List[int], batch_size: Optional[int] = None) -> List[dict]:
+        """Supprime par lots (DELETE ... WHERE id IN (...) RETURNING id), un résultat par id"""
+        batch_size = batch_size or settings.BULK_BATCH_SIZE
+        id_column = self.model.__table__.c.id
+        deleted = set()
+
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            statement = delete(self.model.__table__).where(id_column.in_(batch)).returning(id_column)
+            deleted.update(db.execute(statement).scalars().all())
+            db.commit()
+
+        self._invalidate_caches()
+        return [
+            {"index": index, "status": "deleted", "id": id} if id in deleted
+            else _bulk_error(index, f"{self.model.__name__} {id} not found", id)
+            for index, id in enumerate(ids)
+        ]
+
+    def upsert(self, db: Session, key: str, data: dict, guard: Optional[str] = None) -> Tuple[Optional[T], bool]:
+        """
+        Création ou remplacement selon la colonne unique `key`, en une requête INSERT ... ON CONFLICT (key) DO UPDATE.
+        Avec `guard`, une ligne existante n'est remplacée que si la nouvelle valeur de cette colonne est plus grande
+        (plus récente) que l'ancienne, ou si l'ancienne est NULL.
+        Retourne (entité, écrite) : l'entité telle qu'en base, et False si le garde a écarté l'écriture.
+        """
+        self._check_upsert_columns(key, guard)
+        table = self.model.__table__
+        values = self._touch({name: value for name, value in data.items() if name != "id"})
+        with _constraints(db):
+            row = db.execute(self._upsert_statement(db, key, list(values), guard), values).mappings().first()
+            written = row is not None
+            if not written:
+                row = db.execute(select(table).where(table.c[key] == values[key])).mappings().first()
+            db.commit()
+        if written:
+            self._invalidate_caches()
+        return (self.model(**row) if row is not None else None), written
+
+    def bulk_upsert(
+        self,
+        db: Session,
+        items: List[dict],
+        key: str,
+        guard: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Upsert groupé par lots de `batch_size`, une transaction par lot : INSERT ... ON CONFLICT (key) DO UPDATE
+        exécuté en INSERT multi-lignes.
+        Un élément dont la clé revient plus loin dans la requête est ignoré (seule la dernière occurrence est écrite).
+        Retourne un résultat par élément : "upserted", "skipped" (écarté par `guard`) ou "error".
+        """
+        self._check_upsert_columns(key, guard)
+        batch_size = batch_size or settings.BULK_BATCH_SIZE
+        results: List[Optional[dict]] = [None] * len(items)
+
+        rows = []
+        for index, item in enumerate(items):
+            try:
+                obj = self.model.model_validate({name: value for name, value in item.items() if name != "id"})
+            except ValidationError as e:
+                results[index] = _bulk_error(index, _format_validation_error(e))
+                continue
+            data = obj.model_dump(exclude={"id"})
+            if data.get(key) is None:
+                results[index] = _bulk_error(index, f"{key}: Field required")
+                continue
+            rows.append((index, self._touch(data)))
+
+        # Une même clé deux fois dans un INSERT ... ON CONFLICT est refusée par PostgreSQL
+        last = {data[key]: index for index, data in rows}
+        unique_rows = []
+        for index, data in rows:
+            if last[data[key]] == index:
+                unique_rows.append((index, data))
+            else:
+                results[index] = _bulk_error(index, f"{key}={data[key]!r} is repeated later in the request")
+
+        for start in range(0, len(unique_rows), batch_size):
+            batch = unique_rows[start:start + batch_size]
+            try:
+                for result in self._upsert_batch(db, batch, key, guard):
+                    results[result["index"]] = result
+                db.commit()
+            except SQLAlchemyError:
+                # Le lot a échoué en bloc (autre contrainte) : on rejoue élément par élément pour isoler les erreurs
+                db.rollback()
+                for index, data in batch:
+                    try:
+                        with db.begin_nested():
+                            results[index] = self._upsert_batch(db, [(index, data)], key, guard)[0]
+                    except SQLAlchemyError as e:
+                        results[index] = _bulk_error(index, str(getattr(e, "orig", None) or e))
+                db.commit()
+
+        self._invalidate_caches()
+        return results
+
+    def _upsert_batch(self, db: Session, batch: List[tuple], key: str, guard: Optional[str]) -> List[dict]:
+        statement = self._upsert_statement(db, key, list(batch[0][1]), guard)
+        written = {row[key]: row["id"] for row in db.execute(statement, [data for _, data in batch]).mappings()}
+        return [
+            {"index": index, "status": "upserted", "id": written[data[key]]} if data[key] in written
+            else {"index": index, "status": "skipped", "id": None}
+            for index, data in batch
+        ]
+
+    def _upsert_statement(self, db: Session, key: str, columns: List[str], guard: Optional[str]):
+        """
+        INSERT ... ON CONFLICT (key) DO UPDATE [WHERE garde] RETURNING *, natif sous PostgreSQL et SQLite.
+        Sans VALUES : exécuté avec une liste de lignes, SQLAlchemy le regroupe en INSERT multi-lignes
+        (insertmanyvalues) et garde la requête compilée en cache.
+        """
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(self.model.__table__)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(self.model.__table__)
+        else:
+            raise UnsupportedDialectError(f"Upsert is not supported on the {dialect} dialect")
+
+        table = self.model.__table__
+        excluded = statement.excluded
+        updates = {name: excluded[name] for name in columns if name not in ("id", key)}
+        condition = None
+        if guard:
+            condition = or_(table.c[guard].is_(None), excluded[guard] > table.c[guard])
+        return statement.on_conflict_do_update(
+            index_elements=[table.c[key]],
+            set_=updates or {key: excluded[key]},
+            where=condition,
+        ).returning(*table.c)
+
+    def _check_upsert_columns(self, key: str, guard: Optional[str]) -> None:
+        table = self.model.__table__
+        if key not in table.c or not table.c[key].unique:
+            raise ValueError(f"Cannot upsert on '{key}': not a unique column")
+        if guard is not None and (guard not in table.c or guard == key):
+            raise ValueError(f"Unknown guard column '{guard}'")
+
+    def _write_batch(self, db: Session, batch: List[tuple]) -> List[dict]:
+        results = []
+        id_column = self.model.__table__.c.id
+
+        new_rows = [(index, data) for index, data in batch if not data.get("id")]
+        if new_rows:
+            statement = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+            new_ids = db.scalars(statement, [data for _, data in new_rows]).all()
+            results += [
+                {"index": index, "status": "created", "id": new_id}
+                for (index, _), new_id in zip(new_rows, new_ids)
+            ]
+
+        updated_rows = [(index, data) for index, data in batch if data.get("id")]
+        if updated_rows:
+            wanted = [data["id"] for _, data in updated_rows]
+            existing = set(db.execute(select(id_column).where(id_column.in_(wanted))).scalars().all())
+            found = [(index, data) for index, data in updated_rows if data["id"] in existing]
+            if found:
+                db.execute(update(self.model), [data for _, data in found])
+            results += [
+                {"index": index, "status": "updated", "id": data["id"]} if data["id"] in existing
+                else _bulk_error(index, f"{self.model.__name__} {data['id']} not found", data["id"])
+                for index, data in updated_rows
+            ]
+
+        return results
+
+    def _write_rows_one_by_one(self, db: Session, batch: List[tuple]) -> List[dict]:
+        results = []
+        for index, data in batch:
+            try:
+                with db.begin_nested():
+                    results += self._write_batch(db, [(index, data)])
+            except SQLAlchemyError as e:
+                results.append(_bulk_error(index, str(getattr(e, "orig", None) or e), data.get("id")))
+        db.commit()
+        return results
+
+    def count(self, db: Session, mode: str = "exact", filters: Optional[dict[str, Any]] = None) -> int:
+        """
+        Nombre de lignes de la table.
+        - "exact" : SELECT COUNT(*)
+        - "cached" : comptage exact mis en cache COUNT_CACHE_TTL secondes
+        - "estimate" : estimation du planificateur PostgreSQL (pg_class.reltuples) pour les tables
+          dépassant COUNT_ESTIMATE_THRESHOLD lignes, comptage exact en cache sinon
+        Avec des filtres, le comptage est toujours exact (ni cache ni estimation).
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode '{mode}', expected one of {COUNT_MODES}")
+        clauses = self.filter_clauses(filters)
+        if clauses:
+            return db.exec(select(func.count()).select_from(self.model).where(*clauses)).one()
+        if mode == "exact":
+            return self._exact_count(db)
+
+        if mode == "estimate":
+            estimate = self._estimated_count(db)
+            if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+                return estimate
+
+        table_name = self.model.__tablename__
+        cached = _count_cache.get(table_name)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+
+        value = self._exact_count(db)
+        _count_cache[table_name] = (now + settings.COUNT_CACHE_TTL, value)
+        return value
+
+    def _exact_count(self, db: Session) -> int:
+        return db.exec(select(func.count()).select_from(self.model)).one()
+
+    def _estimated_count(self, db: Session) -> Optional[int]:
+        """Estimation PostgreSQL, None si indisponible (autre SGBD ou table jamais analysée)"""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": self.model.__tablename__},
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    def _invalidate_caches(self) -> None:
+        """Après chaque écriture : comptage en cache et cache des lectures de l'entité"""
+        _count_cache.pop(self.model.__tablename__, None)
+        if self.cache is not None:
+            self.cache.invalidate()
+
+
+def _bulk_error(index: int, error: str, id: Optional[int] = None) -> dict:
+    return {"index": index, "status": "error", "id": id, "error": error}
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def _copy_value(value: Any) -> str:
+    """Valeur d'une ligne COPY au format CSV : NULL sans guillemets, tout le reste entre guillemets"""
+    if value is None:
+        return "\\N"
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _dump(obj) -> Optional[dict]:
+    """Valeurs des colonnes d'une entité, pour le cache (None si l'entité n'existe pas)"""
+    return obj.model_dump() if obj is not None else None
+
+
+def _freeze(filters: Optional[dict[str, Any]]) -> tuple:
+    """Forme hachable et stable d'un dictionnaire de filtres, pour les clés de cache"""
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in (filters or {}).items()
+        if value is not None
+    ))
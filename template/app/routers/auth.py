@@ -1,8 +1,10 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
-from app.utils.auth.auth import verify_password, create_access_token
+from app.registry import ASYNC_MODE
+from app.utils.auth.auth import verify_and_update_password, create_access_token
 from app.utils.core.config import settings
 from app.utils.core.database import get_db
 from app.repositories.auth.user_repository import UserRepository
@@ -10,18 +12,43 @@ from app.repositories.auth.user_repository import UserRepository
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 user_repo = UserRepository()
 
+if ASYNC_MODE:
+    # Projet généré avec --async : la connexion passe par la session et le pool asynchrones
+    from app.utils.core.async_database import get_async_db as get_login_db
+else:
+    get_login_db = get_db
+
+
+async def run_repository(method, db, *args):
+    """Appel au repository sans bloquer la boucle : run_sync en session asynchrone, thread sinon"""
+    if ASYNC_MODE:
+        return await db.run_sync(method, *args)
+    return await run_in_threadpool(method, db, *args)
+
 
 @router.post("/login")
 async def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_login_db)
 ):
-    user = user_repo.get_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_repository(user_repo.get_by_email, db, form_data.username)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
 
+    valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+
+    # Paramètres Argon2 modifiés dans Settings : le hash est recalculé de façon transparente
+    if new_hash:
+        user.hashed_password = new_hash
+        await run_repository(user_repo.save, db, user)
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user"
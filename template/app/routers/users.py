@@ -24,13 +24,13 @@ def switch_role(
     
 
     
-    if not current_user.roles.__contains__(role_id):
+    if not current_user.has_role(role_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"You don't have the '{role_id}' role. Available roles: {current_user.get_roles()}"
+            detail=f"You don't have the '{role_id}' role. Available roles: {current_user.roles_ids}"
         )
     
-    # Update active role in database
+    # Update active role in database (la sauvegarde invalide le cache des utilisateurs authentifiés)
     current_user.active_role = role_id
     user_repo.save(db, current_user)  
     
@@ -44,7 +44,7 @@ def switch_role(
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "all_roles": current_user.get_roles(),
+        "all_roles": current_user.roles_ids,
         "message": f"Successfully switched to {role_id} role"
     }
 
@@ -0,0 +1,149 @@
+"""
+Génération de données synthétiques pour les tests de charge et les benchmarks.
+
+    uv run python -m app.synthetic TLE --rows 1000000 --seed 42
+    uv run python -m app.synthetic TLE=1000000 Satellite=500 --truncate
+    uv run python -m app.synthetic TLE --rows 1000000 --output data/ --format csv
+
+Les valeurs respectent les contraintes de config/entities.txt, lues sur les modèles générés : type, `.range`,
+`.len`, `.unique`, `.nn` et `.fk`. Les entités référencées par `.fk` sont remplies d'abord (avec --rows lignes si
+elles ne sont pas demandées). Une même graine donne toujours les mêmes données. Écriture en base par COPY sous
+PostgreSQL, INSERT executemany ailleurs, ou dans un fichier CSV / NDJSON par entité avec --output.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+from app.registry import ENTITY_MODULES
+from app.utils.core.cache import RepositoryCache
+from app.utils.core.database import engine
+from app.utils.core.log import setup_logging
+from app.utils.core.migrations import run_migrations
+from app.utils.core.startup import import_entities
+from app.utils.core.synthetic import (
+    FILE_FORMATS,
+    SyntheticError,
+    TablePlan,
+    copy_rows,
+    delete_rows,
+    dependency_order,
+    entity_models,
+    generate_batches,
+    insert_rows,
+    next_id,
+    reset_sequence,
+    write_file,
+)
+
+
+def resolve_plans(names: List[str], rows: int) -> List[TablePlan]:
+    """
+    Entités demandées (`Nom` ou `Nom=lignes`, nom de classe ou de table sans tenir compte de la casse) et
+    entités qu'elles référencent, parents d'abord. Sans nom : toutes les entités de entities.txt.
+    """
+    import_entities(ENTITY_MODULES)
+    models = {}
+    for model in entity_models().values():
+        models[model.__name__.lower()] = model
+        models[model.__tablename__.lower()] = model
+
+    counts = {}
+    for name in names:
+        name, _, count = name.partition("=")
+        if name.lower() not in models:
+            raise SystemExit(f"Unknown entity '{name}', expected one of {sorted({m.__name__ for m in models.values()})}")
+        if count and not count.isdigit():
+            raise SystemExit(f"Invalid row count '{count}' for {name}")
+        counts[models[name.lower()]] = int(count) if count else rows
+    if not names:
+        # Entités de entities.txt uniquement : les tables d'authentification ont leur propre seed
+        counts = {model: rows for model in set(models.values()) if not model.__module__.startswith("app.entities.auth")}
+    return [TablePlan(model, counts.get(model, rows)) for model in dependency_order(list(counts))]
+
+
+def show_progress(model, written: int, total: int, start: float) -> None:
+    rate = written / max(time.perf_counter() - start, 1e-9)
+    print(f"{model.__name__} : {written}/{total} lignes - {rate:.0f} lignes/s", end="\r", file=sys.stderr, flush=True)
+
+
+def write_database(plans: List[TablePlan], args) -> None:
+    run_migrations(engine)
+    use_copy = engine.dialect.name == "postgresql" and not args.no_copy
+    write = copy_rows if use_copy else insert_rows
+    models = [plan.model for plan in plans]
+    with engine.begin() as connection:
+        if args.truncate:
+            delete_rows(connection, models)
+        for plan in plans:
+            plan.first_id = next_id(connection, plan.model)
+
+    parents = {}
+    for plan in plans:
+        start, written = time.perf_counter(), 0
+        # Une transaction par entité : ses enfants ne référencent que des lignes validées
+        with engine.begin() as connection:
+            for columns, rows in generate_batches(plan, args.seed, parents, args.null_ratio):
+                write(connection, plan.model, columns, rows)
+                written += len(rows)
+                show_progress(plan.model, written, plan.rows, start)
+            reset_sequence(connection, plan.model)
+        parents[plan.model.__tablename__] = plan.ids
+        # Cache partagé (CACHE_BACKEND=redis) des workers en cours : les lectures en cache de l'entité sont périmées
+        RepositoryCache(plan.model.__tablename__, 0).invalidate()
+        report(plan, start, f"ids {plan.ids.start} à {plan.ids.stop - 1}")
+
+
+def write_files(plans: List[TablePlan], args) -> None:
+    os.makedirs(args.output, exist_ok=True)
+    parents = {}
+    for plan in plans:
+        start, written = time.perf_counter(), 0
+        path = os.path.join(args.output, f"{plan.model.__tablename__}.{args.format}")
+        with open(path, "w", encoding="utf-8", newline="") as stream:
+            for columns, rows in generate_batches(plan, args.seed, parents, args.null_ratio):
+                write_file(stream, args.format, columns, rows, header=written == 0)
+                written += len(rows)
+                show_progress(plan.model, written, plan.rows, start)
+        parents[plan.model.__tablename__] = plan.ids
+        report(plan, start, path)
+
+
+def report(plan: TablePlan, start: float, target: str) -> None:
+    elapsed = time.perf_counter() - start
+    print(" " * 60, end="\r", file=sys.stderr)
+    print(f"{plan.model.__name__} : {plan.rows} lignes en {elapsed:.1f} s ({plan.rows / max(elapsed, 1e-9):.0f} lignes/s), {target}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.synthetic", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("entities", nargs="*", help="Entités (classe ou table), `Nom=lignes` pour un nombre propre ; toutes par défaut")
+    parser.add_argument("--rows", type=int, default=10000, help="Lignes par entité")
+    parser.add_argument("--seed", type=int, default=0, help="Graine : mêmes données pour une même graine")
+    parser.add_argument("--null-ratio", type=float, default=0.05, help="Part de NULL dans les colonnes nullables")
+    parser.add_argument("--truncate", action="store_true", help="Vide les tables avant (sinon ajout après le dernier id)")
+    parser.add_argument("--no-copy", action="store_true", help="INSERT executemany même sous PostgreSQL")
+    parser.add_argument("--output", metavar="DIR", help="Écrit un fichier par entité dans DIR au lieu de la base")
+    parser.add_argument("--format", choices=FILE_FORMATS, default="csv", help="Format des fichiers de --output")
+    args = parser.parse_args()
+    if args.truncate and args.output:
+        parser.error("--truncate cannot be used with --output")
+    if not 0 <= args.null_ratio <= 1:
+        parser.error("--null-ratio must be between 0 and 1")
+
+    setup_logging()
+    plans = resolve_plans(args.entities, args.rows)
+    try:
+        if args.output:
+            write_files(plans, args)
+        else:
+            write_database(plans, args)
+    except SyntheticError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
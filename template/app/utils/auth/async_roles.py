@@ -0,0 +1,70 @@
+import logging
+from typing import List
+from fastapi import Depends, HTTPException, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.utils.core.config import settings
+from app.utils.core.async_database import get_async_db
+from app.utils.auth.principal_cache import principal_cache
+from app.utils.auth.role_names import get_role_name, load_role_names
+from app.utils.auth.roles import _forbidden, _is_open_to_any_role, get_token_payload
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.auth.user_repository import UserRepository
+from app.entities.auth.user import User
+
+logger = logging.getLogger(__name__)
+
+# Dépendances d'authentification des routes générées avec --async : même logique que roles.py, sur la session
+# asynchrone (aucun appel bloquant dans la boucle d'événements)
+user_repo = AsyncBaseRepository(UserRepository())
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload), db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Utilisateur du token JWT, mis en cache par (user_id, jti) comme roles.get_current_user"""
+    user_id = int(payload["sub"])
+    user = principal_cache.get(user_id, payload["jti"])
+    if user is not None:
+        return user
+
+    logger.debug("Utilisateur %s absent du cache, lecture en base", user_id)
+    user = await user_repo.get_by_id(db, user_id)
+    if user is None:
+        logger.info("Token valide pour un utilisateur inexistant : %s", user_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    # Objet détaché de la session pour pouvoir être partagé entre requêtes
+    db.expunge(user)
+    principal_cache.set(user_id, payload["jti"], user)
+    return user
+
+
+def require_role(permited_role: List[str]) -> int:
+    """Version asynchrone de roles.require_role"""
+
+    if settings.JWT_EMBED_ROLE:
+        # Le rôle est lu dans le token signé : aucun accès à la base ni au cache
+        async def role_checker(payload: dict = Depends(get_token_payload)):
+            if not _is_open_to_any_role(permited_role) and payload.get("role") not in permited_role:
+                raise _forbidden(permited_role, payload.get("role"))
+            return int(payload["active_role"])
+
+        return role_checker
+
+    async def role_checker(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+
+        if _is_open_to_any_role(permited_role):
+            return current_user.active_role
+
+        role_name = get_role_name(current_user.active_role)
+        if role_name is None:
+            # Rôle créé après le démarrage : la table des rôles est rechargée
+            role_name = (await db.run_sync(load_role_names)).get(current_user.active_role)
+        if role_name not in permited_role:
+            raise _forbidden(permited_role, role_name)
+        return current_user.active_role
+
+    return role_checker
@@ -1,10 +1,29 @@
+import asyncio
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.utils.core.config import settings
+from app.utils.auth.role_names import get_role_name
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pool dédié et borné : une rafale de connexions n'occupe que PASSWORD_HASH_WORKERS threads,
+# ni la boucle d'événements ni le threadpool des routes synchrones
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2"
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -15,8 +34,28 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Vérifie le mot de passe dans le pool Argon2.
+    Retourne (valide, nouveau_hash) : nouveau_hash est renseigné quand le hash stocké a été calculé
+    avec d'autres paramètres que ceux de Settings et doit être remplacé.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+
 def create_access_token(user_id: int, active_role: int) -> str:
-    to_encode = {"sub": str(user_id), "active_role": str(active_role)}
+    to_encode = {"sub": str(user_id), "active_role": str(active_role), "jti": uuid.uuid4().hex}
+    if settings.JWT_EMBED_ROLE:
+        # Nom du rôle dans le token : require_role n'a plus besoin de la base
+        to_encode["role"] = get_role_name(active_role)
     expire = datetime.utcnow() + (
         timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
@@ -25,13 +64,12 @@ def create_access_token(user_id: int, active_role: int) -> str:
 
 
 def decode_access_token(token: str) -> dict:
-    print(f"Decoding token: {token}")
     payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     user_id = payload.get("sub")
     active_role = payload.get("active_role")
     if user_id is None or active_role is None:
-        print(f"Decoded payload missing user_id or active_role: {payload}")
+        logger.debug("Token sans sub ou active_role (claims: %s)", sorted(payload))
         raise JWTError("Missing user_id or active_role in token")
 
-    print(f"Decoded token for user_id: {user_id}, active_role: {active_role}")
-    return {"active_role": active_role, "sub": user_id}
\ No newline at end of file
+    logger.debug("Token décodé pour user_id=%s, active_role=%s", user_id, active_role)
+    return {"active_role": active_role, "sub": user_id, "jti": payload.get("jti"), "role": payload.get("role")}
\ No newline at end of file
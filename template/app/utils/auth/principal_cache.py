@@ -0,0 +1,35 @@
+from typing import Any, Optional
+from app.utils.core.cache import TTLCache
+from app.utils.core.config import settings
+
+
+class PrincipalCache:
+    """
+    Utilisateurs authentifiés, indexés par (user_id, jti) du token.
+    L'invalidation d'un utilisateur incrémente sa version : toutes ses entrées deviennent obsolètes en O(1).
+    Le cache est propre à chaque worker ; le TTL borne la durée pendant laquelle un autre worker
+    peut servir une donnée périmée.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl)
+        self._versions: dict[int, int] = {}
+
+    def get(self, user_id: int, jti: str) -> Optional[Any]:
+        entry = self._cache.get((user_id, jti))
+        if entry is None:
+            return None
+        version, user = entry
+        return user if version == self._versions.get(user_id, 0) else None
+
+    def set(self, user_id: int, jti: str, user: Any) -> None:
+        self._cache.set((user_id, jti), (self._versions.get(user_id, 0), user))
+
+    def invalidate_user(self, user_id: int) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL)
@@ -0,0 +1,22 @@
+from types import MappingProxyType
+from typing import Mapping, Optional
+from sqlmodel import Session, select
+from app.entities.auth.role import Role
+
+# Table id -> nom des rôles, chargée au démarrage : les rôles ne changent quasiment jamais
+_role_names: Mapping[int, str] = MappingProxyType({})
+
+
+def load_role_names(db: Session) -> Mapping[int, str]:
+    """(Re)charge la table id -> nom des rôles depuis la base"""
+    global _role_names
+    _role_names = MappingProxyType({role.id: role.name for role in db.exec(select(Role)).all()})
+    return _role_names
+
+
+def get_role_name(role_id: int, db: Optional[Session] = None) -> Optional[str]:
+    """Nom d'un rôle ; recharge la table depuis la base si le rôle est inconnu (créé après le démarrage)"""
+    name = _role_names.get(role_id)
+    if name is None and db is not None:
+        name = load_role_names(db).get(role_id)
+    return name
@@ -1,78 +1,93 @@
-from typing import List
+import logging
+from typing import List, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from app.entities.auth.role import Role
 from sqlmodel import Session
 from app.utils.auth.auth import decode_access_token
+from app.utils.core.config import settings
 from app.utils.core.database import get_db
+from app.utils.auth.principal_cache import principal_cache
+from app.utils.auth.role_names import get_role_name
 from app.repositories.auth.user_repository import UserRepository
 from app.entities.auth.user import User
-from app.repositories.auth.role_repository import RoleRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-role_repo = RoleRepository()
+logger = logging.getLogger(__name__)
+
+def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """Contenu vérifié du token JWT (sans accès à la base)"""
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+        )
+    # Tokens émis sans jti : le token lui-même sert de clé de cache
+    payload["jti"] = payload.get("jti") or token
+    return payload
+
 
 def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    payload: dict = Depends(get_token_payload), db: Session = Depends(get_db)
 ) -> User:
     """
     Récupère l'utilisateur actuel à partir du sub (user_id) du token JWT.
+    Les utilisateurs sont mis en cache par (user_id, jti) : aucune requête SQL sur un chemin chaud.
     """
-    try:
-        payload = decode_access_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-            )
-
-        user_repo = UserRepository()
-        print(f"Recherche utilisateur avec ID: {user_id}")  # Debug
-        user = user_repo.get_by_id(db, int(user_id))
-        print(f"Utilisateur trouvé: {user}")  # Debug
-        if user is None:
-            print(f"Aucun utilisateur trouvé pour l'ID: {user_id}")  # Debug
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-            )
-
-        print(f"Retour de l'utilisateur: {user.email}")  # Debug
+    user_id = int(payload["sub"])
+    user = principal_cache.get(user_id, payload["jti"])
+    if user is not None:
         return user
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-            )
 
-        return user
-    except JWTError:
+    logger.debug("Utilisateur %s absent du cache, lecture en base", user_id)
+    user = UserRepository().get_by_id(db, user_id)
+    if user is None:
+        logger.info("Token valide pour un utilisateur inexistant : %s", user_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
+            detail="User not found",
         )
 
+    # Objet détaché de la session pour pouvoir être partagé entre requêtes
+    db.expunge(user)
+    principal_cache.set(user_id, payload["jti"], user)
+    return user
+
 
+def _is_open_to_any_role(permited_role: List[str]) -> bool:
+    return not permited_role or "*" in permited_role or "any" in permited_role
+
+
+def _forbidden(permited_role: List[str], role_name: Optional[str]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Access forbidden: one of {permited_role} roles required, got {role_name}",
+    )
 
 
 def require_role(permited_role: List[str]) -> int:
     """Decorator to require one of multiple roles from JWT token"""
 
+    if settings.JWT_EMBED_ROLE:
+        # Le rôle est lu dans le token signé : aucun accès à la base ni au cache
+        def role_checker(payload: dict = Depends(get_token_payload)):
+            if not _is_open_to_any_role(permited_role) and payload.get("role") not in permited_role:
+                raise _forbidden(permited_role, payload.get("role"))
+            return int(payload["active_role"])
+
+        return role_checker
+
     def role_checker(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
 
-        if not permited_role or "*" in permited_role or "any" in permited_role or len(permited_role) == 0:
+        if _is_open_to_any_role(permited_role):
             return current_user.active_role
 
-        active_user_role:Role = role_repo.get_by_id(db, current_user.active_role)
-        if active_user_role.name not in permited_role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access forbidden: one of {permited_role} roles required, got {active_user_role.name}",
-            )
+        role_name = get_role_name(current_user.active_role, db)
+        if role_name not in permited_role:
+            raise _forbidden(permited_role, role_name)
         return current_user.active_role
 
     return role_checker
-
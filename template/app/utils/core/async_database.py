@@ -0,0 +1,76 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel.ext.asyncio.session import AsyncSession
+from uuid import uuid4
+from app.utils.core.config import settings
+from fastapi import Request
+from app.utils.core.database import DATABASE_URL, TimedPool, engine_options, pools
+from app.utils.core.replicas import ReplicaSet, logger, replica_urls, sticky_to_primary
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def to_async_url(url: str) -> str:
+    """Même base, via le driver asynchrone (asyncpg pour PostgreSQL, aiosqlite pour SQLite)"""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()]).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+connect_args = {}
+if settings.DB_PGBOUNCER:
+    # PgBouncer en mode transaction : pas de requêtes préparées nommées partagées entre transactions
+    connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+class TimedAsyncQueuePool(TimedPool, AsyncAdaptedQueuePool):
+    pool_name = "async"
+
+
+def create_async_db_engine(url: str):
+    return create_async_engine(
+        to_async_url(url), connect_args=connect_args, poolclass=TimedAsyncQueuePool, **engine_options()
+    )
+
+
+async_engine = create_async_db_engine(DATABASE_URL)
+pools["async"] = async_engine.pool
+async_replicas = ReplicaSet([create_async_db_engine(url) for url in replica_urls()], settings.DB_REPLICA_RETRY_SECONDS)
+
+# Session SQLModel (db.exec) ; expire_on_commit=False : les objets restent lisibles après commit sans requête implicite (interdite en async)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_async_read_db(request: Request):
+    """Session de lecture asynchrone : réplica sain, ou base principale (voir replicas.get_read_db)"""
+    if async_replicas.engines and not sticky_to_primary(request):
+        for index in async_replicas.candidates():
+            session = AsyncSession(async_replicas.engines[index], expire_on_commit=False)
+            try:
+                await session.connection()
+            except OperationalError as e:
+                await session.close()
+                async_replicas.mark_down(index)
+                logger.warning("Réplica %s indisponible, écarté %ss : %s", index, settings.DB_REPLICA_RETRY_SECONDS, e)
+                continue
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with AsyncSessionLocal() as session:
+        yield session
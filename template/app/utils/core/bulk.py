@@ -0,0 +1,20 @@
+from typing import List
+from fastapi import HTTPException, status
+from app.utils.core.config import settings
+
+
+def check_bulk_size(items: list) -> None:
+    """Refuse les requêtes groupées vides ou dépassant BULK_MAX_ITEMS éléments"""
+    if not items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty bulk request")
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many items: {len(items)} > {settings.BULK_MAX_ITEMS}",
+        )
+
+
+def bulk_summary(results: List[dict]) -> dict:
+    """Corps de réponse des routes groupées : totaux et résultat individuel de chaque élément"""
+    failed = sum(1 for result in results if result["status"] == "error")
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
@@ -0,0 +1,199 @@
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Hashable, Optional
+
+from app.utils.core.config import settings
+from app.utils.core.metrics import metrics
+
+
+class TTLCache:
+    """Cache LRU en mémoire, borné en taille, dont les entrées expirent après `ttl` secondes"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Ajoute une entrée ; `ttl` remplace la durée de vie par défaut du cache pour cette entrée"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class CacheBackend(ABC):
+    """
+    Interface d'un backend de cache des repositories. Les valeurs sont des objets Python
+    (dictionnaires de colonnes, Version, Page...) ; les compteurs servent de numéros de génération.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Backend en mémoire du processus (LRU borné à `maxsize` entrées). Propre à chaque worker :
+    une écriture n'invalide que le cache du worker qui l'a faite, les autres attendent le TTL.
+    Sert aussi de faux backend dans les tests (set_cache_backend(MemoryBackend())).
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._cache = TTLCache(maxsize, ttl=60.0)
+        # Compteurs à part : ils ne doivent pas être évincés par le LRU
+        self._counters: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._cache.set(key, value, ttl)
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] += 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self._counters.clear()
+
+
+class RedisBackend(CacheBackend):
+    """Backend partagé entre workers et instances (dépendance optionnelle : uv add redis)"""
+
+    def __init__(self, url: str, prefix: str = ""):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (uv add redis)") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), px=max(1, int(ttl * 1000)))
+
+    def counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Backend choisi par CACHE_BACKEND ("memory" ou "redis"), créé au premier usage"""
+    global _backend
+    if _backend is None:
+        if settings.CACHE_BACKEND == "redis":
+            _backend = RedisBackend(settings.CACHE_URL, prefix=settings.CACHE_KEY_PREFIX)
+        else:
+            _backend = MemoryBackend(settings.CACHE_MAX_ENTRIES)
+    return _backend
+
+
+def set_cache_backend(backend: Optional[CacheBackend]) -> None:
+    """Remplace le backend (tests, backend maison) ; None revient au backend configuré"""
+    global _backend
+    _backend = backend
+
+
+# Compteurs de succès / échecs par table : {table: [hits, misses]}
+cache_stats: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+
+class RepositoryCache:
+    """
+    Cache des lectures d'un repository. Chaque clé inclut le numéro de génération de la table :
+    une écriture l'incrémente (invalidate) et rend toutes les entrées précédentes inaccessibles en O(1).
+    Une lecture commencée avant l'écriture range sa valeur sous l'ancienne génération, jamais relue.
+    """
+
+    def __init__(self, table: str, ttl: float):
+        self.table = table
+        self.ttl = ttl
+        self.generation_key = f"{table}:generation"
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """Valeur en cache pour `key`, ou résultat de `loader()` mis en cache (sauf None)"""
+        backend = get_cache_backend()
+        cache_key = f"{self.table}:{backend.counter(self.generation_key)}:{key!r}"
+        value = backend.get(cache_key)
+        stats = cache_stats[self.table]
+        if value is not None:
+            stats[0] += 1
+            return value
+
+        stats[1] += 1
+        value = loader()
+        if value is not None:
+            backend.set(cache_key, value, self.ttl)
+        return value
+
+    def invalidate(self) -> None:
+        get_cache_backend().incr(self.generation_key)
+
+
+def _cache_metrics() -> list[str]:
+    lines = ["# TYPE repository_cache_requests_total counter"]
+    for table, (hits, misses) in sorted(cache_stats.items()):
+        lines.append(f'repository_cache_requests_total{{table="{table}",result="hit"}} {hits}')
+        lines.append(f'repository_cache_requests_total{{table="{table}",result="miss"}} {misses}')
+    return lines
+
+
+metrics.add_collector(_cache_metrics)
@@ -0,0 +1,78 @@
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle : uv add brotli
+    brotli = None
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        # Réponse en flux : chaque morceau est envoyé aussitôt compressé
+        return data + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Encodages de l'en-tête Accept-Encoding avec leur poids q (`br;q=0.5, gzip` -> {"br": 0.5, "gzip": 1.0})"""
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def negotiate(header: str) -> Optional[str]:
+    """Encodage retenu : br (si brotli est installé) puis gzip, à poids égal ; None sans compression"""
+    encodings = accepted_encodings(header)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    weighted = [(encodings.get(name, encodings.get("*", 0.0)), -rank, name) for rank, name in enumerate(candidates)]
+    quality, _, name = max(weighted)
+    return name if quality > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Compression des réponses selon Accept-Encoding : brotli ou gzip au-delà de `minimum_size` octets.
+    Les réponses plus petites, déjà encodées ou en text/event-stream partent telles quelles.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        responder: ASGIApp
+        if encoding == "br":
+            # Qualité brotli 0..11 : on reprend le niveau gzip (1..9), au-delà le coût CPU explose
+            responder = BrotliResponder(self.app, self.minimum_size, quality=min(self.level, 9))
+        elif encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.level)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
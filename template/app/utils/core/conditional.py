@@ -0,0 +1,108 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Mapping, NamedTuple, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+class Version(NamedTuple):
+    """Version d'une ressource : étiquette opaque (base de l'ETag) et date de dernière modification si connue"""
+
+    tag: str
+    last_modified: Optional[datetime]
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def content_hash(data: Any) -> str:
+    """Empreinte d'un contenu sérialisable en JSON (repli quand l'entité n'a pas de colonne updated_at)"""
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def page_version(items: Iterable[Any]) -> Version:
+    """Version d'une page calculée sur son contenu (entités ou mappings projetés)"""
+    data = [dict(item) if isinstance(item, Mapping) else item.model_dump() for item in items]
+    return Version(content_hash(data), None)
+
+
+def make_etag(*parts: Any) -> str:
+    return '"' + hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def item_validators(version: Version, fields: Optional[str] = None) -> Validators:
+    """Validateurs d'un élément ; sans `fields`, l'ETag est celui attendu dans If-Match"""
+    return Validators(make_etag(version.tag, fields or ""), version.last_modified)
+
+
+def collection_validators(request: Request, version: Version) -> Validators:
+    """Validateurs d'une page de liste : la version de la collection et les paramètres de la requête"""
+    return Validators(make_etag(version.tag, request.url.query), version.last_modified)
+
+
+def _etags(header: str) -> list[str]:
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def is_conditional(request: Request) -> bool:
+    """Requête de revalidation (If-None-Match ou If-Modified-Since) : seule à justifier une sonde de la collection"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def not_modified(request: Request, validators: Validators) -> Optional[Response]:
+    """
+    Réponse 304 si le client possède déjà cette version (If-None-Match prioritaire sur If-Modified-Since),
+    None sinon.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _etags(if_none_match)
+        fresh = "*" in tags or validators.etag in tags
+    else:
+        fresh = _not_modified_since(request.headers.get("if-modified-since"), validators.last_modified)
+
+    if not fresh:
+        return None
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, validators)
+    return response
+
+
+def _not_modified_since(header: Optional[str], last_modified: Optional[datetime]) -> bool:
+    if not header or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def set_validators(response: Response, validators: Validators) -> None:
+    response.headers["ETag"] = validators.etag
+    if validators.last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(validators.last_modified), usegmt=True)
+
+
+def check_if_match(request: Request, version: Optional[Version]) -> None:
+    """
+    Écriture conditionnelle : 412 si If-Match est présent et ne correspond pas à la version actuelle.
+    `version` est None si l'élément n'existe pas.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return
+    tags = [tag.strip() for tag in if_match.split(",")]
+    if version is not None and ("*" in tags or item_validators(version).etag in tags):
+        return
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Resource has been modified")
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Les dates naïves de la base sont en UTC (datetime.utcnow)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
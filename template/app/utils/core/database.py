@@ -1,10 +1,81 @@
+import time
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine, Session
 from app.utils.core.config import settings
+from app.utils.core.metrics import metrics
 
-# Construction de l'URL de connexion à partir des variables d'environnement
-DATABASE_URL = f"postgresql://{settings.DB_USERNAME}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
+# Construction de l'URL de connexion à partir des variables d'environnement (DATABASE_URL prioritaire si renseignée)
+DATABASE_URL = settings.DATABASE_URL or f"postgresql://{settings.DB_USERNAME}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
 
-engine = create_engine(DATABASE_URL, echo=settings.DEBUG)
+
+class TimedPool:
+    """
+    Mesure le temps d'attente pour obtenir une connexion (métrique db_pool_checkout_wait_seconds, par pool).
+    À combiner avec une classe de pool SQLAlchemy ; `pool_name` distingue les moteurs synchrone et asynchrone.
+    """
+    pool_name = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe_pool_wait(self.pool_name, time.perf_counter() - start)
+
+
+class TimedQueuePool(TimedPool, QueuePool):
+    pass
+
+
+def engine_options() -> dict:
+    """Options du pool de connexions, communes aux moteurs synchrone et asynchrone (voir Settings.DB_*)"""
+    return {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def create_db_engine(url: str):
+    return create_engine(url, poolclass=TimedQueuePool, **engine_options())
+
+
+engine = create_db_engine(DATABASE_URL)
+
+# Pools exposés sur /health/pool et /metrics, par nom : le moteur asynchrone s'y ajoute (voir async_database)
+pools = {"sync": engine.pool}
+
+
+def pool_stats(name: str = "sync") -> dict:
+    """État d'un pool : connexions ouvertes, empruntées, en débordement, et attente cumulée d'emprunt"""
+    pool = pools[name]
+    wait = metrics.pool_wait(name)
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkout_wait_count": wait.total,
+        "checkout_wait_seconds": wait.sum,
+    }
+
+
+def _pool_metrics() -> list[str]:
+    lines = ["# TYPE db_pool_connections gauge"]
+    for name in sorted(pools):
+        stats = pool_stats(name)
+        lines += [
+            f'db_pool_connections{{pool="{name}",state="{state}"}} {stats[state]}'
+            for state in ("checked_in", "checked_out", "overflow")
+        ]
+    return lines
+
+
+metrics.add_collector(_pool_metrics)
 
 
 def get_db():
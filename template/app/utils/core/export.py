@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, List
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from app.utils.core.replicas import open_read_session, sticky_to_primary
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# Nombre de lignes regroupées dans un même fragment HTTP
+CHUNK_ROWS = 500
+
+
+def negotiate_export_format(request: Request) -> str:
+    """CSV si l'en-tête Accept le demande, NDJSON sinon"""
+    accept = request.headers.get("accept", "")
+    return CSV_MEDIA_TYPE if CSV_MEDIA_TYPE in accept else NDJSON_MEDIA_TYPE
+
+
+def export_response(
+    request: Request, stream_rows: Callable[[Session], Iterable[dict]], columns: List[str], filename: str
+) -> StreamingResponse:
+    """
+    Réponse en flux (NDJSON ou CSV) : les lignes sont lues via un curseur côté serveur et envoyées
+    par fragments, la mémoire reste constante quel que soit le nombre de lignes.
+    La session (sur un réplica si disponible) est ouverte dans le générateur car elle doit vivre
+    pendant tout l'envoi de la réponse.
+    """
+    media_type = negotiate_export_format(request)
+    render = _render_csv if media_type == CSV_MEDIA_TYPE else _render_ndjson
+    extension = "csv" if media_type == CSV_MEDIA_TYPE else "ndjson"
+
+    prefer_primary = sticky_to_primary(request)
+
+    def body() -> Iterator[str]:
+        with open_read_session(prefer_primary) as db:
+            yield from render(stream_rows(db), columns)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    """Dates au format ISO, comme en NDJSON ; les autres valeurs telles que le module csv les écrit"""
+    return _json_value(value) if isinstance(value, (datetime, date)) else value
+
+
+def _render_ndjson(rows: Iterable[dict], columns: List[str]) -> Iterator[str]:
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(dict(row), default=_json_value, ensure_ascii=False))
+        if len(chunk) >= CHUNK_ROWS:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def _render_csv(rows: Iterable[dict], columns: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        writer.writerow({name: _csv_value(value) for name, value in row.items()})
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
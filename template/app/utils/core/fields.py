@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from pydantic import TypeAdapter, create_model
+
+from app.utils.core.config import settings
+from app.utils.core.serialization import all_columns, rows_response
+
+
+def parse_fields(fields: Optional[str], model) -> Optional[Tuple[str, ...]]:
+    """
+    Liste de colonnes d'un paramètre `?fields=norad,nom,epoch`, dans l'ordre demandé et sans doublon.
+    Paramètre absent : None, ou toutes les colonnes en mode FAST_SERIALIZATION (lecture Core sans ORM).
+    400 si une colonne n'existe pas.
+    """
+    if not fields:
+        return all_columns(model) if settings.FAST_SERIALIZATION else None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    columns = model.__table__.c
+    unknown = [name for name in names if name not in columns]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields {unknown}, expected some of {[c.name for c in columns]}",
+        )
+    return names
+
+
+@lru_cache(maxsize=256)
+def slim_adapter(model, fields: Tuple[str, ...], many: bool = True) -> TypeAdapter:
+    """Modèle de réponse réduit aux colonnes demandées (mis en cache par combinaison de colonnes)"""
+    definitions = {name: (Optional[model.model_fields[name].annotation], None) for name in fields}
+    slim = create_model(f"{model.__name__}Fields", **definitions)
+    return TypeAdapter(list[slim] if many else slim)
+
+
+def fields_response(
+    model, fields: Tuple[str, ...], rows: Iterable[Any] | Any, many: bool = True, headers: Optional[dict] = None
+) -> Response:
+    """
+    Réponse JSON des lignes projetées (mappings) : rendues telles quelles par orjson en mode
+    FAST_SERIALIZATION, sinon sérialisées par le modèle réduit
+    """
+    # En-têtes déjà posés par la route (pagination, total), hors content-length recalculé ici
+    extra = {name: value for name, value in (headers or {}).items() if name != "content-length"}
+    if settings.FAST_SERIALIZATION:
+        return rows_response(rows, fields, many, headers=extra)
+    adapter = slim_adapter(model, fields, many)
+    data = [dict(row) for row in rows] if many else dict(rows)
+    body = adapter.dump_json(adapter.validate_python(data))
+    return Response(body, media_type="application/json", headers=extra)
@@ -0,0 +1,162 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, TextIO, Tuple, Union
+
+FORMATS = ("csv", "ndjson", "tle")
+
+EXTENSIONS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "ndjson",
+    ".tle": "tle",
+    ".txt": "tle",
+    ".2le": "tle",
+    ".3le": "tle",
+}
+
+# Colonnes d'une entité au format TLE (voir config/entities.txt) : au moins les deux lignes brutes
+TLE_COLUMNS = {"ligne1", "ligne2"}
+
+
+class ParseError(ValueError):
+    """Enregistrement illisible : rejeté sans interrompre la lecture du fichier"""
+
+
+Record = Tuple[int, Union[dict, ParseError]]
+
+
+def detect_format(path: str) -> str:
+    """Format d'après l'extension du fichier (.csv, .ndjson / .jsonl, .tle / .txt)"""
+    for extension, name in EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return name
+    raise ValueError(f"Cannot guess the format of '{path}', use --format {{{','.join(FORMATS)}}}")
+
+
+def read_records(stream: TextIO, file_format: str) -> Iterator[Record]:
+    """Enregistrements du fichier, lus en flux : (numéro de ligne, dictionnaire ou ParseError)"""
+    readers = {"csv": read_csv, "ndjson": read_ndjson, "tle": read_tle}
+    return readers[file_format](stream)
+
+
+def read_csv(stream: TextIO) -> Iterator[Record]:
+    """CSV avec ligne d'en-tête ; une cellule vide vaut None"""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, ParseError(f"{len(row[None])} value(s) beyond the header columns")
+            continue
+        yield reader.line_num, {key: value if value != "" else None for key, value in row.items()}
+
+
+def read_ndjson(stream: TextIO) -> Iterator[Record]:
+    """Un objet JSON par ligne, lignes vides ignorées"""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, ParseError(f"Invalid JSON: {e.msg} (column {e.colno})")
+            continue
+        if not isinstance(data, dict):
+            yield number, ParseError("Expected a JSON object")
+            continue
+        yield number, data
+
+
+def read_tle(stream: TextIO) -> Iterator[Record]:
+    """
+    Fichier d'éléments orbitaux en deux lignes (1 ..., 2 ...) ou trois lignes (nom, éventuellement
+    préfixé par « 0 », puis les deux lignes). Le numéro de ligne est celui de la ligne 1.
+    """
+    name = None
+    pending = None  # (numéro, ligne 1) en attente de sa ligne 2
+    for number, raw in enumerate(stream, 1):
+        line = raw.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if line.startswith("2 ") and pending is not None:
+            start, line1 = pending
+            try:
+                yield start, parse_tle(line1, line, name)
+            except ParseError as e:
+                yield start, e
+            pending, name = None, None
+            continue
+
+        if pending is not None:
+            yield pending[0], ParseError("Line 1 is not followed by its line 2")
+            pending = None
+        if line.startswith("1 "):
+            pending = (number, line)
+        elif line.startswith("2 "):
+            yield number, ParseError("Line 2 without a preceding line 1")
+            name = None
+        else:
+            name = line[2:].strip() if line.startswith("0 ") else line.strip()
+
+    if pending is not None:
+        yield pending[0], ParseError("Line 1 is not followed by its line 2")
+
+
+def parse_tle(line1: str, line2: str, name: Optional[str] = None) -> dict:
+    """Éléments d'un TLE, avec les noms de colonnes de l'entité TLE de config/entities.txt"""
+    line1, line2 = line1.rstrip(), line2.rstrip()
+    for index, line in enumerate((line1, line2), 1):
+        if len(line) != 69:
+            raise ParseError(f"Line {index} has {len(line)} characters, expected 69")
+        if tle_checksum(line) != line[68]:
+            raise ParseError(f"Line {index} checksum is {line[68]}, expected {tle_checksum(line)}")
+    if line1[2:7] != line2[2:7]:
+        raise ParseError(f"Catalog numbers differ: {line1[2:7].strip()} / {line2[2:7].strip()}")
+
+    try:
+        return {
+            "nom": name or None,
+            "norad": int(line1[2:7]),
+            "classification": line1[7].strip() or None,
+            "designateur_international": line1[9:17].strip() or None,
+            "epoch": _tle_epoch(line1[18:20], line1[20:32]),
+            "mouvement_moyen_deriv1": float(line1[33:43]),
+            "mouvement_moyen_deriv2": _implied_decimal(line1[44:52]),
+            "bstar": _implied_decimal(line1[53:61]),
+            "type_element": int(line1[62]) if line1[62].strip() else None,
+            "numero_ensemble_elements": int(line1[64:68]),
+            "inclinaison_deg": float(line2[8:16]),
+            "ascension_droite_noeud_ascendant_deg": float(line2[17:25]),
+            "excentricite": float("0." + line2[26:33].strip()),
+            "argument_perigee_deg": float(line2[34:42]),
+            "anomalie_moyenne_deg": float(line2[43:51]),
+            "mouvement_moyen_rev_par_jour": float(line2[52:63]),
+            "numero_revolution": int(line2[63:68]),
+            "ligne1": line1,
+            "ligne2": line2,
+        }
+    except ValueError as e:
+        raise ParseError(f"Malformed element: {e}") from e
+
+
+def tle_checksum(line: str) -> str:
+    """Somme de contrôle modulo 10 : chiffres, plus 1 par signe moins"""
+    total = sum(int(char) if char.isdigit() else char == "-" for char in line[:68])
+    return str(total % 10)
+
+
+def _tle_epoch(year: str, day: str) -> datetime:
+    # Années sur deux chiffres : 57-99 -> 19xx, 00-56 -> 20xx
+    full_year = int(year) + (1900 if int(year) >= 57 else 2000)
+    return datetime(full_year, 1, 1) + timedelta(days=float(day) - 1)
+
+
+def _implied_decimal(field: str) -> float:
+    """Notation TLE à point décimal implicite : " 12345-3" -> 0.12345e-3"""
+    field = field.strip()
+    if not field:
+        return 0.0
+    sign = -1.0 if field[0] == "-" else 1.0
+    field = field.lstrip("+-")
+    mantissa, exponent = field[:-2], field[-2:]
+    return sign * float(f"0.{mantissa}e{exponent}")
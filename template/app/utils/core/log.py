@@ -0,0 +1,31 @@
+import logging
+import random
+from app.utils.core.config import settings
+
+
+class SamplingFilter(logging.Filter):
+    """Ne conserve qu'une fraction `rate` des messages DEBUG ; les autres niveaux passent toujours"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+def setup_logging() -> None:
+    """
+    Configure le logger `app` : niveau LOG_LEVEL, échantillonnage LOG_DEBUG_SAMPLE_RATE des messages DEBUG.
+    En production (niveau INFO ou plus), les appels logger.debug(...) s'arrêtent au test de niveau.
+    """
+    logger = logging.getLogger("app")
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handler.addFilter(SamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+        logger.addHandler(handler)
+    logger.propagate = False
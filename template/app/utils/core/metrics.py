@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Histogram:
+    """Histogramme cumulatif au format Prometheus (bornes supérieures `le`)"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.total += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def render(self, name: str, labels: str) -> List[str]:
+        separator = "," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.total}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.total}")
+        return lines
+
+
+class MetricsRegistry:
+    """Métriques de l'application, exposées au format texte Prometheus sur /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.in_flight = 0
+        # Attente d'emprunt d'une connexion, par pool ("sync", et "async" en mode --async)
+        self.pool_waits: Dict[str, Histogram] = {}
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Ajoute une fonction renvoyant des lignes Prometheus calculées au moment de l'export (jauges)"""
+        self.collectors.append(collector)
+
+    def observe_request(self, method: str, route: str, status: int, duration: float) -> None:
+        with self._lock:
+            self.requests[(method, route, status)] += 1
+            histogram = self.durations.get((method, route))
+            if histogram is None:
+                histogram = self.durations[(method, route)] = Histogram()
+            histogram.observe(duration)
+
+    def observe_pool_wait(self, pool: str, duration: float) -> None:
+        with self._lock:
+            histogram = self.pool_waits.get(pool)
+            if histogram is None:
+                histogram = self.pool_waits[pool] = Histogram(POOL_WAIT_BUCKETS)
+            histogram.observe(duration)
+
+    def pool_wait(self, pool: str) -> Histogram:
+        return self.pool_waits.get(pool) or Histogram(POOL_WAIT_BUCKETS)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Nombre de requêtes HTTP par route et code de statut",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}')
+
+            lines += [
+                "# HELP http_request_duration_seconds Latence des requêtes HTTP par route",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), histogram in sorted(self.durations.items()):
+                lines += histogram.render("http_request_duration_seconds", f'method="{method}",route="{route}"')
+
+            lines += [
+                "# HELP http_requests_in_flight Requêtes HTTP en cours de traitement",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP db_pool_checkout_wait_seconds Attente pour obtenir une connexion du pool",
+                "# TYPE db_pool_checkout_wait_seconds histogram",
+            ]
+            for pool, histogram in sorted(self.pool_waits.items()):
+                lines += histogram.render("db_pool_checkout_wait_seconds", f'pool="{pool}"')
+
+        for collector in self.collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI : compte les requêtes par route (gabarit de chemin, ex. /tles/{id}) et statut,
+    mesure leur latence et le nombre de requêtes en cours.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            # La route est renseignée dans le scope par le routeur FastAPI une fois la requête aiguillée
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            metrics.observe_request(scope["method"], route_path, status_code, time.perf_counter() - start)
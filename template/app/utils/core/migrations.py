@@ -0,0 +1,234 @@
+import json
+import logging
+import pathlib
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table,
+    desc, inspect, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import SQLModel
+
+logger = logging.getLogger("app.migrations")
+
+# Migrations générées par InitFastAPIProject.py à partir de config/entities.txt (une par changement de schéma)
+MIGRATIONS_DIR = pathlib.Path(__file__).resolve().parents[2] / "migrations"
+
+# Clé arbitraire du verrou consultatif PostgreSQL : un seul worker applique les migrations
+ADVISORY_LOCK_KEY = 7_311_905_424
+
+version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    version_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+SQL_TYPES = {
+    "int": Integer,
+    "integer": Integer,
+    "float": Float,
+    "decimal": Float,
+    "bool": Boolean,
+    "boolean": Boolean,
+    "date": Date,
+    "datetime": DateTime,
+}
+
+
+def load_migrations() -> list[dict]:
+    """Charge les migrations embarquées dans app/migrations, triées par version"""
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            migrations.append(json.load(f))
+    return sorted(migrations, key=lambda migration: migration["version"])
+
+
+def current_version(conn: Connection) -> Optional[tuple[int, str]]:
+    """Version et empreinte appliquées en base, ou None si la table schema_version n'existe pas encore"""
+    if not inspect(conn).has_table(schema_version.name):
+        return None
+    row = conn.execute(
+        select(schema_version.c.version, schema_version.c.fingerprint)
+        .order_by(desc(schema_version.c.version))
+        .limit(1)
+    ).first()
+    return (row.version, row.fingerprint) if row else (0, "")
+
+
+def _is_up_to_date(engine: Engine, head: dict) -> bool:
+    """Vérification du démarrage : une seule requête, l'absence de la table valant « pas à jour »"""
+    with engine.connect() as conn:
+        try:
+            row = conn.execute(
+                select(schema_version.c.version, schema_version.c.fingerprint)
+                .order_by(desc(schema_version.c.version))
+                .limit(1)
+            ).first()
+        except (OperationalError, ProgrammingError):
+            return False
+    return row is not None and (row.version, row.fingerprint) == (head["version"], head["fingerprint"])
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Met le schéma de la base à jour au démarrage.
+
+    Cas courant : une seule requête sur schema_version, qui renvoie déjà l'empreinte attendue.
+    Sinon, les migrations en attente sont appliquées dans une transaction, sous verrou consultatif
+    (PostgreSQL) : les autres workers attendent puis constatent que la base est à jour.
+    """
+    migrations = load_migrations()
+    if not migrations:
+        logger.warning("No migration found in %s, creating missing tables", MIGRATIONS_DIR)
+        SQLModel.metadata.create_all(engine)
+        return
+
+    head = migrations[-1]
+    if _is_up_to_date(engine, head):
+        return
+
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+        applied = current_version(conn)
+        if applied == (head["version"], head["fingerprint"]):
+            return
+
+        if applied is None:
+            # Base neuve (ou créée avant les migrations) : création directe du schéma courant
+            version_metadata.create_all(conn)
+            SQLModel.metadata.create_all(conn)
+            _stamp(conn, head)
+            logger.info("Database schema created at version %s", head["version"])
+            return
+
+        version, _ = applied
+        pending = [migration for migration in migrations if migration["version"] > version]
+        if not pending:
+            logger.warning(
+                "Database schema version %s is ahead of the application (%s)", version, head["version"]
+            )
+            return
+
+        # Les tables hors config/entities.txt (authentification) ne sont pas suivies par les migrations
+        SQLModel.metadata.create_all(conn)
+        for migration in pending:
+            for operation in migration["operations"]:
+                _apply(conn, operation, migration["schema"])
+            _stamp(conn, migration)
+            logger.info("Applied migration %s (%s operations)", migration["version"], len(migration["operations"]))
+
+
+def _stamp(conn: Connection, migration: dict) -> None:
+    conn.execute(
+        schema_version.insert().values(
+            version=migration["version"],
+            fingerprint=migration["fingerprint"],
+            applied_at=datetime.utcnow(),
+        )
+    )
+
+
+def _apply(conn: Connection, operation: dict, schema: dict) -> None:
+    """Applique une opération de migration, en construisant les colonnes depuis le schéma de la migration"""
+    op = operation["op"]
+    table = operation["table"]
+    preparer = conn.dialect.identifier_preparer
+    quoted_table = preparer.quote(table)
+
+    if op == "create_table":
+        _build_metadata(schema).tables[table].create(conn, checkfirst=True)
+    elif op == "drop_table":
+        logger.warning("Dropping table %s", table)
+        conn.execute(text(f"DROP TABLE IF EXISTS {quoted_table}"))
+    elif op == "add_column":
+        column = _build_metadata(schema).tables[table].c[operation["column"]]
+        ddl = CreateColumn(column).compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {quoted_table} ADD COLUMN {ddl}"))
+    elif op == "drop_column":
+        logger.warning("Dropping column %s.%s", table, operation["column"])
+        conn.execute(text(f"ALTER TABLE {quoted_table} DROP COLUMN {preparer.quote(operation['column'])}"))
+    elif op == "create_index":
+        index = next(i for i in _build_metadata(schema).tables[table].indexes if i.name == operation["index"])
+        index.create(conn, checkfirst=True)
+    elif op == "drop_index":
+        conn.execute(text(f"DROP INDEX IF EXISTS {preparer.quote(operation['index'])}"))
+    elif op == "alter_column":
+        _alter_column(conn, quoted_table, operation)
+    else:
+        raise ValueError(f"Unknown migration operation: {op}")
+
+
+def _alter_column(conn: Connection, quoted_table: str, operation: dict) -> None:
+    column = conn.dialect.identifier_preparer.quote(operation["column"])
+    before, after = operation["from"], operation["to"]
+    if conn.dialect.name != "postgresql":
+        logger.warning(
+            "Column %s.%s changed but %s cannot alter columns in place, skipping",
+            operation["table"], operation["column"], conn.dialect.name,
+        )
+        return
+
+    if (before["type"], before["max_length"]) != (after["type"], after["max_length"]):
+        sql_type = _sql_type(after).compile(dialect=conn.dialect)
+        conn.execute(text(
+            f"ALTER TABLE {quoted_table} ALTER COLUMN {column} TYPE {sql_type} USING {column}::{sql_type}"
+        ))
+    if before["nullable"] != after["nullable"]:
+        action = "DROP NOT NULL" if after["nullable"] else "SET NOT NULL"
+        conn.execute(text(f"ALTER TABLE {quoted_table} ALTER COLUMN {column} {action}"))
+    if before["unique"] != after["unique"] or before["foreign_key"] != after["foreign_key"]:
+        logger.warning(
+            "Constraint change on %s.%s is not applied automatically", operation["table"], operation["column"]
+        )
+
+
+def _sql_type(definition: dict):
+    if definition["type"] in ("str", "string"):
+        return String(int(definition["max_length"])) if definition["max_length"] else String()
+    return SQL_TYPES.get(definition["type"], Integer)()
+
+
+def _build_column(name: str, definition: dict) -> Column:
+    args = [ForeignKey(definition["foreign_key"])] if definition["foreign_key"] else []
+    return Column(
+        name,
+        _sql_type(definition),
+        *args,
+        primary_key=definition["primary_key"],
+        nullable=definition["nullable"],
+        unique=definition["unique"] or None,
+    )
+
+
+def _build_metadata(schema: dict) -> MetaData:
+    """Tables telles que décrites par le schéma d'une migration (et tables d'authentification, cibles possibles de clés étrangères)"""
+    metadata = MetaData()
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in schema:
+            table.to_metadata(metadata)
+    for name, definition in schema.items():
+        table = Table(name, metadata, *[_build_column(column, spec) for column, spec in definition["columns"].items()])
+        for index_name, spec in definition.get("indexes", {}).items():
+            _build_index(table, index_name, spec)
+    return metadata
+
+
+def _build_index(table: Table, name: str, definition: dict) -> Index:
+    columns = []
+    for column in definition["columns"]:
+        column_name, _, order = column.partition(" ")
+        columns.append(table.c[column_name].desc() if order == "desc" else table.c[column_name])
+    where = {}
+    if definition["where"]:
+        where = {"postgresql_where": text(definition["where"]), "sqlite_where": text(definition["where"])}
+    return Index(name, *columns, **where)
@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Generic, Iterable, List, NamedTuple, Optional, TypeVar
+
+from fastapi import Request, Response
+
+T = TypeVar("T")
+
+
+class Page(NamedTuple, Generic[T]):
+    """Une page de résultats et le curseur opaque de la page suivante (None si dernière page)"""
+
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable dans un curseur : {type(value).__name__}")
+
+
+def encode_cursor(column: str, value: Any, last_id: int) -> str:
+    """Encode la position (colonne de tri, valeur, id) du dernier élément d'une page"""
+    raw = json.dumps({"c": column, "v": value, "id": last_id}, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Optional[Iterable[str]] = None) -> dict:
+    """
+    Décode un curseur produit par encode_cursor. Lève ValueError si le curseur est invalide : champs manquants,
+    id non entier, colonne de tri absente de `columns` (colonnes triables de l'entité, si fournies).
+    La valeur "v" est convertie au type de la colonne par le repository.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    if not isinstance(data, dict) or not {"c", "v", "id"} <= data.keys():
+        raise ValueError("Invalid pagination cursor")
+    if type(data["id"]) is not int or not isinstance(data["c"], str):
+        raise ValueError("Invalid pagination cursor")
+    if columns is not None and data["c"].removeprefix("-") not in columns:
+        raise ValueError("Invalid pagination cursor")
+    return data
+
+
+def set_pagination_headers(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    """Expose le curseur de la page suivante via les en-têtes `Link` (RFC 8288) et `X-Next-Cursor`"""
+    if next_cursor is None:
+        return
+    next_url = request.url.include_query_params(after=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = next_cursor
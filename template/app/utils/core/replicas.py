@@ -0,0 +1,109 @@
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+from fastapi import Request
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session
+from app.utils.core.config import settings
+from app.utils.core.database import create_db_engine, engine
+
+logger = logging.getLogger(__name__)
+
+# Cookie posé après une écriture : les lectures de ce client restent sur la base principale jusqu'à expiration
+PRIMARY_COOKIE = "db_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def replica_urls() -> List[str]:
+    return [url.strip() for url in settings.DB_READ_REPLICA_URLS.split(",") if url.strip()]
+
+
+class ReplicaSet:
+    """
+    Réplicas en lecture parcourus à tour de rôle. Un réplica injoignable est écarté
+    pendant `retry_seconds` puis retenté ; sans réplica sain, les lectures vont sur la base principale.
+    """
+
+    def __init__(self, engines: list, retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until = [0.0] * len(engines)
+        self._turn = itertools.count()
+
+    def candidates(self) -> List[int]:
+        """Index des réplicas sains, en commençant par le suivant dans le tourniquet"""
+        if not self.engines:
+            return []
+        start = next(self._turn) % len(self.engines)
+        now = time.monotonic()
+        order = [(start + offset) % len(self.engines) for offset in range(len(self.engines))]
+        return [index for index in order if self._down_until[index] <= now]
+
+    def mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+
+replicas = ReplicaSet([create_db_engine(url) for url in replica_urls()], settings.DB_REPLICA_RETRY_SECONDS)
+
+
+def sticky_to_primary(request: Request) -> bool:
+    """Vrai si ce client a écrit récemment (fenêtre DB_READ_YOUR_WRITES_SECONDS)"""
+    until = request.cookies.get(PRIMARY_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+@contextmanager
+def open_read_session(prefer_primary: bool = False) -> Iterator[Session]:
+    """Session sur un réplica sain (connexion vérifiée à l'ouverture), ou sur la base principale à défaut"""
+    if not prefer_primary:
+        for index in replicas.candidates():
+            session = Session(replicas.engines[index])
+            try:
+                session.connection()
+            except OperationalError as e:
+                session.close()
+                replicas.mark_down(index)
+                logger.warning("Réplica %s indisponible, écarté %ss : %s", index, replicas.retry_seconds, e)
+                continue
+            with session:
+                yield session
+            return
+
+    with Session(engine) as session:
+        yield session
+
+
+def get_read_db(request: Request):
+    """Dependency to get a read-only database session (replica when available)"""
+    with open_read_session(prefer_primary=sticky_to_primary(request)) as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """
+    Après une écriture réussie (POST, PUT, PATCH, DELETE), pose le cookie `db_primary_until` :
+    pendant DB_READ_YOUR_WRITES_SECONDS, get_read_db lit sur la base principale pour ce client
+    et ne sert donc pas une donnée que le réplica n'a pas encore reçue.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                cookie = f"{PRIMARY_COOKIE}={time.time() + window:.3f}; Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
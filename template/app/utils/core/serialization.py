@@ -0,0 +1,47 @@
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.utils.core.config import settings
+
+
+def _default(value: Any) -> Any:
+    # Types que orjson ne connaît pas : même rendu que pydantic (Decimal en chaîne)
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(data: Any) -> bytes:
+    """JSON compact par orjson (datetime, date et UUID gérés nativement)"""
+    return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class() -> type[JSONResponse]:
+    """Classe de réponse par défaut de l'application : orjson en mode FAST_SERIALIZATION"""
+    return ORJSONResponse if settings.FAST_SERIALIZATION else JSONResponse
+
+
+def all_columns(model) -> Tuple[str, ...]:
+    """Toutes les colonnes de la table, dans l'ordre de déclaration"""
+    return tuple(column.name for column in model.__table__.c)
+
+
+def rows_response(
+    rows: Iterable[Mapping[str, Any]] | Mapping[str, Any],
+    fields: Tuple[str, ...],
+    many: bool = True,
+    headers: Optional[dict] = None,
+) -> Response:
+    """
+    Réponse JSON construite directement depuis les lignes Core (mappings), sans entité ORM
+    ni validation pydantic. Seules les colonnes `fields` sont rendues, dans cet ordre.
+    """
+    if many:
+        data = [{name: row[name] for name in fields} for row in rows]
+    else:
+        data = {name: rows[name] for name in fields}
+    return Response(dumps(data), media_type="application/json", headers=headers)
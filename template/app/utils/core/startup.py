@@ -0,0 +1,84 @@
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
+
+logger = logging.getLogger("app.startup")
+
+
+class StartupReport:
+    """Durées du démarrage par phase (import, metadata, database, app) et par module"""
+
+    def __init__(self):
+        self.timings: list[tuple[str, str, float]] = []
+
+    @contextmanager
+    def measure(self, phase: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((phase, name, time.perf_counter() - start))
+
+    def total(self, phase: str = None) -> float:
+        return sum(seconds for p, _, seconds in self.timings if phase is None or p == phase)
+
+    def log(self, top: int = 20) -> None:
+        """Journalise le total par phase puis les `top` étapes les plus lentes"""
+        phases = dict.fromkeys(phase for phase, _, _ in self.timings)
+        summary = ", ".join(f"{phase} {self.total(phase) * 1000:.1f} ms" for phase in phases)
+        logger.info("Startup %.1f ms (%s)", self.total() * 1000, summary)
+        for phase, name, seconds in sorted(self.timings, key=lambda t: t[2], reverse=True)[:top]:
+            logger.info("  %8.1f ms  %-8s %s", seconds * 1000, phase, name)
+
+
+startup_report = StartupReport()
+
+
+def import_entities(modules: Iterable[str]) -> None:
+    """Importe les entités du registre (enregistrement dans SQLModel.metadata) puis configure les mappers"""
+    for module in modules:
+        with startup_report.measure("import", module):
+            importlib.import_module(module)
+    with startup_report.measure("metadata", "configure_mappers"):
+        configure_mappers()
+
+
+def include_router_module(app: FastAPI, module: str) -> None:
+    """Importe un module de routes et ajoute son `router` à l'application"""
+    with startup_report.measure("import", module):
+        router = importlib.import_module(module).router
+    with startup_report.measure("app", f"include_router {module}"):
+        app.include_router(router)
+    # Le schéma OpenAPI est mis en cache au premier appel : le recalculer avec les nouvelles routes
+    app.openapi_schema = None
+
+
+class LazyRouterMiddleware:
+    """
+    Mode LAZY_ROUTERS : chaque module de routes n'est importé qu'à la première requête sur son préfixe.
+    Les URLs de la documentation chargent tous les modules restants pour exposer un schéma complet.
+    """
+
+    def __init__(self, app, fastapi_app: FastAPI, routers: Iterable[tuple[str, str]]):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.pending = dict(routers)
+        self.docs_paths = {fastapi_app.openapi_url, fastapi_app.docs_url, fastapi_app.redoc_url}
+
+    async def __call__(self, scope, receive, send):
+        if self.pending and scope["type"] in ("http", "websocket"):
+            self._load_for(scope["path"])
+        await self.app(scope, receive, send)
+
+    def _load_for(self, path: str) -> None:
+        load_all = path in self.docs_paths
+        for module, prefix in list(self.pending.items()):
+            if load_all or path == prefix or path.startswith(prefix + "/"):
+                include_router_module(self.fastapi_app, module)
+                del self.pending[module]
+                logger.debug("Lazily loaded router %s", module)
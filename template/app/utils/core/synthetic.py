@@ -0,0 +1,283 @@
+import csv
+import io
+import json
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import insert, text
+from sqlmodel import SQLModel
+
+# Lignes générées (et écrites) d'un seul tenant. Les valeurs d'un lot ne dépendent que de la graine, de la table,
+# de la colonne et du premier id du lot : une même commande produit toujours les mêmes données
+CHUNK_ROWS = 10_000
+
+# Valeurs par défaut quand entities.txt ne borne pas la colonne (.range, .len)
+INT_SPAN = 1_000_000
+FLOAT_SPAN = 1000.0
+# Décimales des flottants : valeurs plus proches des données réelles et rendu CSV / COPY plus court
+FLOAT_SCALE = 10 ** 6
+STRING_LENGTH = 16
+DATETIME_START = datetime(2020, 1, 1)
+DATETIME_SPAN_SECONDS = 5 * 365 * 86400
+
+FILE_FORMATS = ("csv", "ndjson")
+
+
+class SyntheticError(ValueError):
+    """Contraintes impossibles à satisfaire (colonne unique trop étroite, type non pris en charge)"""
+
+
+@dataclass
+class TablePlan:
+    """Lignes à générer pour une entité : ids first_id à first_id + rows - 1"""
+    model: type
+    rows: int
+    first_id: int = 1
+
+    @property
+    def ids(self) -> range:
+        return range(self.first_id, self.first_id + self.rows)
+
+
+# Générateur d'une colonne : (rng, ids du lot) -> une valeur par id
+ColumnGenerator = Callable[[random.Random, range], list]
+
+
+def entity_models() -> dict[str, type]:
+    """Classes des tables enregistrées dans SQLModel.metadata, par nom de table"""
+    models = {}
+    pending = list(SQLModel.__subclasses__())
+    while pending:
+        model = pending.pop()
+        pending += model.__subclasses__()
+        if hasattr(model, "__table__"):
+            models[model.__tablename__] = model
+    return models
+
+
+def dependency_order(models: List[type]) -> List[type]:
+    """
+    Les entités demandées et les entités qu'elles référencent (.fk), parents avant enfants : l'ordre dans
+    lequel les tables doivent être remplies
+    """
+    by_table = entity_models()
+    selected = {model.__tablename__ for model in models}
+    pending = list(selected)
+    while pending:
+        for column in by_table[pending.pop()].__table__.c:
+            for foreign_key in column.foreign_keys:
+                parent = foreign_key.column.table.name
+                if parent not in selected:
+                    selected.add(parent)
+                    pending.append(parent)
+    return [by_table[table.name] for table in SQLModel.metadata.sorted_tables if table.name in selected]
+
+
+def column_generators(plan: TablePlan, parents: dict[str, range], null_ratio: float) -> List[Tuple[str, ColumnGenerator]]:
+    """
+    Un générateur par colonne (hors clé primaire) d'après les contraintes du modèle, donc de entities.txt :
+    type, bornes de `.range` (ge/le), longueur de `.len`, `.unique`, `.nn` (colonne non nullable) et `.fk`
+    (id tiré parmi ceux de l'entité parente, `parents`). Les colonnes nullables valent NULL avec la
+    probabilité `null_ratio`.
+    """
+    model = plan.model
+    generators = []
+    for column in model.__table__.c:
+        if column.primary_key:
+            continue
+        foreign_keys = list(column.foreign_keys)
+        if foreign_keys:
+            generator = _foreign_key(parents[foreign_keys[0].column.table.name])
+        else:
+            generator = _typed(model, column, plan.ids)
+        if column.nullable and null_ratio > 0:
+            generator = _with_nulls(generator, null_ratio)
+        generators.append((column.name, generator))
+    return generators
+
+
+def generate_batches(
+    plan: TablePlan, seed: int, parents: Optional[dict[str, range]] = None, null_ratio: float = 0.0
+) -> Iterator[Tuple[List[str], List[tuple]]]:
+    """
+    Lignes de l'entité par lots de CHUNK_ROWS : (colonnes, lignes en tuples), id en première colonne.
+    Les valeurs sont générées colonne par colonne, chacune avec son propre générateur aléatoire.
+    """
+    generators = column_generators(plan, parents or {}, null_ratio)
+    columns = ["id"] + [name for name, _ in generators]
+    table = plan.model.__tablename__
+    start, end = plan.ids.start, plan.ids.stop
+    while start < end:
+        # Lots alignés sur les multiples de CHUNK_ROWS : un ajout à une table existante garde le même découpage
+        stop = min(end, (start - 1) // CHUNK_ROWS * CHUNK_ROWS + CHUNK_ROWS + 1)
+        ids = range(start, stop)
+        values = [generator(random.Random(f"{seed}:{table}:{name}:{start}"), ids) for name, generator in generators]
+        yield columns, list(zip(ids, *values))
+        start = stop
+
+
+def delete_rows(connection, models: List[type]) -> None:
+    """Vide les tables, enfants avant parents"""
+    for model in reversed(models):
+        connection.execute(model.__table__.delete())
+
+
+def next_id(connection, model) -> int:
+    """Premier id libre de la table : les lignes générées s'ajoutent après les lignes existantes"""
+    table = model.__table__
+    return (connection.execute(text(f'SELECT max(id) FROM "{table.name}"')).scalar() or 0) + 1
+
+
+def insert_rows(connection, model, columns: List[str], rows: List[tuple]) -> None:
+    """INSERT en executemany (un seul aller-retour par lot pour les pilotes qui le permettent)"""
+    connection.execute(insert(model.__table__), [dict(zip(columns, row)) for row in rows])
+
+
+def copy_rows(connection, model, columns: List[str], rows: List[tuple]) -> None:
+    """COPY ... FROM STDIN au format CSV (PostgreSQL avec psycopg2), NULL pour une cellule vide non quotée"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    buffer.seek(0)
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    sql = f'COPY "{model.__tablename__}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+    connection.connection.cursor().copy_expert(sql, buffer)
+
+
+def reset_sequence(connection, model) -> None:
+    """Ids insérés explicitement : sous PostgreSQL, la séquence doit repartir après le dernier"""
+    if connection.dialect.name == "postgresql":
+        table = model.__tablename__
+        connection.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM \"{table}\"))"))
+
+
+def write_file(stream: TextIO, file_format: str, columns: List[str], rows: List[tuple], header: bool) -> None:
+    """Lot écrit en CSV (cellule vide pour NULL, en-tête si `header`) ou en NDJSON, lisible par `python -m app.import`"""
+    if file_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        if header:
+            writer.writerow(columns)
+        writer.writerows(rows)
+        return
+    stream.writelines(json.dumps(dict(zip(columns, row)), default=_json_value) + "\n" for row in rows)
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _python_type(column) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:  # AutoString de SQLModel
+        return str
+
+
+def _bounds(model, name: str) -> Tuple[Optional[float], Optional[float]]:
+    """Bornes ge/le déclarées sur le champ (`.range(min..max)` dans entities.txt), None si absentes"""
+    low = high = None
+    field = model.model_fields.get(name)
+    for constraint in field.metadata if field is not None else ():
+        low = getattr(constraint, "ge", low)
+        high = getattr(constraint, "le", high)
+    return low, high
+
+
+def _span(low: Optional[float], high: Optional[float], default: float) -> Tuple[float, float]:
+    """Intervalle de tirage : les bornes déclarées, complétées par `default` de part et d'autre"""
+    if low is None and high is None:
+        return 0, default
+    if low is None:
+        return high - default, high
+    if high is None:
+        return low, low + default
+    return low, high
+
+
+def _typed(model, column, ids: range) -> ColumnGenerator:
+    name = f"{model.__tablename__}.{column.name}"
+    kind = _python_type(column)
+    low, high = _bounds(model, column.name)
+    if column.unique:
+        return _unique(name, kind, low, high, getattr(column.type, "length", None), ids)
+
+    # rng.random() plutôt que randint / uniform / randrange : plusieurs fois plus rapide par valeur
+    if kind is bool:
+        return lambda rng, ids: [rng.random() < 0.5 for _ in ids]
+    if kind is int:
+        low, high = _span(low, high, INT_SPAN)
+        low, width = math.ceil(low), math.floor(high) - math.ceil(low) + 1
+        return lambda rng, ids: [low + int(rng.random() * width) for _ in ids]
+    if kind is float:
+        low, high = _span(low, high, FLOAT_SPAN)
+        width = (high - low) * FLOAT_SCALE
+        return lambda rng, ids: [low + int(rng.random() * width) / FLOAT_SCALE for _ in ids]
+    if kind is datetime:
+        return lambda rng, ids: [
+            DATETIME_START + timedelta(seconds=int(rng.random() * DATETIME_SPAN_SECONDS)) for _ in ids
+        ]
+    if kind is date:
+        days = DATETIME_SPAN_SECONDS // 86400
+        return lambda rng, ids: [DATETIME_START.date() + timedelta(days=int(rng.random() * days)) for _ in ids]
+    if kind is str:
+        length = getattr(column.type, "length", None) or STRING_LENGTH
+        return lambda rng, ids: ["%0*x" % (length, rng.getrandbits(4 * length)) for _ in ids]
+    if column.nullable:
+        return lambda rng, ids: [None] * len(ids)
+    raise SyntheticError(f"Column {name} of type {kind.__name__} is not supported")
+
+
+def _unique(name: str, kind: type, low: Optional[float], high: Optional[float], length: Optional[int], ids: range) -> ColumnGenerator:
+    """
+    Valeurs distinctes dérivées de l'id : la n-ième ligne de la table prend la n-ième valeur de l'intervalle, depuis
+    la borne basse (ou haute si seule celle-ci est déclarée). Erreur si l'intervalle ne contient pas assez de valeurs.
+    """
+    last = ids.stop - 1
+    # `.range(, max)` : valeurs depuis max en descendant, sans passer sous 0 (ni sous max moins l'étendue par défaut
+    # si max est négatif) : le nombre de lignes possibles est borné comme avec deux bornes
+    descending = low is None and high is not None
+    if kind is int:
+        low = math.ceil(low) if low is not None else None
+        high = math.floor(high) if high is not None else None
+        if descending:
+            low = 0 if high >= 0 else high - INT_SPAN
+        if high is not None and last > high - low + 1:
+            raise SyntheticError(f"Column {name} is unique in [{low}, {high}], cannot hold {last} rows")
+        if descending:
+            return lambda rng, ids: [high - id + 1 for id in ids]
+        start = low if low is not None else 1
+        return lambda rng, ids: [start + id - 1 for id in ids]
+    if kind is float:
+        if descending:
+            low = 0.0 if high >= 0 else high - FLOAT_SPAN
+        # Pas fixe (une décimale de FLOAT_SCALE) : la valeur d'un id ne dépend pas du nombre de lignes générées
+        if high is not None and last > (high - low) * FLOAT_SCALE + 1:
+            raise SyntheticError(f"Column {name} is unique in [{low}, {high}], cannot hold {last} rows")
+        if descending:
+            return lambda rng, ids: [high - (id - 1) / FLOAT_SCALE for id in ids]
+        start = low if low is not None else 0.0
+        return lambda rng, ids: [start + (id - 1) / FLOAT_SCALE for id in ids]
+    if kind is datetime:
+        return lambda rng, ids: [DATETIME_START + timedelta(seconds=id) for id in ids]
+    if kind is date:
+        return lambda rng, ids: [DATETIME_START.date() + timedelta(days=id) for id in ids]
+    if kind is str:
+        width = min(length or STRING_LENGTH, STRING_LENGTH)
+        if last >= 16 ** width:
+            raise SyntheticError(f"Column {name} is unique with {width} characters, cannot hold {last} rows")
+        return lambda rng, ids: ["%0*x" % (width, id) for id in ids]
+    raise SyntheticError(f"Column {name} is unique and of type {kind.__name__}, which is not supported")
+
+
+def _foreign_key(parent_ids: range) -> ColumnGenerator:
+    return lambda rng, ids: [parent_ids[int(rng.random() * len(parent_ids))] for _ in ids]
+
+
+def _with_nulls(generator: ColumnGenerator, ratio: float) -> ColumnGenerator:
+    def generate(rng: random.Random, ids: range) -> list:
+        return [None if rng.random() < ratio else value for value in generator(rng, ids)]
+    return generate
@@ -0,0 +1,76 @@
+"""
+Mesure l'impact d'une rafale de connexions sur le reste de l'API.
+
+Lance `--logins` clients qui enchaînent POST /auth/login pendant `--duration` secondes, et en parallèle
+un client qui interroge `--probe` en continu. Affiche le débit de connexions (logins/s) et la latence
+p50/p99 de la route sonde : si le hachage Argon2 bloque la boucle d'événements, la p99 explose.
+
+    uv run python benchmarks/bench_login.py --url http://127.0.0.1:8000 --logins 16 --duration 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))]
+
+
+async def login_worker(client: httpx.AsyncClient, args, deadline: float, counters: dict) -> None:
+    data = {"username": args.email, "password": args.password}
+    while time.perf_counter() < deadline:
+        response = await client.post("/auth/login", data=data)
+        counters["ok" if response.status_code == 200 else "failed"] += 1
+
+
+async def probe_worker(client: httpx.AsyncClient, path: str, deadline: float, latencies: list[float]) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def run(args) -> None:
+    counters = {"ok": 0, "failed": 0}
+    baseline: list[float] = []
+    under_load: list[float] = []
+    limits = httpx.Limits(max_connections=args.logins + 2)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        # Latence de référence sans connexions concurrentes
+        await probe_worker(client, args.probe, time.perf_counter() + 2, baseline)
+
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            probe_worker(client, args.probe, deadline, under_load),
+            *(login_worker(client, args, deadline, counters) for _ in range(args.logins)),
+        )
+
+    print(f"Connexions : {counters['ok']} réussies, {counters['failed']} échouées")
+    print(f"Débit      : {counters['ok'] / args.duration:.1f} logins/s")
+    for label, latencies in (("Sans charge", baseline), ("Sous charge", under_load)):
+        print(
+            f"{label:<11}: {args.probe} p50={statistics.median(latencies or [0]):.1f} ms "
+            f"p99={percentile(latencies, 0.99):.1f} ms ({len(latencies)} requêtes)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--logins", type=int, default=16, help="Clients de connexion concurrents")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de la rafale en secondes")
+    parser.add_argument("--probe", default="/health", help="Route dont on mesure la latence pendant la rafale")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare le rendu JSON d'une liste d'entités par le chemin historique et par le chemin rapide (FAST_SERIALIZATION).
+
+- ORM + pydantic : entités hydratées par la session, validées par le response_model puis json.dumps (FastAPI)
+- Core + orjson  : lignes Core (mappings) rendues directement par orjson, sans identity map ni validation
+
+Remplit une base SQLite temporaire avec `--rows` lignes synthétiques, mesure la médiane de `--repeat` passes
+pour chaque chemin, vérifie que les deux corps JSON sont équivalents puis affiche le gain de la compression.
+
+    uv run python benchmarks/bench_serialization.py --model app.entities.tle:TLE --rows 10000
+"""
+import argparse
+import gzip
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Racine du projet importable (app.*) quand le script est lancé par `python benchmarks/...`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlmodel import Session, SQLModel
+
+from app.registry import ENTITY_MODULES
+from app.utils.core.compression import brotli
+from app.utils.core.serialization import all_columns, rows_response
+from app.utils.core.startup import import_entities
+from app.utils.core.synthetic import TablePlan, generate_batches, insert_rows
+
+
+def load_model(path: str):
+    # Toutes les entités du registre : les tables visées par les clés étrangères du modèle doivent être connues
+    import_entities(ENTITY_MODULES)
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def orm_path(engine, model) -> bytes:
+    """Chemin historique : ce que fait FastAPI pour `return page.items` avec response_model=list[Model]"""
+    adapter = TypeAdapter(list[model])
+    with Session(engine) as session:
+        items = session.exec(select(model)).scalars().all()
+        content = [item.model_dump() for item in items]
+    data = adapter.dump_python(adapter.validate_python(content), mode="json")
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def core_path(engine, model) -> bytes:
+    """Chemin rapide : SELECT des colonnes en Core, lignes rendues par orjson"""
+    table = model.__table__
+    columns = all_columns(model)
+    with engine.connect() as connection:
+        rows = connection.execute(select(*table.c)).mappings().all()
+    return rows_response(rows, columns).body
+
+
+def measure(function, repeat: int) -> tuple[float, bytes]:
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), body
+
+
+def compress(body: bytes, level: int) -> list[tuple[str, int, float]]:
+    results = []
+    start = time.perf_counter()
+    results.append(("gzip", len(gzip.compress(body, compresslevel=level)), time.perf_counter() - start))
+    if brotli is not None:
+        start = time.perf_counter()
+        results.append(("br", len(brotli.compress(body, quality=min(level, 9))), time.perf_counter() - start))
+    return results
+
+
+def run(args) -> None:
+    model = load_model(args.model)
+    table = model.__table__
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        SQLModel.metadata.create_all(engine, tables=[table])
+        # Table seule : ses clés étrangères désignent des ids 1..rows, non vérifiés par SQLite
+        parents = {key.column.table.name: range(1, args.rows + 1) for column in table.c for key in column.foreign_keys}
+        with engine.begin() as connection:
+            for columns, rows in generate_batches(TablePlan(model, args.rows), 0, parents):
+                insert_rows(connection, model, columns, rows)
+
+        orm_ms, orm_body = measure(lambda: orm_path(engine, model), args.repeat)
+        core_ms, core_body = measure(lambda: core_path(engine, model), args.repeat)
+        engine.dispose()
+
+    same = json.loads(orm_body) == json.loads(core_body)
+    print(f"{args.rows} lignes {model.__name__}, médiane sur {args.repeat} passes")
+    print(f"ORM + pydantic : {orm_ms:8.1f} ms  {len(orm_body) / 1024:8.1f} ko")
+    print(f"Core + orjson  : {core_ms:8.1f} ms  {len(core_body) / 1024:8.1f} ko  (x{orm_ms / core_ms:.1f})")
+    print(f"Corps JSON     : {'identiques' if same else 'DIFFÉRENTS'}")
+    for name, size, seconds in compress(core_body, args.level):
+        print(f"{name:<15}: {size / 1024:8.1f} ko ({size / len(core_body):.0%}) en {seconds * 1000:.1f} ms")
+    if brotli is None:
+        print("br             : paquet brotli absent (uv add brotli)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="app.entities.tle:TLE", help="Entité à mesurer (module:Classe)")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--level", type=int, default=6, help="Niveau de compression (COMPRESSION_LEVEL)")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
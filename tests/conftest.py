@@ -0,0 +1,113 @@
+"""
+Fixtures communes : un projet généré dans un dossier temporaire à partir de TEST_ENTITIES, puis l'application
+de ce projet servie par TestClient sur une base SQLite.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from InitFastAPIProject import (  # noqa: E402
+    build_schema_snapshot,
+    copy_base_template,
+    create_custom_entities,
+    create_env_config,
+    create_registry,
+    create_roles,
+)
+from migrations import copy_migrations, create_migration  # noqa: E402
+from utils import parse_entities  # noqa: E402
+
+# Schéma figé (celui de config/entities.txt à l'origine) : les tests ne dépendent pas de la configuration locale
+TEST_ENTITIES = """\
+TLE .r any .w Operator,Admin .cache(60)
+- nom str .len(24)
+- norad int .unique .range(, 99999) .nn
+- classification str .len(1)
+- epoch datetime .index
+- excentricite float .range(0,1)
+- type_element int .range(0, 9)
+- ligne1 str .len(69) .nn
+- ligne2 str .len(69) .nn
+- updated_at datetime
+.index(classification, epoch desc)
+"""
+
+ADMIN_EMAIL = "admin@example.com"
+ADMIN_PASSWORD = "admin123"
+
+
+def generate_project(path: str, text: str = TEST_ENTITIES, async_mode: bool = False) -> str:
+    """Génère le projet de `text` dans `path` (sans passer par generated/ ni migrations/ du dépôt)"""
+    entities = parse_entities(text)
+    migrations_dir = os.path.join(os.path.dirname(path), "migrations")
+    previous = os.getcwd()
+    # config/roles.txt est lu depuis le dossier courant
+    os.chdir(ROOT)
+    try:
+        copy_base_template(path)
+        create_env_config(path)
+        create_custom_entities(path, async_mode, entities)
+        create_registry(path, async_mode)
+        create_migration(build_schema_snapshot(entities), migrations_dir)
+        copy_migrations(path, migrations_dir)
+        create_roles(path)
+    finally:
+        os.chdir(previous)
+    return path
+
+
+@pytest.fixture(scope="session")
+def project(tmp_path_factory) -> str:
+    return generate_project(str(tmp_path_factory.mktemp("sync") / "generated"))
+
+
+@pytest.fixture(scope="session")
+def client(project, tmp_path_factory):
+    """
+    Application du projet généré, base SQLite neuve. Le paquet `app` n'est importable qu'une fois par processus :
+    tous les tests d'API partagent ce projet.
+    """
+    from fastapi.testclient import TestClient
+
+    previous = os.getcwd()
+    # .env est lu depuis le dossier courant
+    os.chdir(project)
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    sys.path.insert(0, project)
+    try:
+        from app.main import app
+
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        os.chdir(previous)
+
+
+@pytest.fixture(scope="session")
+def admin(client) -> dict:
+    """En-têtes d'authentification de l'admin du seed, rôle actif Admin (écriture sur toutes les entités)"""
+    from sqlmodel import Session, select
+
+    from app.entities.auth.role import Role
+    from app.entities.auth.user import User
+    from app.utils.core.database import engine
+
+    with Session(engine) as session:
+        roles = session.exec(select(Role)).all()
+        user = session.exec(select(User).where(User.email == ADMIN_EMAIL)).one()
+        user.roles_ids = [role.id for role in roles]
+        user.active_role = next(role.id for role in roles if role.name == "Admin")
+        session.add(user)
+        session.commit()
+    response = client.post("/auth/login", data={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def tle(norad: int, **values) -> dict:
+    """Corps d'un TLE valide ; `norad` sert de clé naturelle, distincte d'un test à l'autre"""
+    return {"norad": norad, "ligne1": f"1 {norad:05d}U", "ligne2": f"2 {norad:05d}", **values}
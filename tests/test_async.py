@@ -0,0 +1,66 @@
+"""
+Projet généré avec --async : authentification, connexion et pool asynchrones. Le paquet `app` du projet synchrone
+est déjà importé par les autres tests, l'application asynchrone tourne donc dans un sous-processus.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ADMIN_EMAIL, ADMIN_PASSWORD, generate_project
+
+pytest.importorskip("aiosqlite")
+
+SCRIPT = """
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+
+with TestClient(app) as client:
+    login = client.post("/auth/login", data={"username": %(email)r, "password": %(password)r})
+    headers = {"Authorization": "Bearer " + login.json()["access_token"]}
+    listing = client.get("/tles/", headers=headers)
+    anonymous = client.get("/tles/")
+    pool = client.get("/health/pool").json()
+    metrics = client.get("/metrics").text
+print(json.dumps({
+    "login": login.status_code,
+    "listing": listing.status_code,
+    "anonymous": anonymous.status_code,
+    "pool": pool,
+    "metrics": [line for line in metrics.splitlines() if line.startswith("db_pool_connections")],
+}))
+"""
+
+
+@pytest.fixture(scope="module")
+def async_project(tmp_path_factory) -> str:
+    return generate_project(str(tmp_path_factory.mktemp("async") / "generated"), async_mode=True)
+
+
+def test_async_routes_use_async_auth(async_project):
+    with open(os.path.join(async_project, "app", "routers", "tle.py"), encoding="utf-8") as f:
+        router = f.read()
+    assert "from app.utils.auth.async_roles import require_role" in router
+    with open(os.path.join(async_project, "app", "registry.py"), encoding="utf-8") as f:
+        assert "ASYNC_MODE = True" in f.read()
+
+
+def test_async_login_and_pool(async_project, tmp_path):
+    environment = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'async.db'}")
+    completed = subprocess.run(
+        [sys.executable, "-c", SCRIPT % {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}],
+        cwd=async_project, env=environment, capture_output=True, text=True, timeout=300,
+    )
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout.splitlines()[-1])
+
+    assert result["login"] == 200
+    assert result["listing"] == 200
+    assert result["anonymous"] == 401
+    assert {"size", "checked_out", "checkout_wait_count"} <= set(result["pool"]["async"])
+    # Connexion et lecture par le pool asynchrone : au moins un emprunt mesuré
+    assert result["pool"]["async"]["checkout_wait_count"] > 0
+    assert any('pool="async"' in line for line in result["metrics"])
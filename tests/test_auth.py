@@ -0,0 +1,111 @@
+"""Authentification : vérification Argon2 hors de la boucle, rehash à la connexion, cache des utilisateurs authentifiés"""
+from conftest import tle
+
+EMAIL = "principal@example.com"
+PASSWORD = "principal123"
+
+
+def _create_user(roles: dict) -> int:
+    from sqlmodel import Session
+
+    from app.entities.auth.user import User
+    from app.utils.auth.auth import get_password_hash
+    from app.utils.core.database import engine
+
+    with Session(engine) as session:
+        user = User(
+            email=EMAIL, hashed_password=get_password_hash(PASSWORD),
+            roles_ids=[roles["User"], roles["Admin"]], active_role=roles["Admin"],
+        )
+        session.add(user)
+        session.commit()
+        return user.id
+
+
+def _set_active_role_behind_cache(user_id: int, role_id: int) -> None:
+    """Modification directe en base, sans passer par UserRepository : le cache n'est pas invalidé"""
+    from sqlalchemy import update
+    from sqlmodel import Session
+
+    from app.entities.auth.user import User
+    from app.utils.core.database import engine
+
+    with Session(engine) as session:
+        session.execute(update(User).where(User.id == user_id).values(active_role=role_id))
+        session.commit()
+
+
+def test_role_change_invalidates_principal_cache(client):
+    from sqlmodel import Session, select
+
+    from app.entities.auth.role import Role
+    from app.entities.auth.user import User
+    from app.repositories.auth.user_repository import UserRepository
+    from app.utils.core.database import engine
+
+    with Session(engine) as session:
+        roles = {role.name: role.id for role in session.exec(select(Role)).all()}
+    user_id = _create_user(roles)
+    response = client.post("/auth/login", data={"username": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    token = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    assert client.get("/users/me", headers=token).json()["active_role"] == roles["Admin"]
+    assert client.post("/tles/", json=tle(15300), headers=token).status_code == 201
+
+    # L'utilisateur est servi depuis le cache : une modification hors repository n'est pas vue
+    _set_active_role_behind_cache(user_id, roles["User"])
+    assert client.get("/users/me", headers=token).json()["active_role"] == roles["Admin"]
+    _set_active_role_behind_cache(user_id, roles["Admin"])
+
+    # Rôle changé par UserRepository depuis une autre session : les entrées de l'utilisateur sont invalidées
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        user.active_role = roles["User"]
+        UserRepository().save(session, user)
+    assert client.get("/users/me", headers=token).json()["active_role"] == roles["User"]
+    assert client.post("/tles/", json=tle(15301), headers=token).status_code == 403
+
+    assert client.post(f"/users/switch-role/{roles['Operator']}", headers=token).status_code == 403
+    switched = client.post(f"/users/switch-role/{roles['Admin']}", headers=token)
+    assert switched.status_code == 200, switched.text
+    new_token = {"Authorization": f"Bearer {switched.json()['access_token']}"}
+    assert client.post("/tles/", json=tle(15301), headers=new_token).status_code == 201
+
+
+def test_login_verifies_in_argon2_pool_and_rehashes(client, monkeypatch):
+    import threading
+
+    from passlib.context import CryptContext
+    from sqlmodel import Session
+
+    import app.utils.auth.auth as auth
+    from app.entities.auth.user import User
+    from app.utils.core.database import engine
+
+    # Hash calculé avec d'autres paramètres Argon2 que ceux de Settings
+    legacy = CryptContext(schemes=["argon2"], argon2__time_cost=auth.settings.ARGON2_TIME_COST + 1)
+    with Session(engine) as session:
+        user = User(email="argon2@example.com", hashed_password=legacy.hash(PASSWORD))
+        session.add(user)
+        session.commit()
+        user_id = user.id
+
+    threads, context = [], auth.pwd_context
+
+    class RecordingContext:
+        def verify_and_update(self, *args):
+            threads.append(threading.current_thread().name)
+            return context.verify_and_update(*args)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(auth, "pwd_context", RecordingContext())
+        assert client.post("/auth/login", data={"username": "argon2@example.com", "password": "wrong"}).status_code == 401
+    assert threads and all(name.startswith("argon2") for name in threads)
+
+    response = client.post("/auth/login", data={"username": "argon2@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    with Session(engine) as session:
+        stored = session.get(User, user_id).hashed_password
+    assert f"t={auth.settings.ARGON2_TIME_COST}" in stored
+    assert not auth.pwd_context.needs_update(stored)
@@ -0,0 +1,74 @@
+"""Banc de charge de l'API (benchmarks/bench_api.py) : scénarios par route, mesures et comparaison de runs"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def bench(project, client):
+    spec = importlib.util.spec_from_file_location("bench_api", os.path.join(project, "benchmarks", "bench_api.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def options(**values) -> argparse.Namespace:
+    defaults = dict(rows=20, requests=6, login_requests=2, concurrency=3, bulk_size=2, warmup=1, url=None)
+    return argparse.Namespace(**{**defaults, **values})
+
+
+def test_percentile(bench):
+    assert bench.percentile([], 0.5) == 0.0
+    values = [float(value) for value in range(1, 101)]
+    assert (bench.percentile(values, 0.5), bench.percentile(values, 0.99), bench.percentile(values, 1.0)) == (51.0, 100.0, 100.0)
+
+
+def test_scenarios_cover_routes(bench):
+    from app.entities.tle import TLE
+    from app.main import app
+
+    models = bench.entity_models()
+    assert models == [TLE]
+    scenarios, skipped = bench.build_scenarios(app, models, options(), "admin@example.com")
+    names = [scenario.name for scenario in scenarios]
+    for name in ("GET /tles/", "GET /tles/{id}", "POST /tles/bulk", "PUT /tles/by-norad/{value}", "POST /auth/login"):
+        assert name in names
+    # Lectures d'abord, suppressions en dernier
+    assert names.index("GET /tles/") < names.index("POST /tles/")
+    assert names[-2:] == ["DELETE /tles/{id}", "DELETE /tles/bulk"]
+    assert any(route.startswith("POST /users/switch-role/{role_id}") for route in skipped)
+
+    upsert = next(scenario for scenario in scenarios if scenario.name == "PUT /tles/by-norad/{value}").build(0)
+    assert upsert["url"] == f"/tles/by-norad/{upsert['json']['norad']}"
+
+
+def test_run_scenario_and_compare(bench, admin, tmp_path, capsys):
+    import httpx
+
+    from app.main import app
+    from app.utils.core.database import engine
+
+    counter = bench.QueryCounter()
+    counter.attach(engine)
+    scenario = bench.Scenario("GET /tles/", 6, lambda i: {"method": "GET", "url": "/tles/", "params": {"limit": 1 + i}}, warmup=1)
+
+    async def measure():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(base_url="http://bench", transport=transport, headers=admin) as client:
+            return await bench.run_scenario(client, scenario, options(), counter)
+
+    result = asyncio.run(measure())
+    assert (result["requests"], result["errors"], result["statuses"]) == (6, 0, {"200": 6})
+    assert 0 < result["latency_ms"]["p50"] <= result["latency_ms"]["p99"] <= result["latency_ms"]["max"]
+    assert result["queries_per_request"] > 0
+
+    previous = tmp_path / "before.json"
+    slower = {**result, "requests_per_second": result["requests_per_second"] / 2}
+    previous.write_text(json.dumps({"label": "avant", "generated_at": "", "results": [slower]}))
+    bench.compare([result, {**result, "route": "GET /new"}], str(previous))
+    output = capsys.readouterr().out
+    assert "avant" in output and "+100%" in output and "nouvelle route" in output
@@ -0,0 +1,40 @@
+from conftest import tle
+
+NORADS = range(11000, 11010)
+
+
+def statuses(response) -> list[str]:
+    assert response.status_code == 200, response.text
+    return [result["status"] for result in response.json()["results"]]
+
+
+def test_bulk_create_reports_each_item(client, admin):
+    items = [tle(norad) for norad in NORADS] + [tle(99999 + 1), {"norad": 11999}]
+    response = client.post("/tles/bulk", json=items, headers=admin)
+    assert statuses(response) == ["created"] * len(NORADS) + ["error", "error"]
+
+
+def test_bulk_partial_update(client, admin):
+    rows = client.get(f"/tles/?norad__gte={NORADS.start}&norad__lte={NORADS.stop - 1}", headers=admin).json()
+    ids = [row["id"] for row in rows[:3]]
+    items = [
+        {"id": ids[0], "nom": "PARTIEL"},
+        {"id": ids[1], "classification": "S", "type_element": 4},
+        {"nom": "sans id"},
+        {"id": ids[2], "type_element": 42},
+        {"id": 10 ** 9, "nom": "inconnu"},
+    ]
+    response = client.put("/tles/bulk", json=items, headers=admin)
+    assert statuses(response) == ["updated", "updated", "error", "error", "error"]
+
+    first, second = (client.get(f"/tles/{id}", headers=admin).json() for id in ids[:2])
+    assert first["nom"] == "PARTIEL" and first["norad"] == rows[0]["norad"] and first["ligne1"] == rows[0]["ligne1"]
+    assert (second["classification"], second["type_element"]) == ("S", 4)
+    assert second["ligne2"] == rows[1]["ligne2"]
+
+
+def test_bulk_delete_unknown_id(client, admin):
+    rows = client.get(f"/tles/?norad__gte={NORADS.start}&norad__lte={NORADS.stop - 1}", headers=admin).json()
+    response = client.request("DELETE", "/tles/bulk", json=[rows[-1]["id"], 10 ** 9], headers=admin)
+    assert statuses(response) == ["deleted", "error"]
+    assert client.get(f"/tles/{rows[-1]['id']}", headers=admin).status_code == 404
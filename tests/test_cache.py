@@ -0,0 +1,65 @@
+"""Cache des lectures : TTL et LRU, backend interchangeable, invalidation à l'écriture"""
+import time
+
+import pytest
+
+from conftest import tle
+
+
+def test_ttl_cache(client):
+    from app.utils.core.cache import TTLCache
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b", le moins récemment lu, est évincé
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+
+
+def test_backend_interface(client):
+    from app.utils.core.cache import CacheBackend
+
+    class Partial(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_write_through_invalidation(client, admin):
+    from sqlalchemy import update
+    from sqlmodel import Session
+
+    from app.entities.tle import TLE
+    from app.utils.core.cache import MemoryBackend, cache_stats, set_cache_backend
+    from app.utils.core.database import engine
+
+    backend = MemoryBackend()
+    set_cache_backend(backend)
+    try:
+        created = client.post("/tles/", json=tle(15700, nom="A"), headers=admin).json()
+        url = f"/tles/{created['id']}"
+        hits = cache_stats["tle"][0]
+        assert client.get(url, headers=admin).json()["nom"] == "A"
+        assert client.get(url, headers=admin).json()["nom"] == "A"
+        assert cache_stats["tle"][0] > hits
+
+        # Modification hors repository : la lecture reste servie par le cache
+        with Session(engine) as session:
+            session.execute(update(TLE).where(TLE.id == created["id"]).values(nom="B"))
+            session.commit()
+        assert client.get(url, headers=admin).json()["nom"] == "A"
+
+        # Écriture par l'API : nouvelle génération, les entrées précédentes ne sont plus lues
+        generation = backend.counter("tle:generation")
+        assert client.patch(url, json={"nom": "C"}, headers=admin).status_code == 200
+        assert backend.counter("tle:generation") > generation
+        assert client.get(url, headers=admin).json()["nom"] == "C"
+        assert 'repository_cache_requests_total{table="tle",result="hit"}' in client.get("/metrics").text
+    finally:
+        set_cache_backend(None)
@@ -0,0 +1,74 @@
+"""Requêtes conditionnelles : ETag de liste, revalidation 304 et écritures If-Match (412)"""
+from conftest import tle
+
+NORADS = range(12000, 12005)
+SCOPE = {"norad__gte": NORADS[0], "norad__lte": NORADS[-1]}
+
+
+def _create(client, admin, norad: int) -> dict:
+    response = client.post("/tles/", json=tle(norad), headers=admin)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_list_revalidation(client, admin):
+    for norad in NORADS[:3]:
+        _create(client, admin, norad)
+
+    first = client.get("/tles/", params=SCOPE, headers=admin)
+    assert first.status_code == 200
+    assert "Last-Modified" in first.headers
+
+    # Validateurs de la réponse 200 identiques à ceux de la sonde : la première revalidation donne un 304
+    second = client.get("/tles/", params=SCOPE, headers={**admin, "If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.headers["ETag"] == first.headers["ETag"]
+    since = client.get("/tles/", params=SCOPE, headers={**admin, "If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    _create(client, admin, NORADS[3])
+    changed = client.get("/tles/", params=SCOPE, headers={**admin, "If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 4
+
+
+def test_item_probe_only_on_revalidation(client, admin, monkeypatch):
+    import app.routers.tle as router
+
+    created = _create(client, admin, NORADS[4] + 100)
+    url = f"/tles/{created['id']}"
+
+    def probe(*args, **kwargs):
+        raise AssertionError("row_version called without a conditional header")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(router.repo, "row_version", probe)
+        plain = client.get(url, headers=admin)
+        sparse = client.get(url, params={"fields": "nom"}, headers=admin)
+    assert plain.status_code == 200
+    assert sparse.json() == {"nom": None}
+    assert sparse.headers["ETag"] != plain.headers["ETag"]
+
+    assert client.get(url, headers={**admin, "If-None-Match": plain.headers["ETag"]}).status_code == 304
+    revalidated = client.get(url, params={"fields": "nom"}, headers={**admin, "If-None-Match": sparse.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_item_if_match(client, admin):
+    created = _create(client, admin, NORADS[4])
+    url = f"/tles/{created['id']}"
+    etag = client.get(url, headers=admin).headers["ETag"]
+    assert client.get(url, headers={**admin, "If-None-Match": etag}).status_code == 304
+
+    stale = {**admin, "If-Match": '"stale"'}
+    assert client.put(url, json=tle(NORADS[4], nom="A"), headers=stale).status_code == 412
+    assert client.patch(url, json={"nom": "A"}, headers=stale).status_code == 412
+    assert client.delete(url, headers=stale).status_code == 412
+
+    patched = client.patch(url, json={"nom": "B"}, headers={**admin, "If-Match": etag})
+    assert patched.status_code == 200
+    assert patched.json()["nom"] == "B"
+    # L'ETag précédent ne correspond plus à l'élément modifié
+    assert client.delete(url, headers={**admin, "If-Match": etag}).status_code == 412
+    assert client.delete(url, headers={**admin, "If-Match": patched.headers["ETag"]}).status_code == 204
+    assert client.delete(f"/tles/{created['id'] + 10**6}", headers=admin).status_code == 404
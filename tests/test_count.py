@@ -0,0 +1,52 @@
+"""Comptage des lignes : modes exact, cached et estimate, comptage filtré toujours exact"""
+import pytest
+
+from conftest import tle
+
+NORADS = range(15100, 15110)
+
+
+def _insert_behind_cache(norad: int) -> None:
+    """Ligne écrite sans passer par le repository : le comptage en cache n'est pas invalidé"""
+    from sqlalchemy import insert
+    from sqlmodel import Session
+
+    from app.entities.tle import TLE
+    from app.utils.core.database import engine
+
+    with Session(engine) as session:
+        session.execute(insert(TLE.__table__).values(**tle(norad)))
+        session.commit()
+
+
+def test_count_modes(client, admin, monkeypatch):
+    from sqlmodel import Session
+
+    import app.routers.tle as router
+    from app.utils.core.database import engine
+
+    repo = router.repo
+    with Session(engine) as db:
+        with pytest.raises(ValueError):
+            repo.count(db, mode="approximate")
+
+        exact = repo.count(db, mode="exact")
+        assert repo.count(db, mode="cached") == exact
+
+        # Mode cached : la ligne écrite en dehors du repository n'apparaît qu'à l'invalidation suivante
+        _insert_behind_cache(NORADS[0])
+        assert repo.count(db, mode="exact") == exact + 1
+        assert repo.count(db, mode="cached") == exact
+        scope = {"norad__gte": NORADS[0], "norad__lte": NORADS[-1]}
+        assert repo.count(db, mode="cached", filters=scope) == 1
+
+        assert client.post("/tles/", json=tle(NORADS[1]), headers=admin).status_code == 201
+        assert repo.count(db, mode="cached") == exact + 2
+
+        # Mode estimate : pas d'estimation sous SQLite, comptage en cache ; estimation retenue au-delà du seuil
+        assert repo.count(db, mode="estimate") == exact + 2
+        monkeypatch.setattr(repo, "_estimated_count", lambda db: 10**9)
+        assert repo.count(db, mode="estimate") == 10**9
+        assert repo.count(db, mode="estimate", filters=scope) == 2
+        monkeypatch.setattr(repo, "_estimated_count", lambda db: 3)
+        assert repo.count(db, mode="estimate") == exact + 2
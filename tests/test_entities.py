@@ -0,0 +1,61 @@
+"""Analyse de entities.txt : représentation intermédiaire et positions (ligne:colonne) des erreurs"""
+import pytest
+
+from conftest import TEST_ENTITIES
+from utils import EntitiesSyntaxError, parse_entities
+
+
+def errors_of(text: str) -> list:
+    with pytest.raises(EntitiesSyntaxError) as info:
+        parse_entities(text, "entities.txt")
+    return info.value.errors
+
+
+def test_parse_test_schema():
+    tle = parse_entities(TEST_ENTITIES)["TLE"]
+    assert tle.read_roles == ["any"]
+    assert tle.write_roles == ["Operator", "Admin"]
+    assert tle.cache_ttl == 60
+    norad = tle.attribute("norad")
+    assert (norad.unique, norad.not_null, norad.range_min, norad.range_max) == (True, True, None, "99999")
+    assert tle.attribute("ligne1").max_length == 69
+    assert tle.attribute("epoch").index
+    assert [index.columns for index in tle.indexes] == [["classification", "epoch desc"]]
+
+
+def test_error_positions():
+    text = "\n".join([
+        "- orphan int",           # 1 : attribut avant toute entité
+        "A .w",                   # 2 : .w sans rôles
+        "- x int .range(0, 1",    # 3 : parenthèse non fermée
+        "- id int",               # 4 : id réservé
+        "  - x int",              # 5 : valide, indenté
+        "  - x str",              # 6 : doublon, colonne décalée de l'indentation
+        "B",
+        "B",                      # 8 : entité déjà définie
+    ])
+    errors = errors_of(text)
+    assert [(line, column) for line, column, _ in errors] == [(1, 1), (2, 3), (3, 15), (4, 3), (6, 5), (8, 1)]
+    assert "déjà défini pour A" in errors[4][2]
+    assert "ligne 7" in errors[5][2]
+    assert str(EntitiesSyntaxError("entities.txt", errors[:1])).startswith("entities.txt:1:1: ")
+
+
+def test_invalid_header_keeps_its_block():
+    # Les attributs d'un en-tête invalide ne sont pas rattachés à l'entité précédente (pas de faux doublon)
+    errors = errors_of("A\n- x int\n1bad .w Admin\n- x int\n- y int .bogus\n")
+    assert [(line, column) for line, column, _ in errors] == [(3, 1), (5, 9)]
+    assert "Nom d'entité invalide" in errors[0][2]
+
+
+def test_unfiltered_columns_warning(capsys):
+    from InitFastAPIProject import _filter_parameters
+
+    tle = parse_entities(TEST_ENTITIES)["TLE"]
+    names = [name for name, _ in _filter_parameters(tle)]
+    assert "norad__gte" in names and "ligne1" not in names
+    # Avertissement sur la sortie des diagnostics du générateur, pas au milieu des fichiers générés
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith(f"⚠️ TLE (ligne {tle.line}) : pas de filtre")
+    assert "ligne1" in captured.err
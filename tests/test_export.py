@@ -0,0 +1,27 @@
+"""Export en flux : NDJSON par défaut, CSV avec Accept: text/csv, mêmes valeurs dans les deux formats"""
+import csv
+import io
+import json
+
+from conftest import tle
+
+NORAD = 15000
+
+
+def test_csv_and_ndjson_agree(client, admin):
+    assert client.post("/tles/", json=tle(NORAD, epoch="2024-01-02T03:04:05"), headers=admin).status_code == 201
+
+    ndjson = client.get("/tles/export", headers=admin)
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    row = next(row for row in rows if row["norad"] == NORAD)
+
+    exported = client.get("/tles/export", headers={**admin, "Accept": "text/csv"})
+    assert exported.headers["content-type"].startswith("text/csv")
+    assert 'filename="tles.csv"' in exported.headers["content-disposition"]
+    record = next(record for record in csv.DictReader(io.StringIO(exported.text)) if record["norad"] == str(NORAD))
+
+    # Dates en ISO 8601 (séparateur T) dans les deux formats
+    assert record["epoch"] == row["epoch"] == "2024-01-02T03:04:05"
+    assert record["updated_at"] == row["updated_at"]
+    assert record["nom"] == "" and row["nom"] is None
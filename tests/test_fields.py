@@ -0,0 +1,39 @@
+"""Champs partiels (?fields=) sur les routes de liste : colonnes demandées seulement, en-têtes conservés"""
+import pytest
+
+from conftest import tle
+
+NORADS = range(15600, 15605)
+SCOPE = {"norad__gte": NORADS[0], "norad__lte": NORADS[-1]}
+
+
+@pytest.fixture(scope="module")
+def rows(client, admin):
+    items = [tle(norad, nom=f"SAT {norad}", epoch=f"2024-03-{1 + norad - NORADS[0]:02d}T00:00:00") for norad in NORADS]
+    assert client.post("/tles/bulk", json=items, headers=admin).status_code == 200
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_sparse_list_pages(client, admin, rows, monkeypatch, fast):
+    from app.utils.core.config import settings
+
+    monkeypatch.setattr(settings, "FAST_SERIALIZATION", fast)
+    params = {**SCOPE, "fields": "nom,norad,nom", "sort": "-epoch", "limit": 3 + fast, "total": True}
+    first = client.get("/tles/", params=params, headers=admin)
+    assert first.status_code == 200, first.text
+    # Colonnes dans l'ordre demandé, sans doublon ; ni l'id ni la colonne de tri ne s'ajoutent à la réponse
+    assert [list(row) for row in first.json()] == [["nom", "norad"]] * (3 + fast)
+    assert [row["norad"] for row in first.json()] == list(reversed(NORADS))[:3 + fast]
+    assert first.headers["X-Total-Count"] == str(len(NORADS))
+    assert "ETag" in first.headers
+
+    second = client.get("/tles/", params={**params, "after": first.headers["X-Next-Cursor"]}, headers=admin)
+    assert second.status_code == 200, second.text
+    assert [row["norad"] for row in first.json() + second.json()] == list(reversed(NORADS))
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_sparse_list_errors(client, admin, rows):
+    for fields in ("nom,orbite", ",", "password"):
+        response = client.get("/tles/", params={**SCOPE, "fields": fields}, headers=admin)
+        assert response.status_code == 400, fields
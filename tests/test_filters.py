@@ -0,0 +1,42 @@
+"""Filtres de liste sur les colonnes indexées et nombre total filtré (X-Total-Count)"""
+from conftest import tle
+
+NORADS = range(15200, 15210)
+SCOPE = {"norad__gte": NORADS[0], "norad__lte": NORADS[-1]}
+
+
+def listing(client, admin, **params):
+    response = client.get("/tles/", params={**SCOPE, "total": True, **params}, headers=admin)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_filters_and_total_count(client, admin):
+    items = [
+        tle(norad, classification="UC"[norad % 2], epoch=f"2024-02-{1 + norad - NORADS[0]:02d}T00:00:00")
+        for norad in NORADS
+    ]
+    assert client.post("/tles/bulk", json=items, headers=admin).status_code == 200
+
+    # Nombre total des lignes filtrées, pas de la page ni de la table
+    page = listing(client, admin, limit=2)
+    assert len(page.json()) == 2
+    assert page.headers["X-Total-Count"] == str(len(NORADS))
+    assert "X-Total-Count" not in client.get("/tles/", params=SCOPE, headers=admin).headers
+
+    classified = listing(client, admin, classification="C", limit=2)
+    assert classified.headers["X-Total-Count"] == "5"
+    assert all(row["classification"] == "C" for row in classified.json())
+
+    chosen = listing(client, admin, norad__in=[NORADS[1], NORADS[3], 99999])
+    assert sorted(row["norad"] for row in chosen.json()) == [NORADS[1], NORADS[3]]
+    assert chosen.headers["X-Total-Count"] == "2"
+
+    window = listing(client, admin, epoch__gte="2024-02-03T00:00:00", epoch__lte="2024-02-05T00:00:00")
+    assert [row["norad"] for row in window.json()] == list(NORADS[2:5])
+    assert window.headers["X-Total-Count"] == "3"
+
+    assert listing(client, admin, classification__prefix="U").headers["X-Total-Count"] == "5"
+    # Colonne non indexée : pas de paramètre de filtre généré, le paramètre est ignoré
+    assert listing(client, admin, ligne1="nope").headers["X-Total-Count"] == str(len(NORADS))
+    assert client.get("/tles/", params={"norad": "abc"}, headers=admin).status_code == 422
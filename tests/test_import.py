@@ -0,0 +1,78 @@
+"""Import en masse : lecture des formats, rejets ligne par ligne, upsert avec garde"""
+import argparse
+import importlib
+import io
+import json
+
+ISS = (
+    "ISS (ZARYA)\n"
+    "1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927\n"
+    "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537\n"
+)
+
+
+def test_read_tle(client):
+    from app.utils.core.importer import ParseError, read_records
+
+    bad_checksum = ISS.replace("2927\n", "2928\n")
+    orphan = "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537\n"
+    records = list(read_records(io.StringIO(ISS + bad_checksum + orphan), "tle"))
+
+    assert [line for line, _ in records] == [2, 5, 7]
+    data = records[0][1]
+    assert (data["nom"], data["norad"], data["classification"]) == ("ISS (ZARYA)", 25544, "U")
+    assert data["epoch"].strftime("%Y-%m-%d") == "2008-09-20"
+    assert isinstance(records[1][1], ParseError) and "checksum" in str(records[1][1])
+    assert isinstance(records[2][1], ParseError) and "without a preceding line 1" in str(records[2][1])
+
+
+def test_read_csv_and_ndjson(client):
+    from app.utils.core.importer import ParseError, read_records
+
+    rows = list(read_records(io.StringIO("norad,nom\n1,\n2,b,extra\n"), "csv"))
+    assert rows[0] == (2, {"norad": "1", "nom": None})
+    assert rows[1][0] == 3 and isinstance(rows[1][1], ParseError)
+
+    rows = list(read_records(io.StringIO('{"norad": 1}\n\n{oops\n[1]\n'), "ndjson"))
+    assert [line for line, _ in rows] == [1, 3, 4]
+    assert all(isinstance(data, ParseError) for _, data in rows[1:])
+
+
+def run_import(path, **options) -> int:
+    module = importlib.import_module("app.import")
+    defaults = dict(
+        entity="TLE", file=str(path), format=None, batch_size=2, upsert=None, guard=None,
+        rejects=None, no_copy=True, strict=False,
+    )
+    return module.run(argparse.Namespace(**{**defaults, **options}))
+
+
+def test_import_with_rejects_and_upsert(client, admin, tmp_path):
+    rows = [
+        {"norad": 14000, "ligne1": "1 14000U", "ligne2": "2 14000", "epoch": "2024-01-02T00:00:00"},
+        {"norad": 14001, "ligne1": "1 14001U", "ligne2": "2 14001"},
+        {"norad": 14002},                                        # ligne1 / ligne2 manquantes
+        {"norad": 100000, "ligne1": "1", "ligne2": "2"},         # hors de .range(, 99999)
+    ]
+    path = tmp_path / "tles.ndjson"
+    path.write_text("\n".join(json.dumps(row) for row in rows[:2]) + "\n{oops\n" + "\n".join(json.dumps(row) for row in rows[2:]) + "\n")
+    rejects = tmp_path / "rejects.ndjson"
+
+    assert run_import(path, rejects=str(rejects)) == 0
+    assert run_import(tmp_path / "tles.ndjson", rejects=str(tmp_path / "strict.ndjson"), strict=True, upsert="norad") == 1
+    rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [reject["line"] for reject in rejected] == [3, 4, 5]
+
+    listing = client.get("/tles/", params={"norad__gte": 14000, "norad__lte": 14999}, headers=admin).json()
+    assert sorted(tle["norad"] for tle in listing) == [14000, 14001]
+
+    # Upsert avec garde : une epoch plus ancienne n'écrase pas la ligne existante
+    older = tmp_path / "older.ndjson"
+    older.write_text(json.dumps({**rows[0], "nom": "old", "epoch": "2024-01-01T00:00:00"}) + "\n")
+    assert run_import(older, upsert="norad", guard="epoch") == 0
+    newer = tmp_path / "newer.ndjson"
+    newer.write_text(json.dumps({**rows[0], "nom": "new", "epoch": "2024-01-03T00:00:00"}) + "\n")
+    assert run_import(newer, upsert="norad", guard="epoch") == 0
+
+    listing = client.get("/tles/", params={"norad__gte": 14000, "norad__lte": 14000}, headers=admin).json()
+    assert [(tle["nom"], tle["epoch"][:10]) for tle in listing] == [("new", "2024-01-03")]
@@ -0,0 +1,76 @@
+"""Régénération incrémentale : fichiers inchangés, modifiés à la main, en conflit et supprimés"""
+import os
+
+import pytest
+
+from incremental import BASE_DIR, CONFLICT_SUFFIX, STATE_DIR, load_manifest, sync_project
+
+
+def write(root, relative: str, text: str) -> None:
+    path = os.path.join(root, *relative.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(root, relative: str) -> str:
+    with open(os.path.join(root, *relative.split("/")), encoding="utf-8") as f:
+        return f.read()
+
+
+def generate(tmp_path, files: dict, name: str):
+    """Dossier de génération (staging) contenant `files`"""
+    staging = tmp_path / name
+    for relative, text in files.items():
+        write(staging, relative, text)
+    return str(staging)
+
+
+@pytest.fixture
+def project(tmp_path):
+    path = str(tmp_path / "generated")
+    staging = generate(tmp_path, {"a.py": "a1", "b.py": "b1", "c.py": "c1", "d.py": "d1", "app/e.py": "e1"}, "first")
+    report = sync_project(staging, path)
+    assert sorted(report.created) == ["a.py", "app/e.py", "b.py", "c.py", "d.py"]
+    return path
+
+
+def test_second_run_only_reports_changes(tmp_path, project):
+    staging = generate(tmp_path, {"a.py": "a1", "b.py": "b2", "c.py": "c1", "d.py": "d1", "app/e.py": "e1"}, "second")
+    report = sync_project(staging, project)
+    assert report.updated == ["b.py"]
+    assert sorted(report.unchanged) == ["a.py", "app/e.py", "c.py", "d.py"]
+    assert read(project, "b.py") == "b2"
+    assert read(project, f"{STATE_DIR}/{BASE_DIR}/b.py") == "b2"
+
+
+def test_hand_edits_and_conflicts(tmp_path, project):
+    write(project, "a.py", "a1 + main")        # modifié à la main, génération identique
+    write(project, "b.py", "b1 + main")        # modifié à la main et par le générateur
+    write(project, "d.py", "d1 + main")        # modifié à la main, n'est plus généré
+    write(project, "f.py", "f manuel")         # existant, absent du manifeste
+    staging = generate(tmp_path, {"a.py": "a1", "b.py": "b2", "f.py": "f1", "app/e.py": "e1"}, "second")
+
+    report = sync_project(staging, project)
+    assert report.kept == ["a.py", "d.py"]
+    assert report.conflicts == ["b.py"]
+    assert report.untracked == ["f.py"]
+    assert report.removed == ["c.py"]
+
+    assert read(project, "a.py") == "a1 + main"
+    assert read(project, "b.py") == "b1 + main"
+    assert read(project, "b.py" + CONFLICT_SUFFIX) == "b2"
+    # La base reste l'ancienne version générée jusqu'à la résolution (fusion à 3 voies)
+    assert read(project, f"{STATE_DIR}/{BASE_DIR}/b.py") == "b1"
+    assert read(project, "f.py") == "f manuel"
+    assert read(project, "f.py" + CONFLICT_SUFFIX) == "f1"
+    assert not os.path.exists(os.path.join(project, "c.py"))
+    assert read(project, "d.py") == "d1 + main"
+    assert "f.py" not in load_manifest(project)
+
+    # Conflit résolu à la main avec la version générée : le fichier .generated disparaît au passage suivant
+    write(project, "b.py", "b2")
+    report = sync_project(staging, project)
+    assert "b.py" in report.unchanged
+    assert not os.path.exists(os.path.join(project, "b.py" + CONFLICT_SUFFIX))
+    assert read(project, f"{STATE_DIR}/{BASE_DIR}/b.py") == "b2"
@@ -0,0 +1,37 @@
+"""Index déclarés dans entities.txt : nommage, index composites et partiels, création en base"""
+from InitFastAPIProject import _parse_entity_indexes, generate_sql_model
+from utils import parse_entities
+
+SAT = """\
+SAT
+- norad int .index
+- epoch datetime
+- actif bool
+.index(norad)
+.index(epoch desc, where=actif = 1)
+.index(orbite)
+"""
+
+
+def test_index_names_and_partial_index(capsys):
+    entity = parse_entities(SAT)["SAT"]
+    indexes = _parse_entity_indexes(entity)
+    # Nom déjà pris par l'index de colonne .index : suffixe ; prédicat : suffixe _partial
+    assert [(index["name"], index["columns"], index["where"]) for index in indexes] == [
+        ("ix_sat_norad_2", ["norad"], None),
+        ("ix_sat_epoch_partial", ["epoch desc"], "actif = 1"),
+    ]
+    assert "colonnes inconnues ['orbite']" in capsys.readouterr().err
+
+    model = generate_sql_model(entity)
+    assert 'Index("ix_sat_epoch_partial", SAT.__table__.c.epoch.desc(), postgresql_where=text("actif = 1"), sqlite_where=text("actif = 1"))' in model
+
+
+def test_indexes_created_in_database(client):
+    from sqlalchemy import inspect
+
+    from app.utils.core.database import engine
+
+    indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes("tle")}
+    assert indexes["ix_tle_epoch"] == ["epoch"]
+    assert indexes["ix_tle_classification_epoch"] == ["classification", "epoch"]
@@ -0,0 +1,55 @@
+"""Métriques Prometheus : compteurs et latences par gabarit de route, attente du pool par étiquette"""
+from conftest import tle
+
+
+def scrape(client) -> dict:
+    """Échantillons de /metrics : {nom{étiquettes}: valeur}"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def test_histogram_render(client):
+    from app.utils.core.metrics import Histogram
+
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+    assert histogram.render("latency", 'route="/x"') == [
+        'latency_bucket{route="/x",le="0.1"} 1',
+        'latency_bucket{route="/x",le="1.0"} 3',
+        'latency_bucket{route="/x",le="+Inf"} 4',
+        'latency_sum{route="/x"} 4.25',
+        'latency_count{route="/x"} 4',
+    ]
+
+
+def test_requests_labelled_by_route_template(client, admin):
+    created = client.post("/tles/", json=tle(15400), headers=admin).json()
+    before = scrape(client)
+
+    for _ in range(2):
+        assert client.get(f"/tles/{created['id']}", headers=admin).status_code == 200
+    assert client.get(f"/tles/{created['id'] + 10**6}", headers=admin).status_code == 404
+    assert client.get("/no-such-route").status_code == 404
+    after = scrape(client)
+
+    # Gabarit de chemin et non l'URL : une série par route, quel que soit l'id demandé
+    ok = 'http_requests_total{method="GET",route="/tles/{id}",status="200"}'
+    assert after[ok] - before.get(ok, 0) == 2
+    missing = 'http_requests_total{method="GET",route="/tles/{id}",status="404"}'
+    assert after[missing] - before.get(missing, 0) == 1
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in after
+    assert not any(f"/tles/{created['id']}" in name for name in after)
+
+    count = 'http_request_duration_seconds_count{method="GET",route="/tles/{id}"}'
+    assert after[count] - before.get(count, 0) == 3
+    assert after['http_request_duration_seconds_bucket{method="GET",route="/tles/{id}",le="+Inf"}'] == after[count]
+    assert after["http_requests_in_flight"] == 1  # la requête /metrics elle-même
+    assert after['db_pool_checkout_wait_seconds_count{pool="sync"}'] > 0
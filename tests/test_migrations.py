@@ -0,0 +1,59 @@
+"""Migrations versionnées : génération par empreinte du schéma, application au démarrage d'une base existante"""
+from InitFastAPIProject import build_schema_snapshot
+from migrations import create_migration, diff_schemas, load_history
+from utils import parse_entities
+
+V1 = "SAT\n- nom str .len(10)\n"
+V2 = "SAT\n- nom str .len(10)\n- norad int .index\n- epoch datetime\n.index(norad, epoch desc)\n"
+
+
+def schema(text: str) -> dict:
+    return build_schema_snapshot(parse_entities(text))
+
+
+def test_migration_history(tmp_path):
+    directory = str(tmp_path / "migrations")
+    first = create_migration(schema(V1), directory)
+    assert (first["version"], first["operations"]) == (1, [{"op": "create_table", "table": "sat"}])
+    # Schéma inchangé (même empreinte) : pas de nouvelle migration
+    assert create_migration(schema(V1), directory) is None
+
+    second = create_migration(schema(V2), directory)
+    assert second["version"] == 2 and second["fingerprint"] != first["fingerprint"]
+    assert [(op["op"], op.get("column") or op.get("index")) for op in second["operations"]] == [
+        ("add_column", "epoch"),
+        ("add_column", "norad"),
+        ("create_index", "ix_sat_norad"),
+        ("create_index", "ix_sat_norad_epoch"),
+    ]
+    assert [migration["version"] for migration in load_history(directory)] == [1, 2]
+
+    # Retour en arrière : index supprimés avant les colonnes qu'ils couvrent
+    operations = diff_schemas(schema(V2), schema(V1))
+    assert [op["op"] for op in operations] == ["drop_index", "drop_index", "drop_column", "drop_column"]
+
+
+def test_run_migrations_upgrades_existing_database(client, monkeypatch, tmp_path):
+    from sqlalchemy import create_engine, inspect, select
+
+    from app.utils.core import migrations as runtime
+
+    directory = tmp_path / "migrations"
+    engine = create_engine(f"sqlite:///{tmp_path / 'upgrade.db'}")
+    monkeypatch.setattr(runtime, "MIGRATIONS_DIR", directory)
+
+    # Base créée à la version 1 (tables de l'application), puis migrations 2 et 3 appliquées au démarrage suivant
+    create_migration({}, str(directory))
+    runtime.run_migrations(engine)
+    create_migration(schema(V1), str(directory))
+    create_migration(schema(V2), str(directory))
+    runtime.run_migrations(engine)
+
+    inspector = inspect(engine)
+    assert {column["name"] for column in inspector.get_columns("sat")} == {"id", "nom", "norad", "epoch"}
+    assert {index["name"] for index in inspector.get_indexes("sat")} == {"ix_sat_norad", "ix_sat_norad_epoch"}
+    with engine.connect() as conn:
+        versions = conn.execute(select(runtime.schema_version.c.version)).scalars().all()
+    assert versions == [1, 2, 3]
+    assert runtime._is_up_to_date(engine, runtime.load_migrations()[-1])
+    engine.dispose()
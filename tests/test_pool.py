@@ -0,0 +1,34 @@
+"""Pool de connexions : réglages DB_POOL_* de Settings, /health/pool et jauges du pool"""
+import pytest
+
+
+def test_pool_follows_settings(client, monkeypatch, tmp_path):
+    from sqlalchemy.exc import TimeoutError
+
+    from app.utils.core import database
+    from app.utils.core.config import settings
+
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 2)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    engine = database.create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert isinstance(engine.pool, database.TimedQueuePool)
+    assert (engine.pool.size(), engine.pool._max_overflow, engine.pool._timeout) == (2, 1, 0.05)
+
+    # Pool (2) et débordement (1) épuisés : l'emprunt suivant échoue après DB_POOL_TIMEOUT
+    connections = [engine.connect() for _ in range(3)]
+    with pytest.raises(TimeoutError):
+        engine.connect()
+    for connection in connections:
+        connection.close()
+    engine.dispose()
+
+
+def test_pool_health_and_gauges(client):
+    stats = client.get("/health/pool").json()
+    assert set(stats) >= {"size", "checked_in", "checked_out", "overflow", "max_overflow", "checkout_wait_count"}
+    assert stats["checkout_wait_count"] > 0
+
+    text = client.get("/metrics").text
+    for state in ("checked_in", "checked_out", "overflow"):
+        assert f'db_pool_connections{{pool="sync",state="{state}"}}' in text
@@ -0,0 +1,45 @@
+"""Registre généré (app/registry.py) et chargement paresseux des routers (LAZY_ROUTERS)"""
+import os
+import runpy
+
+from InitFastAPIProject import create_registry
+
+
+def test_generated_registry(project):
+    registry = runpy.run_path(os.path.join(project, "app", "registry.py"))
+    entities, routers = registry["ENTITY_MODULES"], registry["ROUTER_MODULES"]
+
+    assert "app.entities.tle" in entities and "app.entities.auth.user" in entities
+    assert ("app.routers.tle", "/tles") in routers and ("app.routers.auth", "/auth") in routers
+    assert registry["ASYNC_MODE"] is False
+
+    # Ordre déterministe : la régénération d'un projet inchangé donne le même fichier
+    path = os.path.join(project, "app", "registry.py")
+    with open(path, encoding="utf-8") as f:
+        before = f.read()
+    create_registry(project)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == before
+
+
+def test_lazy_routers(client):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.utils.core.startup import LazyRouterMiddleware
+
+    def paths(app) -> set:
+        return {route.path for route in app.routes}
+
+    app = FastAPI()
+    app.add_middleware(LazyRouterMiddleware, fastapi_app=app, routers=[("app.routers.tle", "/tles"), ("app.routers.users", "/users")])
+    with TestClient(app) as lazy:
+        # Même début de chemin mais autre préfixe : aucun module chargé
+        assert lazy.get("/tlesx").status_code == 404
+        assert "/tles/" not in paths(app)
+
+        assert lazy.get("/tles/").status_code == 401
+        assert "/tles/" in paths(app) and "/users/me" not in paths(app)
+
+        # La documentation charge les modules restants pour un schéma complet
+        assert "/users/me" in lazy.get("/openapi.json").json()["paths"]
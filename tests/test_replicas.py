@@ -0,0 +1,86 @@
+"""Réplicas en lecture : tourniquet, réplica injoignable écarté, lecture sur la base principale après une écriture"""
+import os
+import sqlite3
+import time
+
+from conftest import tle
+
+NORADS = range(15500, 15502)
+
+
+def _snapshot(path) -> str:
+    """Copie de la base de test : un réplica figé, en retard sur la base principale"""
+    primary = sqlite3.connect(os.environ["DATABASE_URL"].removeprefix("sqlite:///"))
+    replica = sqlite3.connect(path)
+    primary.backup(replica)
+    primary.close()
+    replica.close()
+    return f"sqlite:///{path}"
+
+
+def test_replica_set_rotates_and_skips_down(client):
+    from app.utils.core.replicas import ReplicaSet
+
+    replicas = ReplicaSet(["a", "b", "c"], retry_seconds=60)
+    assert [replicas.candidates()[0] for _ in range(4)] == [0, 1, 2, 0]
+    replicas.mark_down(2)
+    assert sorted(replicas.candidates()) == [0, 1]
+    replicas._down_until[2] = time.monotonic()
+    assert 2 in replicas.candidates()
+
+
+def test_reads_go_to_replica(client, admin, monkeypatch, tmp_path):
+    from app.utils.core import replicas as module
+    from app.utils.core.database import create_db_engine
+
+    assert client.post("/tles/", json=tle(NORADS[0]), headers=admin).status_code == 201
+    replica = create_db_engine(_snapshot(tmp_path / "replica.db"))
+    unreachable = create_db_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replica_set = module.ReplicaSet([unreachable, replica], retry_seconds=60)
+    monkeypatch.setattr(module, "replicas", replica_set)
+    # Écriture que le réplica n'a pas reçue
+    assert client.post("/tles/", json=tle(NORADS[1]), headers=admin).status_code == 201
+
+    def norads(limit: int, cookies=None) -> list:
+        # `limit` distinct à chaque appel : pas de réponse servie par le cache des lectures de l'entité
+        params = {"norad__gte": NORADS[0], "norad__lte": NORADS[-1], "limit": limit}
+        response = client.get("/tles/", params=params, headers=admin, cookies=cookies)
+        assert response.status_code == 200, response.text
+        return [row["norad"] for row in response.json()]
+
+    assert norads(10) == [NORADS[0]]
+    # Premier réplica injoignable : écarté pendant retry_seconds, la lecture est passée au suivant
+    assert replica_set._down_until[0] > time.monotonic()
+    assert replica_set.candidates() == [1]
+
+    # Client ayant écrit récemment : lecture sur la base principale
+    sticky = {module.PRIMARY_COOKIE: f"{time.time() + 60:.3f}"}
+    assert norads(11, cookies=sticky) == list(NORADS)
+    expired = {module.PRIMARY_COOKIE: f"{time.time() - 1:.3f}"}
+    assert norads(12, cookies=expired) == [NORADS[0]]
+    replica.dispose()
+    unreachable.dispose()
+
+
+def test_read_your_writes_cookie(client, monkeypatch):
+    from fastapi import FastAPI, HTTPException
+    from fastapi.testclient import TestClient
+
+    from app.utils.core.config import settings
+    from app.utils.core.replicas import PRIMARY_COOKIE, ReadYourWritesMiddleware
+
+    monkeypatch.setattr(settings, "DB_READ_YOUR_WRITES_SECONDS", 5)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.get("/item")(lambda: {})
+    app.post("/item")(lambda: {})
+
+    @app.delete("/item")
+    def refused():
+        raise HTTPException(status_code=409)
+
+    with TestClient(app) as test_client:
+        assert PRIMARY_COOKIE not in test_client.get("/item").cookies
+        assert PRIMARY_COOKIE not in test_client.delete("/item").cookies
+        until = float(test_client.post("/item").cookies[PRIMARY_COOKIE])
+    assert time.time() < until <= time.time() + 5
@@ -0,0 +1,49 @@
+"""Sérialisation rapide (orjson, lignes Core sans ORM) et compression des réponses selon Accept-Encoding"""
+from datetime import datetime
+from decimal import Decimal
+
+from conftest import tle
+
+NORADS = range(15800, 15830)
+
+
+def test_rows_rendering(client):
+    from app.utils.core.serialization import dumps, rows_response
+
+    assert dumps({"at": datetime(2024, 1, 2, 3, 4, 5), "x": Decimal("1.50")}) == b'{"at":"2024-01-02T03:04:05","x":"1.50"}'
+    response = rows_response([{"id": 1, "nom": "a", "norad": 2}], ("norad", "nom"))
+    assert response.body == b'[{"norad":2,"nom":"a"}]'
+    assert rows_response({"id": 1, "nom": "a"}, ("nom",), many=False).body == b'{"nom":"a"}'
+
+
+def test_negotiate(client, monkeypatch):
+    from app.utils.core import compression
+
+    assert compression.accepted_encodings("br;q=0.5, gzip , x;q=oops") == {"br": 0.5, "gzip": 1.0, "x": 0.0}
+    monkeypatch.setattr(compression, "brotli", None)
+    assert compression.negotiate("br, gzip") == "gzip"
+    assert compression.negotiate("identity") is None
+    assert compression.negotiate("gzip;q=0") is None
+    monkeypatch.setattr(compression, "brotli", object())
+    assert compression.negotiate("gzip, br") == "br"
+    assert compression.negotiate("br;q=0.5, gzip") == "gzip"
+    assert compression.negotiate("*") == "br"
+
+
+def test_compressed_list(client, admin):
+    items = [tle(norad, nom=f"SAT {norad}") for norad in NORADS]
+    assert client.post("/tles/bulk", json=items, headers=admin).status_code == 200
+    params = {"norad__gte": NORADS[0], "norad__lte": NORADS[-1], "limit": 50}
+
+    plain = client.get("/tles/", params=params, headers={**admin, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert len(plain.content) > 1024
+
+    compressed = client.get("/tles/", params=params, headers={**admin, "Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.json() == plain.json()
+    assert int(compressed.headers["content-length"]) < len(plain.content)
+
+    # Réponse sous COMPRESSION_MIN_SIZE : envoyée telle quelle
+    small = client.get("/tles/", params={**params, "limit": 1, "fields": "norad"}, headers={**admin, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
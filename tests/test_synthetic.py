@@ -0,0 +1,40 @@
+"""Données synthétiques : contraintes de entities.txt respectées, colonnes uniques bornées"""
+import pytest
+
+
+@pytest.fixture
+def model(client):
+    from app.entities.tle import TLE
+
+    return TLE
+
+
+def test_batches_follow_constraints(model):
+    from app.utils.core.synthetic import CHUNK_ROWS, TablePlan, generate_batches
+
+    plan = TablePlan(model, CHUNK_ROWS + 5)
+    batches = list(generate_batches(plan, seed=1, null_ratio=0.1))
+    assert [len(rows) for _, rows in batches] == [CHUNK_ROWS, 5]
+    columns, rows = batches[0]
+    records = [dict(zip(columns, row)) for row in rows]
+
+    norads = [record["norad"] for record in records]
+    assert len(set(norads)) == len(norads)
+    assert all(0 <= norad <= 99999 for norad in norads)
+    assert all(record["ligne1"] is not None and len(record["ligne1"]) <= 69 for record in records)
+    assert all(record["excentricite"] is None or 0 <= record["excentricite"] <= 1 for record in records)
+    assert any(record["nom"] is None for record in records)
+    # Même graine, mêmes données
+    assert list(generate_batches(plan, seed=1, null_ratio=0.1))[1] == batches[1]
+
+
+def test_unique_with_upper_bound_only(model):
+    from app.utils.core.synthetic import SyntheticError, TablePlan, column_generators
+
+    # norad : .unique .range(, 99999) -> 100 000 valeurs possibles, de 99999 à 0
+    column_generators(TablePlan(model, 100000), {}, 0.0)
+    with pytest.raises(SyntheticError, match="norad"):
+        column_generators(TablePlan(model, 100001), {}, 0.0)
+    # Lignes ajoutées après des lignes existantes : les ids déjà pris comptent
+    with pytest.raises(SyntheticError):
+        column_generators(TablePlan(model, 10, first_id=99995), {}, 0.0)
@@ -0,0 +1,99 @@
+"""Écritures unitaires : PATCH partiel (schéma <Entité>Update), upsert par clé naturelle, violations de contrainte"""
+from conftest import tle
+
+NORADS = range(13000, 13010)
+
+
+def test_patch_rejects_null_on_not_null(client, admin):
+    created = client.post("/tles/", json=tle(NORADS[0], nom="A"), headers=admin).json()
+    url = f"/tles/{created['id']}"
+
+    for field in ("ligne1", "norad"):
+        response = client.patch(url, json={field: None}, headers=admin)
+        assert response.status_code == 422, response.text
+
+    # Champ .nn omis : conservé ; champ nullable : null accepté
+    response = client.patch(url, json={"nom": None}, headers=admin)
+    assert response.status_code == 200, response.text
+    assert response.json()["nom"] is None
+    assert response.json()["ligne1"] == created["ligne1"]
+
+
+def test_bulk_update_rejects_null_on_not_null(client, admin):
+    created = client.post("/tles/", json=tle(NORADS[1]), headers=admin).json()
+    response = client.put("/tles/bulk", json=[{"id": created["id"], "ligne2": None}], headers=admin)
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == ["error"]
+    assert client.get(f"/tles/{created['id']}", headers=admin).json()["ligne2"] == created["ligne2"]
+
+
+def test_upsert_by_key_takes_key_from_path(client, admin):
+    norad = NORADS[2]
+    body = {key: value for key, value in tle(norad, epoch="2024-01-02T00:00:00").items() if key != "norad"}
+
+    created = client.put(f"/tles/by-norad/{norad}", json=body, headers=admin)
+    assert created.status_code == 200, created.text
+    assert created.headers["X-Upsert"] == "written"
+    assert created.json()["norad"] == norad
+
+    replaced = client.put(f"/tles/by-norad/{norad}", json={**body, "norad": norad, "nom": "B"}, headers=admin)
+    assert replaced.status_code == 200
+    assert replaced.json()["id"] == created.json()["id"]
+    assert replaced.json()["nom"] == "B"
+
+    mismatch = client.put(f"/tles/by-norad/{norad}", json={**body, "norad": norad + 1}, headers=admin)
+    assert mismatch.status_code == 422
+
+    older = client.put(f"/tles/by-norad/{norad}", json={**body, "epoch": "2024-01-01T00:00:00"}, params={"guard": "epoch"}, headers=admin)
+    assert older.status_code == 200
+    assert older.headers["X-Upsert"] == "skipped"
+    assert older.json()["epoch"].startswith("2024-01-02")
+
+
+def test_constraint_violations(client, admin):
+    first = client.post("/tles/", json=tle(NORADS[3]), headers=admin).json()
+    second = client.post("/tles/", json=tle(NORADS[4]), headers=admin).json()
+
+    duplicate = client.post("/tles/", json=tle(NORADS[3]), headers=admin)
+    assert duplicate.status_code == 409, duplicate.text
+    assert "Unique" in duplicate.json()["detail"]
+
+    for method in (client.patch, client.put):
+        response = method(f"/tles/{second['id']}", json=tle(NORADS[3]), headers=admin)
+        assert response.status_code == 409, response.text
+
+    # La session est utilisable après l'annulation : les écritures suivantes passent
+    response = client.patch(f"/tles/{first['id']}", json={"nom": "ok"}, headers=admin)
+    assert response.status_code == 200
+    assert client.get(f"/tles/{second['id']}", headers=admin).json()["norad"] == NORADS[4]
+
+
+def test_constraint_error_kinds(client):
+    from sqlalchemy.exc import IntegrityError
+
+    from app.repositories.base_repository import ConstraintError
+
+    class PostgresError(Exception):
+        pgcode = "23503"
+
+    foreign_key = ConstraintError.from_integrity_error(IntegrityError("INSERT", {}, PostgresError("insert violates fk")))
+    assert (foreign_key.kind, foreign_key.status_code) == ("foreign_key", 422)
+    not_null = ConstraintError.from_integrity_error(IntegrityError("INSERT", {}, Exception("NOT NULL constraint failed: tle.ligne1")))
+    assert (not_null.kind, not_null.status_code) == ("not_null", 422)
+    unique = ConstraintError.from_integrity_error(IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed: tle.norad")))
+    assert (unique.kind, unique.status_code) == ("unique", 409)
+
+
+def test_upsert_on_unsupported_dialect(client, admin, monkeypatch):
+    from app.utils.core.database import engine
+
+    body = tle(NORADS[5])
+    # Dialecte sans INSERT ... ON CONFLICT : 501 explicite plutôt qu'une erreur 500
+    monkeypatch.setattr(engine.dialect, "name", "mssql")
+    response = client.put(f"/tles/by-norad/{NORADS[5]}", json=body, headers=admin)
+    bulk = client.put("/tles/by-norad", json=[body], headers=admin)
+    monkeypatch.undo()
+
+    assert response.status_code == 501, response.text
+    assert "mssql" in response.json()["detail"]
+    assert bulk.status_code == 501, bulk.text
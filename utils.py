@@ -1,77 +1,350 @@
-# region
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
 
+ENTITIES_PATH = "config/entities.txt"
 
-def get_entities():
+# Types de base reconnus dans entities.txt et leur type Python
+BUILT_IN_TYPES = {
+    'int': 'int',
+    'integer': 'int',
+    'str': 'str',
+    'string': 'str',
+    'float': 'float',
+    'decimal': 'float',
+    'bool': 'bool',
+    'boolean': 'bool',
+    'date': 'date',
+    'datetime': 'datetime',
+}
+
+
+# region Représentation intermédiaire
+
+
+@dataclass
+class Attribute:
+    """Attribut d'une entité : `- nom type .modificateur ...`"""
+    name: str
+    type: str
+    line: int
+    not_null: bool = False
+    unique: bool = False
+    index: bool = False
+    # Entité cible de `.fk` (le type de l'attribut, ou l'argument de `.fk Cible`), None sans clé étrangère
+    foreign_key: Optional[str] = None
+    default: Optional[str] = None
+    max_length: Optional[int] = None
+    range_min: Optional[str] = None
+    range_max: Optional[str] = None
+
+    @property
+    def py_type(self) -> str:
+        """Type Python de la colonne (int pour une clé étrangère, type personnalisé tel quel)"""
+        if self.foreign_key:
+            return "int"
+        return BUILT_IN_TYPES.get(self.type.lower(), self.type)
+
+    @property
+    def nullable(self) -> bool:
+        return not self.not_null and self.default is None
+
+
+@dataclass
+class Index:
+    """Index déclaré dans le bloc d'une entité : `.index(col_a, col_b desc, where=prédicat)`"""
+    columns: list[str]
+    where: Optional[str]
+    line: int
+
+
+@dataclass
+class Entity:
+    """Entité de entities.txt : rôles d'accès, cache, attributs et index"""
+    name: str
+    line: int
+    read_roles: list[str] = field(default_factory=lambda: ["any"])
+    write_roles: list[str] = field(default_factory=lambda: ["any"])
+    delete_roles: list[str] = field(default_factory=lambda: ["any"])
+    cache_ttl: float = 0
+    attributes: list[Attribute] = field(default_factory=list)
+    indexes: list[Index] = field(default_factory=list)
+
+    def attribute(self, name: str) -> Optional[Attribute]:
+        return next((attribute for attribute in self.attributes if attribute.name == name), None)
+
+
+class EntitiesSyntaxError(Exception):
+    """Erreurs de syntaxe de entities.txt, chacune avec sa ligne et sa colonne"""
+
+    def __init__(self, path: str, errors: list[tuple[int, int, str]]):
+        self.path = path
+        self.errors = errors
+        super().__init__("\n".join(f"{path}:{line}:{column}: {message}" for line, column, message in errors))
+
+
+# endregion
+
+
+# region Analyse
+
+
+class Token(NamedTuple):
+    kind: str            # "word" ou "modifier"
+    value: str           # le mot, ou le nom du modificateur sans le point
+    argument: Optional[str]  # contenu des parenthèses d'un modificateur, None sans parenthèses
+    column: int
+
+
+class _Error(Exception):
+    def __init__(self, column: int, message: str):
+        super().__init__(message)
+        self.column = column
+        self.message = message
+
+
+def tokenize(text: str, offset: int = 0) -> list[Token]:
+    """
+    Découpe une ligne en mots et modificateurs (`.nom` ou `.nom(argument)`, collés ou non au mot précédent). Les parenthèses
+    imbriquées et les chaînes entre guillemets sont respectées dans les arguments.
+    `offset` est la colonne (à partir de 0) du premier caractère de `text` dans la ligne.
     """
-    Lit le fichier 'entities.txt' et extrait les entités ainsi que leurs attributs.
+    tokens = []
+    position, length = 0, len(text)
+    while position < length:
+        char = text[position]
+        if char.isspace():
+            position += 1
+            continue
 
-    Le fichier doit être structuré de la façon suivante :
-    Chaque entité est définie par une ligne sans indentation ni tiret, suivie de ses attributs précédés de '- '.
-    Exemple :
+        start = position
+        if char != ".":
+            # Un modificateur peut suivre un mot sans espace : `email str.unique`
+            while position < length and not text[position].isspace() and text[position] != ".":
+                position += 1
+            tokens.append(Token("word", text[start:position], None, offset + start + 1))
+            continue
+
+        position += 1
+        while position < length and (text[position].isalnum() or text[position] == "_"):
+            position += 1
+        name = text[start + 1:position]
+        if not name:
+            raise _Error(offset + start + 1, "Nom de modificateur attendu après '.'")
+
+        argument = None
+        if position < length and text[position] == "(":
+            depth, quote, end = 0, None, position
+            while end < length:
+                current = text[end]
+                if quote:
+                    if current == quote:
+                        quote = None
+                elif current in "\"'":
+                    quote = current
+                elif current == "(":
+                    depth += 1
+                elif current == ")":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                end += 1
+            if end >= length:
+                raise _Error(offset + position + 1, f"Parenthèse non fermée dans .{name}")
+            argument = text[position + 1:end].strip()
+            position = end + 1
+        tokens.append(Token("modifier", name, argument, offset + start + 1))
+    return tokens
+
+
+def parse_entities(text: str, path: str = ENTITIES_PATH) -> dict[str, Entity]:
+    """
+    Analyse le contenu de entities.txt en une seule passe.
+
+    Chaque entité est définie par une ligne sans tiret (nom, puis `.r`, `.w`, `.d`, `.cache(ttl)`), suivie de
+    ses attributs précédés de '- ' et de ses déclarations `.index(...)`. Les lignes vides et celles commençant
+    par '#' sont ignorées. Exemple :
         User .w Admin
-        - name
-        - email
+        - name str .nn
+        - email str .unique
         Product
         - title
-        - price
+        - price float
 
     Returns:
-        dict: Un dictionnaire où les clés sont les noms des entités (str) et les valeurs sont des listes d'attributs (list[str]).
+        dict: Les entités (Entity) par nom, dans l'ordre du fichier.
+    Raises:
+        EntitiesSyntaxError: Toutes les erreurs du fichier, avec leur ligne et leur colonne.
     """
-    entities = {}
-    entity_name = ""
+    entities: dict[str, Entity] = {}
+    errors: list[tuple[int, int, str]] = []
+    entity: Optional[Entity] = None
 
-    with open("config/entities.txt", "r", encoding="utf-8") as f:
-        lines = [line.strip() for line in f.readlines()]
+    for number, raw in enumerate(text.splitlines(), 1):
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(raw) - len(raw.lstrip())
+        try:
+            if stripped.startswith("- ") or stripped == "-":
+                if entity is None:
+                    raise _Error(indent + 1, "Attribut déclaré avant toute entité")
+                attribute = _parse_attribute(stripped[2:], number, indent + 2)
+                if attribute.name == "id":
+                    raise _Error(indent + 3, "'id' est réservé : la clé primaire est générée automatiquement")
+                if entity.attribute(attribute.name):
+                    raise _Error(indent + 3, f"Attribut '{attribute.name}' déjà défini pour {entity.name}")
+                entity.attributes.append(attribute)
+            elif stripped.startswith("."):
+                if entity is None:
+                    raise _Error(indent + 1, "Déclaration hors d'une entité")
+                entity.indexes.append(_parse_declaration(stripped, number, indent))
+            else:
+                try:
+                    entity = _parse_header(stripped, number, indent)
+                except _Error:
+                    # Bloc suivi même si l'en-tête est invalide : ses attributs sont analysés et signalés à part,
+                    # sans être rattachés à l'entité précédente
+                    entity = Entity(stripped.split()[0], number)
+                    raise
+                if entity.name in entities:
+                    raise _Error(indent + 1, f"Entité '{entity.name}' déjà définie ligne {entities[entity.name].line}")
+                entities[entity.name] = entity
+        except _Error as e:
+            errors.append((number, e.column, e.message))
 
-    for line in lines:
-        if not line.startswith(" ") and not line.startswith("- "):
-            entity_name = line.split(" ")[0].strip()
-            if entity_name != "":
-                entities[entity_name] = []
+    if errors:
+        raise EntitiesSyntaxError(path, errors)
+    return entities
 
-        elif line.startswith("- "):
-            entities[entity_name].append(line.strip()[2:])
 
-    return entities
+def load_entities(path: str = ENTITIES_PATH) -> dict[str, Entity]:
+    """Lit et analyse `config/entities.txt` (une seule lecture du fichier)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_entities(f.read(), path)
 
 
-# endregion
+def _parse_header(text: str, line: int, offset: int) -> Entity:
+    tokens = tokenize(text, offset)
+    name = tokens[0]
+    if name.kind != "word" or not name.value.isidentifier():
+        raise _Error(name.column, f"Nom d'entité invalide : '{name.value}'")
+    entity = Entity(name.value, line)
 
+    position = 1
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        if token.kind != "modifier":
+            raise _Error(token.column, f"'{token.value}' inattendu, .r, .w, .d ou .cache(ttl) attendu")
+        if token.value in ("r", "w", "d"):
+            if position >= len(tokens) or tokens[position].kind != "word":
+                raise _Error(token.column, f".{token.value} attend une liste de rôles séparés par des virgules")
+            roles = tokens[position].value.split(",")
+            position += 1
+            setattr(entity, {"r": "read_roles", "w": "write_roles", "d": "delete_roles"}[token.value], roles)
+        elif token.value == "cache":
+            entity.cache_ttl = _number(token, "cache")
+        else:
+            raise _Error(token.column, f"Modificateur d'entité inconnu : .{token.value}")
+    return entity
 
-def get_acces_for_entities(entity: str) -> tuple[list[str], list[str], list[str]]:
-    """
-    Extrait les rôles d'accès en lecture, écriture et suppression pour une entité donnée.
 
-    Args:
-        entity (str): Le nom de l'entité.
-    Returns:
-        tuple: Un tuple contenant les rôles d'accès en lecture, écriture et suppression (str).
-    """
-    read_role = []
-    write_role = []
-    delete_role = []
-    with open("config/entities.txt", "r", encoding="utf-8") as f:
-        lines = [line.strip() for line in f.readlines()]
-
-
-    for line in lines:
-        if line.startswith(entity + " "):
-            parts = line.split(" ")
-            for part in range(1, len(parts)):
-                if parts[part].startswith(".r"):
-                    read_role = parts[part+1].split(",")  # Extrait le rôle après '.r'
-                elif parts[part].startswith(".w"):
-                    write_role = parts[part+1].split(",")  # Extrait le rôle après '.w'
-                elif parts[part].startswith(".d"):
-                    delete_role = parts[part+1].split(",")  # Extrait le rôle après '.d'
-
-    if read_role == []:
-        read_role = ["any"]
-    if write_role == []:
-        write_role = ["any"]
-    if delete_role == []:
-        delete_role = ["any"]
-    print(f"Rôles pour l'entité '{entity}': Lecture: {read_role}, Écriture: {write_role}, Suppression: {delete_role}")  # Debug
-
-    return read_role, write_role, delete_role
\ No newline at end of file
+def _parse_attribute(text: str, line: int, offset: int) -> Attribute:
+    tokens = tokenize(text, offset)
+    if not tokens or tokens[0].kind != "word" or not tokens[0].value.isidentifier():
+        raise _Error(tokens[0].column if tokens else offset + 1, "Nom d'attribut attendu après '- '")
+    name = tokens[0].value
+    position = 1
+    attr_type = "str"
+    if position < len(tokens) and tokens[position].kind == "word":
+        attr_type = tokens[position].value
+        position += 1
+    attribute = Attribute(name, attr_type, line)
+
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        if token.kind != "modifier":
+            raise _Error(token.column, f"'{token.value}' inattendu, les modificateurs commencent par '.'")
+        modifier = token.value
+
+        if modifier in ("nn", "unique", "index"):
+            if token.argument is not None:
+                raise _Error(token.column, f".{modifier} ne prend pas d'argument")
+            setattr(attribute, {"nn": "not_null"}.get(modifier, modifier), True)
+        elif modifier == "fk":
+            # `.fk` seul : le type de l'attribut est l'entité cible ; `.fk Cible` la désigne explicitement
+            attribute.foreign_key = attr_type
+            if position < len(tokens) and tokens[position].kind == "word":
+                attribute.foreign_key = tokens[position].value
+                position += 1
+            if attribute.foreign_key.lower() in BUILT_IN_TYPES:
+                raise _Error(token.column, f".fk attend l'entité cible : `- {name} int .fk Entite`")
+        elif modifier == "default":
+            attribute.default = _argument(token)
+        elif modifier in ("len", "maxlen"):
+            value = _argument(token)
+            if not value.isdigit():
+                raise _Error(token.column, f".{modifier} attend un entier positif, reçu '{value}'")
+            attribute.max_length = int(value)
+        elif modifier == "range":
+            attribute.range_min, attribute.range_max = _range(token)
+        else:
+            raise _Error(token.column, f"Modificateur inconnu : .{modifier}")
+    return attribute
+
+
+def _parse_declaration(text: str, line: int, offset: int) -> Index:
+    tokens = tokenize(text, offset)
+    token = tokens[0]
+    if token.value != "index" or token.argument is None:
+        raise _Error(token.column, f"Déclaration inconnue : .{token.value}, .index(...) attendu")
+    if len(tokens) > 1:
+        raise _Error(tokens[1].column, "Texte inattendu après .index(...)")
+
+    columns_part, _, where = token.argument.partition("where=")
+    columns = []
+    for column in columns_part.split(","):
+        parts = column.split()
+        if not parts:
+            continue
+        if len(parts) > 2 or (len(parts) == 2 and parts[1].lower() not in ("asc", "desc")):
+            raise _Error(token.column, f"Colonne d'index invalide : '{column.strip()}', 'nom [asc|desc]' attendu")
+        columns.append(parts[0] + (" desc" if len(parts) == 2 and parts[1].lower() == "desc" else ""))
+    if not columns:
+        raise _Error(token.column, ".index attend au moins une colonne")
+    return Index(columns, where.strip() or None, line)
+
+
+def _argument(token: Token) -> str:
+    if not token.argument:
+        raise _Error(token.column, f".{token.value} attend une valeur entre parenthèses")
+    return token.argument
+
+
+def _number(token: Token, name: str) -> float:
+    try:
+        return float(_argument(token))
+    except ValueError:
+        raise _Error(token.column, f".{name} attend un nombre, reçu '{token.argument}'") from None
+
+
+def _range(token: Token) -> tuple[Optional[str], Optional[str]]:
+    """`.range(min, max)`, `.range(min..max)`, bornes optionnelles (`.range(, 99999)`) ; une seule valeur fixe les deux"""
+    value = _argument(token)
+    separator = ".." if ".." in value else ","
+    if separator in value:
+        low, high = (part.strip() or None for part in value.split(separator, 1))
+    else:
+        low = high = value.strip()
+    for bound in (low, high):
+        if bound is None:
+            continue
+        try:
+            float(bound)
+        except ValueError:
+            raise _Error(token.column, f"Les bornes de .range doivent être des nombres, reçu '{bound}'") from None
+    return low, high
+
+
+# endregion